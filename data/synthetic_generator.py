@@ -20,17 +20,101 @@ Supported fault types:
 
 import numpy as np
 import json
+import math
+import os
+import queue
 import random
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import uuid
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the NumPy implementations are used instead
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+
+def _json_default(obj):
+    """Convert NumPy values for the stdlib JSON encoder."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _to_json_bytes(obj: Dict) -> bytes:
+    """Serialize to indented JSON, encoding NumPy arrays natively when orjson is available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, default=_json_default).encode()
+
+
+def _serialize_sample(sample: Dict) -> bytes:
+    """Serialize a canonical sample with raw_file.file_size set to its own encoded length."""
+    sample["raw_file"]["file_size"] = 0
+    payload = _to_json_bytes(sample)
+    
+    # Splice the final size into the placeholder; its own digits count towards the size
+    size = len(payload) - 1
+    while len(payload) - 1 + len(str(size)) != size:
+        size = len(payload) - 1 + len(str(size))
+    sample["raw_file"]["file_size"] = size
+    return payload.replace(b'"file_size": 0', b'"file_size": %d' % size, 1)
+
+
+def _write_files(write_queue: "queue.Queue") -> None:
+    """Write queued (path, payload) pairs to disk until a None sentinel arrives."""
+    while True:
+        item = write_queue.get()
+        if item is None:
+            return
+        path, payload = item
+        try:
+            path.write_bytes(payload)
+        except OSError as e:
+            logger.error(f"Could not write {path}: {e}")
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _apply_fault_kernel(resonance_wave, magnitudes, phases, band_idx, deltas, severity_mult,
+                            modified_magnitudes, modified_phases):
+        """Fused per-point fault signature (see SyntheticFRAGenerator.apply_fault_signature)."""
+        for i in range(magnitudes.shape[0]):
+            band = band_idx[i]
+            modified_magnitudes[i] = magnitudes[i] + severity_mult * (
+                deltas[0, band] * resonance_wave[i] + deltas[1, band])
+            modified_phases[i] = phases[i] + severity_mult * deltas[2, band]
+        return modified_magnitudes, modified_phases
+    
+    @njit(cache=True, fastmath=True)
+    def _add_noise_kernel(magnitudes, phases, noise, freq_noise_factor, noise_level):
+        """Fused noise scaling and addition (see SyntheticFRAGenerator.add_noise)."""
+        noisy_magnitudes = np.empty_like(magnitudes)
+        noisy_phases = np.empty_like(phases)
+        for i in range(magnitudes.shape[0]):
+            noisy_magnitudes[i] = magnitudes[i] + noise_level * (
+                0.1 * noise[0, i] + 0.05 * freq_noise_factor[i] * noise[2, i])
+            noisy_phases[i] = phases[i] + noise_level * (
+                0.5 * noise[1, i] + 0.2 * freq_noise_factor[i] * noise[3, i])
+        return noisy_magnitudes, noisy_phases
+else:
+    _apply_fault_kernel = None
+    _add_noise_kernel = None
+
+
 class FaultType(Enum):
     """Enumeration of transformer fault types."""
     HEALTHY = "healthy"
@@ -65,13 +149,29 @@ class SyntheticFRAGenerator:
     """Generator for synthetic FRA data with realistic fault patterns."""
     
     def __init__(self, seed: int = 42):
+        self.seed = seed
         np.random.seed(seed)
         random.seed(seed)
+        self.rng = np.random.default_rng(seed)
         
         # Standard frequency range for FRA: 20 Hz to 12 MHz
         self.freq_min = 20e3   # 20 kHz
         self.freq_max = 12e6   # 12 MHz
         self.num_points = 2048  # Standard resolution
+        self.batch_size = 32  # Samples generated per vectorized dataset batch
+        self.shard_size = 512  # Samples per NPZ dataset shard
+        
+        # Scratch buffers for the fault-modified trace of the sample being generated
+        self._work_mag = np.empty(self.num_points, dtype=np.float32)
+        self._work_phase = np.empty(self.num_points, dtype=np.float32)
+        self._noise = np.empty((4, self.num_points), dtype=np.float32)
+        
+        # 1/sqrt(n) weighting of the 1/f noise component (fixed for the standard resolution)
+        self._freq_noise_factor = np.sqrt(1.0 / np.arange(1, self.num_points + 1, dtype=np.float32))
+        
+        # Per-channel (magnitude, phase) noise scales used by generate_batch
+        self._white_noise_scale = np.array([[0.1], [0.5]], dtype=np.float32)
+        self._pink_noise_scale = np.array([[0.05], [0.2]], dtype=np.float32) * self._freq_noise_factor
         
         # Transformer specifications database
         self.transformer_specs = [
@@ -83,6 +183,14 @@ class SyntheticFRAGenerator:
             TransformerSpec(80, 132, 11, "Dyn11", "Kirloskar", "Compact 80MVA", 2021),
         ]
         
+        # Vendor-format emulator used to save parser-testing copies of some samples
+        try:
+            from parsers.proprietary_emulator import ProprietaryFormatEmulator
+            self._vendor_emulator = ProprietaryFormatEmulator()
+        except ImportError as e:
+            logger.warning(f"Vendor format emulation unavailable: {e}")
+            self._vendor_emulator = None
+        
         # Test instrument specifications
         self.instruments = [
             "Omicron FRAnalyzer",
@@ -156,6 +264,55 @@ class SyntheticFRAGenerator:
                 'frequency_bands': [(20e3, 1e5), (1e5, 1e6), (1e6, 12e6)]
             }
         }
+        
+        # Severity multipliers
+        self.severity_multipliers = {
+            SeverityLevel.MILD: 0.3,
+            SeverityLevel.MODERATE: 0.7, 
+            SeverityLevel.SEVERE: 1.0
+        }
+        
+        # All fault types share the same frequency bands. Pack the signatures into one
+        # contiguous (num_fault_types, 3, num_bands + 1) table of resonance/magnitude/phase
+        # deltas per band, indexed by integer fault id; the trailing zero column is used
+        # for points that fall outside every band.
+        self._band_edges = np.array(self.fault_signatures[FaultType.HEALTHY]['frequency_bands'])
+        self._fault_id = {fault_type: i for i, fault_type in enumerate(FaultType)}
+        self._severity_id = {severity: i for i, severity in enumerate(SeverityLevel)}
+        self._fault_deltas = np.stack([
+            np.array([
+                self.fault_signatures[fault_type]['resonance_shifts'] + [0],
+                self.fault_signatures[fault_type]['magnitude_changes'] + [0],
+                self.fault_signatures[fault_type]['phase_distortions'] + [0]
+            ], dtype=np.float32)
+            for fault_type in FaultType
+        ])
+        
+        # Base signatures are deterministic per transformer spec, so compute them once and
+        # stack them into (num_specs, num_points) arrays. Every spec shares one frequency
+        # grid, whose log and band layout are cached too.
+        signatures = [self.generate_base_fra_signature(spec) for spec in self.transformer_specs]
+        self._spec_rows = {id(spec): row for row, spec in enumerate(self.transformer_specs)}
+        self._frequencies = signatures[0][0]
+        self._base_response = np.stack([signature[1:] for signature in signatures])  # (S, 2, N)
+        self._log_freq = np.log10(self._frequencies)
+        self._band_idx = self._band_index(self._frequencies)
+        self._resonance_wave = np.sin(2 * np.pi * self._log_freq)
+        
+        # Samples and batches hand out the shared grid itself, so the cached arrays are
+        # read-only: callers scaling a sample's frequencies in place get an error instead
+        # of corrupting every later sample
+        for cached in (self._frequencies, self._base_response, self._log_freq,
+                       self._band_idx, self._resonance_wave):
+            cached.flags.writeable = False
+        
+        # Compile (or load from cache) the Numba kernels up front instead of on the first sample
+        if njit is not None:
+            work = np.zeros(self.num_points, dtype=np.float32)
+            _apply_fault_kernel(self._resonance_wave, work, work, self._band_idx,
+                                self._fault_deltas[0], 1.0, work, work)
+            _add_noise_kernel(work, work, np.zeros((4, self.num_points), dtype=np.float32),
+                              self._freq_noise_factor, 0.0)
     
     def generate_base_fra_signature(self, transformer_spec: TransformerSpec) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Generate base healthy FRA signature for a transformer.
@@ -177,16 +334,20 @@ class SyntheticFRAGenerator:
             3e6 * (100 / transformer_spec.rating_mva)**0.1     # High freq resonance
         ]
         
+        log10_res = np.log10(resonance_freqs)
+        log_offset = log_freq - math.log10(self.freq_min)
+        
         # Base magnitude curve (starts high, decreases with frequency)
-        base_magnitude = 50 - 8 * (log_freq - np.log10(self.freq_min))
+        base_magnitude = 50 - 8 * log_offset
         
         # Add resonance peaks
-        for i, res_freq in enumerate(resonance_freqs):
+        for i in range(len(resonance_freqs)):
             # Gaussian resonance peak
             peak_width = 0.3 + 0.1 * i  # Wider peaks at higher frequencies
             peak_height = 8 - 2 * i      # Lower peaks at higher frequencies
             
-            resonance_curve = peak_height * np.exp(-((log_freq - np.log10(res_freq)) / peak_width)**2)
+            t = (log_freq - log10_res[i]) / peak_width
+            resonance_curve = peak_height * np.exp(-(t * t))
             base_magnitude += resonance_curve
         
         # Add transformer-specific variations
@@ -195,64 +356,75 @@ class SyntheticFRAGenerator:
             base_magnitude += 2 * np.sin(0.5 * log_freq)
         
         # Phase response (starts positive, becomes increasingly negative)
-        base_phase = 10 - 15 * (log_freq - np.log10(self.freq_min))
+        base_phase = 10 - 15 * log_offset
         
         # Add phase resonances
-        for i, res_freq in enumerate(resonance_freqs):
-            phase_shift = (20 - 5 * i) * np.exp(-((log_freq - np.log10(res_freq)) / 0.2)**2)
+        for i in range(len(resonance_freqs)):
+            t = (log_freq - log10_res[i]) / 0.2
+            phase_shift = (20 - 5 * i) * np.exp(-(t * t))
             base_phase += phase_shift
         
-        return frequencies, base_magnitude, base_phase
+        # Measurement precision (~0.1 dB / 0.5 deg) is far coarser than float32 resolution
+        return (frequencies.astype(np.float32), base_magnitude.astype(np.float32),
+                base_phase.astype(np.float32))
+    
+    def _band_index(self, frequencies: np.ndarray) -> np.ndarray:
+        """Index of the fault band containing each frequency (number of bands if none).
+        
+        Frequency sweeps are sorted, so each band is a contiguous slice of the grid.
+        """
+        band_lo = np.searchsorted(frequencies, self._band_edges[:, 0], side='left')
+        band_hi = np.searchsorted(frequencies, self._band_edges[:, 1], side='right')
+        
+        band_idx = np.full(len(frequencies), len(self._band_edges))
+        for band, (lo, hi) in enumerate(zip(band_lo, band_hi)):
+            band_idx[lo:hi] = band
+        return band_idx
     
     def apply_fault_signature(self, frequencies: np.ndarray, magnitudes: np.ndarray, phases: np.ndarray,
-                            fault_type: FaultType, severity: SeverityLevel) -> Tuple[np.ndarray, np.ndarray]:
+                            fault_type: FaultType, severity: SeverityLevel,
+                            out: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray]:
         """Apply fault-specific signatures to base FRA response.
         
+        Args:
+            out: Optional (magnitudes, phases) buffers to write the result into
+        
         Returns:
-            Tuple of (modified_magnitudes, modified_phases)
+            Tuple of (modified_magnitudes, modified_phases); healthy traces are
+            returned as the unmodified input arrays
         """
         if fault_type == FaultType.HEALTHY:
-            return magnitudes.copy(), phases.copy()
+            return magnitudes, phases
         
-        signature = self.fault_signatures[fault_type]
+        if out is None:
+            out = (np.empty_like(magnitudes), np.empty_like(phases))
+        modified_magnitudes, modified_phases = out
         
-        # Severity multipliers
-        severity_multipliers = {
-            SeverityLevel.MILD: 0.3,
-            SeverityLevel.MODERATE: 0.7, 
-            SeverityLevel.SEVERE: 1.0
-        }
+        severity_mult = self.severity_multipliers[severity]
         
-        severity_mult = severity_multipliers[severity]
+        # Resonance shifts (simulating mechanical displacement) modulate sin(2*pi*log10(f))
+        if frequencies is self._frequencies:
+            resonance_wave, band_idx = self._resonance_wave, self._band_idx
+        else:
+            resonance_wave = np.sin(2 * np.pi * np.log10(frequencies))
+            band_idx = self._band_index(frequencies)
         
-        modified_magnitudes = magnitudes.copy()
-        modified_phases = phases.copy()
+        fault_deltas = self._fault_deltas[self._fault_id[fault_type]]
         
-        log_freq = np.log10(frequencies)
+        if _apply_fault_kernel is not None:
+            _apply_fault_kernel(resonance_wave, magnitudes, phases, band_idx,
+                                fault_deltas, severity_mult,
+                                modified_magnitudes, modified_phases)
+            return modified_magnitudes, modified_phases
         
-        # Apply frequency-band-specific effects
-        for i, (f_start, f_end) in enumerate(signature['frequency_bands']):
-            # Create frequency band mask
-            band_mask = (frequencies >= f_start) & (frequencies <= f_end)
-            
-            if not np.any(band_mask):
-                continue
-            
-            # Apply resonance shifts
-            resonance_shift = signature['resonance_shifts'][i] * severity_mult
-            if resonance_shift != 0:
-                # Shift resonance frequency (simulate mechanical displacement)
-                shift_factor = 1 + resonance_shift * 0.1
-                freq_shift_mask = band_mask
-                modified_magnitudes[freq_shift_mask] += resonance_shift * np.sin(2 * np.pi * log_freq[freq_shift_mask])
-            
-            # Apply magnitude changes
-            mag_change = signature['magnitude_changes'][i] * severity_mult
-            modified_magnitudes[band_mask] += mag_change
-            
-            # Apply phase distortions
-            phase_change = signature['phase_distortions'][i] * severity_mult
-            modified_phases[band_mask] += phase_change
+        # Gather (resonance shift, magnitude change, phase distortion) for every point at once
+        deltas = fault_deltas[:, band_idx] * severity_mult
+        
+        # All effects are zero outside the bands
+        np.multiply(deltas[0], resonance_wave, out=modified_magnitudes)
+        modified_magnitudes += deltas[1]
+        modified_magnitudes += magnitudes
+        np.add(phases, deltas[2], out=modified_phases)
         
         return modified_magnitudes, modified_phases
     
@@ -268,21 +440,31 @@ class SyntheticFRAGenerator:
         Returns:
             Tuple of (noisy_magnitudes, noisy_phases)
         """
+        num_points = len(magnitudes)
+        
+        # Draw all four noise components in a single RNG call
+        if num_points == self.num_points:
+            noise = self.rng.standard_normal(dtype=np.float32, out=self._noise)
+            freq_noise_factor = self._freq_noise_factor
+        else:
+            noise = self.rng.standard_normal((4, num_points), dtype=np.float32)
+            freq_noise_factor = np.sqrt(1.0 / np.arange(1, num_points + 1, dtype=np.float32))
+        
+        if _add_noise_kernel is not None:
+            return _add_noise_kernel(magnitudes, phases, noise, freq_noise_factor, noise_level)
+        
         # Gaussian noise for magnitudes (typical ±0.1 dB measurement uncertainty)
-        mag_noise_std = 0.1 * noise_level
-        magnitude_noise = np.random.normal(0, mag_noise_std, len(magnitudes))
+        noise[0] *= 0.1 * noise_level
         
         # Gaussian noise for phases (typical ±0.5° measurement uncertainty) 
-        phase_noise_std = 0.5 * noise_level
-        phase_noise = np.random.normal(0, phase_noise_std, len(phases))
+        noise[1] *= 0.5 * noise_level
         
         # Add 1/f noise component (more realistic for electronic instruments)
-        freq_noise_factor = np.sqrt(1.0 / np.arange(1, len(magnitudes) + 1))
-        mag_1f_noise = 0.05 * noise_level * freq_noise_factor * np.random.normal(0, 1, len(magnitudes))
-        phase_1f_noise = 0.2 * noise_level * freq_noise_factor * np.random.normal(0, 1, len(phases))
+        noise[2] *= 0.05 * noise_level * freq_noise_factor
+        noise[3] *= 0.2 * noise_level * freq_noise_factor
         
-        noisy_magnitudes = magnitudes + magnitude_noise + mag_1f_noise
-        noisy_phases = phases + phase_noise + phase_1f_noise
+        noisy_magnitudes = magnitudes + noise[0] + noise[2]
+        noisy_phases = phases + noise[1] + noise[3]
         
         return noisy_magnitudes, noisy_phases
     
@@ -311,17 +493,71 @@ class SyntheticFRAGenerator:
         if transformer_spec is None:
             transformer_spec = random.choice(self.transformer_specs)
         
-        # Generate base signature
-        frequencies, base_magnitudes, base_phases = self.generate_base_fra_signature(transformer_spec)
+        # Look up (or generate) base signature
+        row = self._spec_rows.get(id(transformer_spec))
+        if row is not None:
+            frequencies = self._frequencies
+            base_magnitudes, base_phases = self._base_response[row]
+        else:
+            frequencies, base_magnitudes, base_phases = self.generate_base_fra_signature(transformer_spec)
         
-        # Apply fault signature
+        # Apply fault signature (into scratch buffers when on the standard grid)
+        work = (self._work_mag, self._work_phase) if len(frequencies) == self.num_points else None
         magnitudes, phases = self.apply_fault_signature(
-            frequencies, base_magnitudes, base_phases, fault_type, severity
+            frequencies, base_magnitudes, base_phases, fault_type, severity, out=work
         )
         
-        # Add measurement noise
+        # Add measurement noise (allocates the arrays returned in the sample)
         magnitudes, phases = self.add_noise(magnitudes, phases, noise_level)
         
+        return self._build_sample(fault_type, severity, transformer_spec, noise_level,
+                                  frequencies, magnitudes, phases)
+    
+    def generate_batch(self, fault_types: List[FaultType], severities: List[SeverityLevel],
+                       transformer_specs: List[TransformerSpec],
+                       noise_levels: List[float]) -> Dict[str, np.ndarray]:
+        """Generate the FRA traces of several samples at once, vectorized over samples.
+        
+        Args:
+            fault_types: Fault type of each sample
+            severities: Fault severity of each sample
+            transformer_specs: Transformer specification of each sample (must be
+                one of ``self.transformer_specs``)
+            noise_levels: Measurement noise level of each sample
+            
+        Returns:
+            Dict with the shared 'frequencies' grid (N,) and (n, N) 'magnitudes' and 'phases'
+        """
+        rows = [self._spec_rows.get(id(spec)) for spec in transformer_specs]
+        if None in rows:
+            raise ValueError("generate_batch only supports the generator's transformer_specs")
+        
+        # Magnitude and phase travel together as one (n, 2, N) response, so each step
+        # below updates both channels with a single array operation
+        response = self._base_response[rows]
+        
+        # Per-sample (resonance, magnitude, phase) band deltas scaled by severity
+        fault_ids = [self._fault_id[fault_type] for fault_type in fault_types]
+        severity_mults = np.array([self.severity_multipliers[severity] for severity in severities],
+                                  dtype=np.float32)
+        band_deltas = self._fault_deltas[fault_ids] * severity_mults[:, None, None]
+        
+        response += band_deltas[:, 1:, self._band_idx]
+        response[:, 0] += band_deltas[:, 0, self._band_idx] * self._resonance_wave
+        
+        # Measurement noise for the whole batch (same model and draw order as add_noise):
+        # rows are white magnitude/phase noise followed by 1/f magnitude/phase noise
+        noise = self.rng.standard_normal((4, len(rows), self.num_points), dtype=np.float32)
+        levels = np.asarray(noise_levels, dtype=np.float32)[:, None, None]
+        response += levels * (noise[:2].transpose(1, 0, 2) * self._white_noise_scale +
+                              noise[2:].transpose(1, 0, 2) * self._pink_noise_scale)
+        
+        return {"frequencies": self._frequencies, "magnitudes": response[:, 0], "phases": response[:, 1]}
+    
+    def _build_sample(self, fault_type: FaultType, severity: SeverityLevel,
+                      transformer_spec: TransformerSpec, noise_level: float,
+                      frequencies: np.ndarray, magnitudes: np.ndarray, phases: np.ndarray) -> Dict:
+        """Wrap a generated FRA trace in the canonical data structure with random metadata."""
         # Generate random test metadata
         test_date = datetime.now() - timedelta(days=random.randint(0, 365*3))
         technician_names = ["John Smith", "Maria Garcia", "David Johnson", "Lisa Wang", "Ahmed Hassan"]
@@ -348,9 +584,9 @@ class SyntheticFRAGenerator:
                 "ambient_temp": round(random.uniform(15, 35), 1)
             },
             "measurement": {
-                "frequencies": frequencies.tolist(),
-                "magnitudes": magnitudes.tolist(),
-                "phases": phases.tolist(),
+                "frequencies": frequencies,
+                "magnitudes": magnitudes,
+                "phases": phases,
                 "unit": "dB",
                 "phase_unit": "degrees",
                 "connection": random.choice(["H1-H2", "H1-X1", "H2-X2", "X1-X2"]),
@@ -362,7 +598,7 @@ class SyntheticFRAGenerator:
                 "filename": f"synthetic_{fault_type.value}_{severity.value}_{uuid.uuid4().hex[:8]}.json",
                 "vendor_name": "synthetic",
                 "original_format": "json",
-                "file_size": 0,  # Will be calculated when saved
+                "file_size": 0,  # Filled in when serialized
                 "parser_version": "1.0"
             },
             # Ground truth labels for ML training
@@ -384,7 +620,9 @@ class SyntheticFRAGenerator:
     def generate_dataset(self, num_samples: int = 3000, 
                         output_dir: str = "/app/data/synthetic_dataset",
                         balanced: bool = True,
-                        noise_range: Tuple[float, float] = (0.05, 0.3)) -> Dict[str, int]:
+                        noise_range: Tuple[float, float] = (0.05, 0.3),
+                        num_workers: Optional[int] = None,
+                        output_format: str = "json") -> Dict[str, int]:
         """Generate a complete synthetic FRA dataset.
         
         Args:
@@ -392,15 +630,21 @@ class SyntheticFRAGenerator:
             output_dir: Directory to save dataset
             balanced: Whether to balance samples across fault types and severities
             noise_range: Range of noise levels to apply (min, max)
+            num_workers: Worker processes to use (CPU count if None, 1 = in-process)
+            output_format: 'json' for one canonical JSON file per sample, or 'npz' for
+                compressed (shard_size, N) array shards for ML training
             
         Returns:
             Dict: Generation statistics
         """
+        if output_format not in ("json", "npz"):
+            raise ValueError(f"Unsupported output format: {output_format}")
+        
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
         # Create subdirectories for organization
-        (output_path / "canonical").mkdir(exist_ok=True)
+        (output_path / "canonical" if output_format == "json" else output_path / "shards").mkdir(exist_ok=True)
         (output_path / "vendor_formats").mkdir(exist_ok=True)
         
         # Calculate samples per category if balanced
@@ -425,10 +669,9 @@ class SyntheticFRAGenerator:
         
         logger.info(f"Generating {num_samples} synthetic FRA samples...")
         
+        # Plan every sample up front (cheap) so workers only do the heavy lifting
+        tasks = []
         for i in range(num_samples):
-            if i % 100 == 0:
-                logger.info(f"Generated {i}/{num_samples} samples ({i/num_samples*100:.1f}%)")
-            
             # Select fault type and severity
             if balanced:
                 if i < healthy_samples:
@@ -449,41 +692,45 @@ class SyntheticFRAGenerator:
             # Random noise level
             noise_level = random.uniform(*noise_range)
             
-            # Generate sample
-            sample = self.generate_sample(
-                fault_type=fault_type,
-                severity=severity, 
-                noise_level=noise_level
-            )
-            
-            # Update statistics
-            generation_stats["total_samples"] += 1
-            generation_stats["fault_distribution"][fault_type.value] += 1
-            generation_stats["severity_distribution"][severity.value] += 1
-            
-            transformer_model = sample["asset_metadata"]["model"]
-            if transformer_model not in generation_stats["transformer_distribution"]:
-                generation_stats["transformer_distribution"][transformer_model] = 0
-            generation_stats["transformer_distribution"][transformer_model] += 1
-            
-            # Save canonical format
-            canonical_filename = f"sample_{i:06d}_{fault_type.value}_{severity.value}.json"
-            canonical_path = output_path / "canonical" / canonical_filename
-            
-            with open(canonical_path, 'w') as f:
-                json.dump(sample, f, indent=2)
-            
-            # Update file size in metadata
-            sample["raw_file"]["file_size"] = canonical_path.stat().st_size
-            
-            # Save in vendor formats (for parser testing)
-            if i % 50 == 0:  # Save every 50th sample in vendor formats
-                self._save_vendor_formats(sample, output_path / "vendor_formats", i)
+            tasks.append((i, fault_type, severity, noise_level))
+        
+        # Work is split into batches of JSON samples or into NPZ shards
+        group_size = self.batch_size if output_format == "json" else self.shard_size
+        batches = [(tasks[start:start + group_size], str(output_path), output_format)
+                   for start in range(0, num_samples, group_size)]
+        
+        num_workers = num_workers or os.cpu_count() or 1
+        if num_workers > 1:
+            executor = ProcessPoolExecutor(max_workers=num_workers,
+                                           initializer=_init_worker, initargs=(self.seed,))
+            batch_results = executor.map(_generate_batch, batches)
+        else:
+            executor = None
+            batch_results = (self._generate_and_save_batch(*batch) for batch in batches)
+        
+        results = (result for batch_result in batch_results for result in batch_result)
+        
+        try:
+            for i, result in enumerate(results):
+                if i % 100 == 0:
+                    logger.info(f"Generated {i}/{num_samples} samples ({i/num_samples*100:.1f}%)")
+                
+                # Update statistics
+                generation_stats["total_samples"] += 1
+                generation_stats["fault_distribution"][result["fault_type"]] += 1
+                generation_stats["severity_distribution"][result["severity"]] += 1
+                
+                transformer_model = result["model"]
+                if transformer_model not in generation_stats["transformer_distribution"]:
+                    generation_stats["transformer_distribution"][transformer_model] = 0
+                generation_stats["transformer_distribution"][transformer_model] += 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
         
         # Save generation statistics
         stats_path = output_path / "generation_stats.json"
-        with open(stats_path, 'w') as f:
-            json.dump(generation_stats, f, indent=2)
+        stats_path.write_bytes(_to_json_bytes(generation_stats))
         
         # Save dataset metadata
         metadata = {
@@ -495,7 +742,8 @@ class SyntheticFRAGenerator:
                 "frequency_range_hz": [self.freq_min, self.freq_max],
                 "frequency_points": self.num_points,
                 "balanced": balanced,
-                "noise_range": noise_range
+                "noise_range": noise_range,
+                "output_format": output_format
             },
             "fault_types": [ft.value for ft in fault_types],
             "severity_levels": [sl.value for sl in severity_levels],
@@ -513,21 +761,151 @@ class SyntheticFRAGenerator:
         }
         
         metadata_path = output_path / "dataset_metadata.json"
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        metadata_path.write_bytes(_to_json_bytes(metadata))
         
         logger.info(f"Dataset generation complete! Saved to {output_path}")
         logger.info(f"Statistics: {generation_stats}")
         
         return generation_stats
     
+    def _seed_sample(self, sample_idx: int) -> None:
+        """Reseed the random sources deterministically from (seed, sample_idx)."""
+        self.rng = np.random.default_rng([self.seed, sample_idx])
+        random.seed(self.seed * 1_000_003 + sample_idx)
+    
+    def _generate_samples(self, tasks: List[Tuple[int, FaultType, SeverityLevel, float]]):
+        """Yield (sample_idx, sample) for dataset tasks, one vectorized batch at a time.
+        
+        Each batch is seeded from its first sample index so output is independent
+        of how the tasks are distributed over workers.
+        """
+        for start in range(0, len(tasks), self.batch_size):
+            batch_tasks = tasks[start:start + self.batch_size]
+            self._seed_sample(batch_tasks[0][0])
+            
+            sample_indices, fault_types, severities, noise_levels = zip(*batch_tasks)
+            transformer_specs = [random.choice(self.transformer_specs) for _ in batch_tasks]
+            batch = self.generate_batch(fault_types, severities, transformer_specs, noise_levels)
+            
+            for j, sample_idx in enumerate(sample_indices):
+                yield sample_idx, self._build_sample(
+                    fault_types[j], severities[j], transformer_specs[j], noise_levels[j],
+                    batch["frequencies"], batch["magnitudes"][j], batch["phases"][j]
+                )
+    
+    def _generate_and_save_batch(self, tasks: List[Tuple[int, FaultType, SeverityLevel, float]],
+                                 output_dir: str, output_format: str = "json") -> List[Dict[str, str]]:
+        """Generate and save a group of dataset samples, returning their statistics entries."""
+        output_path = Path(output_dir)
+        if output_format == "npz":
+            return self._save_npz_shard(tasks, output_path)
+        
+        # Disk writes release the GIL, so a writer thread overlaps them with serialization
+        write_queue = queue.Queue()
+        writer = threading.Thread(target=_write_files, args=(write_queue,), daemon=True)
+        writer.start()
+        
+        results = []
+        try:
+            for sample_idx, sample in self._generate_samples(tasks):
+                labels = sample["fault_labels"]
+                
+                # Save canonical format
+                canonical_filename = f"sample_{sample_idx:06d}_{labels['fault_type']}_{labels['severity_level']}.json"
+                canonical_path = output_path / "canonical" / canonical_filename
+                
+                # Serializing also records the final file size in the sample
+                write_queue.put((canonical_path, _serialize_sample(sample)))
+                
+                # Save in vendor formats (for parser testing)
+                if sample_idx % 50 == 0:  # Save every 50th sample in vendor formats
+                    self._save_vendor_formats(sample, output_path / "vendor_formats", sample_idx)
+                
+                results.append(self._sample_stats(sample))
+        finally:
+            write_queue.put(None)
+            writer.join()
+        
+        return results
+    
+    def _save_npz_shard(self, tasks: List[Tuple[int, FaultType, SeverityLevel, float]],
+                        output_path: Path) -> List[Dict[str, str]]:
+        """Generate a shard of samples and save it as one compressed NPZ plus metadata JSON.
+        
+        Arrays are stored structure-of-arrays: (n, N) float32 magnitudes and phases
+        alongside per-sample label vectors, so training loaders can read them directly.
+        """
+        fault_types, severity_levels = list(FaultType), list(SeverityLevel)
+        num_samples = len(tasks)
+        
+        sample_indices = np.empty(num_samples, dtype=np.int32)
+        magnitudes = np.empty((num_samples, self.num_points), dtype=np.float32)
+        phases = np.empty((num_samples, self.num_points), dtype=np.float32)
+        fault_labels = np.empty(num_samples, dtype=np.int8)
+        severity_labels = np.empty(num_samples, dtype=np.int8)
+        noise_levels = np.empty(num_samples, dtype=np.float32)
+        
+        records = []
+        results = []
+        for j, (sample_idx, sample) in enumerate(self._generate_samples(tasks)):
+            measurement = sample["measurement"]
+            labels = sample["fault_labels"]
+            
+            sample_indices[j] = sample_idx
+            magnitudes[j] = measurement["magnitudes"]
+            phases[j] = measurement["phases"]
+            fault_labels[j] = self._fault_id[FaultType(labels["fault_type"])]
+            severity_labels[j] = self._severity_id[SeverityLevel(labels["severity_level"])]
+            noise_levels[j] = labels["generation_params"]["noise_level"]
+            
+            # Save in vendor formats (for parser testing)
+            if sample_idx % 50 == 0:  # Save every 50th sample in vendor formats
+                self._save_vendor_formats(sample, output_path / "vendor_formats", sample_idx)
+            
+            # Keep everything but the arrays as lightweight per-sample metadata
+            record = dict(sample, measurement={
+                key: value for key, value in measurement.items()
+                if key not in ("frequencies", "magnitudes", "phases")
+            })
+            del record["raw_file"]
+            records.append(record)
+            results.append(self._sample_stats(sample))
+        
+        shard_name = f"shard_{tasks[0][0]:06d}"
+        np.savez_compressed(
+            output_path / "shards" / f"{shard_name}.npz",
+            frequencies=self._frequencies,
+            magnitudes=magnitudes,
+            phases=phases,
+            sample_index=sample_indices,
+            fault_type=fault_labels,
+            severity_level=severity_labels,
+            noise_level=noise_levels
+        )
+        (output_path / "shards" / f"{shard_name}.json").write_bytes(_to_json_bytes({
+            "fault_types": [ft.value for ft in fault_types],
+            "severity_levels": [sl.value for sl in severity_levels],
+            "samples": records
+        }))
+        
+        return results
+    
+    @staticmethod
+    def _sample_stats(sample: Dict) -> Dict[str, str]:
+        """Statistics entry aggregated by generate_dataset for one sample."""
+        return {
+            "fault_type": sample["fault_labels"]["fault_type"],
+            "severity": sample["fault_labels"]["severity_level"],
+            "model": sample["asset_metadata"]["model"]
+        }
+    
     def _save_vendor_formats(self, sample: Dict, vendor_dir: Path, sample_idx: int) -> None:
         """Save sample in various vendor formats for parser testing."""
+        if self._vendor_emulator is None:
+            return
+        
         try:
-            from ..parsers.proprietary_emulator import ProprietaryFormatEmulator
-            from ..parsers.csv_parser import CSVParser
-            
-            emulator = ProprietaryFormatEmulator()
+            emulator = self._vendor_emulator
             
             # Save in one random vendor format
             vendors = ['omicron', 'doble', 'megger', 'newtons4th']
@@ -542,6 +920,21 @@ class SyntheticFRAGenerator:
             logger.warning(f"Could not save vendor format for sample {sample_idx}: {e}")
 
 
+# Per-process generator used by dataset worker processes
+_worker_generator: Optional[SyntheticFRAGenerator] = None
+
+
+def _init_worker(seed: int) -> None:
+    """Create the generator owned by the current worker process."""
+    global _worker_generator
+    _worker_generator = SyntheticFRAGenerator(seed=seed)
+
+
+def _generate_batch(batch: Tuple[List[Tuple[int, FaultType, SeverityLevel, float]], str, str]) -> List[Dict[str, str]]:
+    """Generate and save a batch of dataset samples inside a worker process."""
+    return _worker_generator._generate_and_save_batch(*batch)
+
+
 # CLI interface
 def main():
     """Command-line interface for synthetic dataset generation."""
@@ -554,6 +947,8 @@ def main():
     parser.add_argument('--balanced', action='store_true', help='Generate balanced dataset')
     parser.add_argument('--noise-min', type=float, default=0.05, help='Minimum noise level')
     parser.add_argument('--noise-max', type=float, default=0.3, help='Maximum noise level')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--format', choices=['json', 'npz'], default='json', help='Sample output format')
     
     args = parser.parse_args()
     
@@ -566,7 +961,9 @@ def main():
         num_samples=args.samples,
         output_dir=args.output,
         balanced=args.balanced,
-        noise_range=(args.noise_min, args.noise_max)
+        noise_range=(args.noise_min, args.noise_max),
+        num_workers=args.workers,
+        output_format=args.format
     )
     
     print(f"\nDataset generation completed successfully!")
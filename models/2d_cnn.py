@@ -10,18 +10,45 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import numpy as np
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Sequence, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 import logging
+import os
+
+from scipy import signal
 
 logger = logging.getLogger(__name__)
 
+# Max number of frequency grids FRAImageConverter keeps column mappings for
+_FREQ_CACHE_SIZE = 32
+
+# matplotlib/PIL are only needed for the high-quality plot path; import them
+# once on first use instead of at module import
+_plt = None
+_Image = None
+
+
+def _load_plotting():
+    """Import (once) and return pyplot with the headless Agg backend, and PIL.Image."""
+    global _plt, _Image
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')  # Headless backend, no Tk/Qt probing
+        import matplotlib.pyplot as plt
+        from PIL import Image
+        _plt, _Image = plt, Image
+    return _plt, _Image
+
 class FRA2DCNN(nn.Module):
     """2D CNN for FRA fault classification from spectrogram/image data."""
     
     def __init__(self, input_size: Tuple[int, int] = (224, 224),
                  num_fault_classes: int = 10,
                  num_severity_classes: int = 3,
-                 dropout_rate: float = 0.3):
+                 dropout_rate: float = 0.3,
+                 memory_format: str = "contiguous",
+                 inplace_relu: bool = True):
         """
         Initialize 2D CNN model.
         
@@ -30,6 +57,10 @@ class FRA2DCNN(nn.Module):
             num_fault_classes: Number of fault types (including healthy)
             num_severity_classes: Number of severity levels  
             dropout_rate: Dropout rate for regularization
+            memory_format: "contiguous" (NCHW) or "channels_last" (NHWC, faster
+                for FP16/BF16 on tensor-core GPUs)
+            inplace_relu: Apply ReLUs in place to save one activation tensor per
+                call; disable under torch.compile, where in-place ops block fusion
         """
         super(FRA2DCNN, self).__init__()
         
@@ -37,19 +68,25 @@ class FRA2DCNN(nn.Module):
         self.num_fault_classes = num_fault_classes
         self.num_severity_classes = num_severity_classes
         
+        if memory_format not in ("contiguous", "channels_last"):
+            raise ValueError(f"Unsupported memory_format: {memory_format}")
+        self.channels_last = False
+        self.inplace_relu = inplace_relu
+        self.inference_dtype = None  # Set by to_inference_fp16()
+        
         # Convolutional backbone (ResNet-inspired)
         self.conv1 = nn.Conv2d(1, 32, kernel_size=7, stride=2, padding=3)
         self.bn1 = nn.BatchNorm2d(32)
         self.pool1 = nn.MaxPool2d(kernel_size=3, stride=2, padding=1)
         
-        # Residual blocks
-        self.layer1 = self._make_layer(32, 64, 2, stride=1)
-        self.layer2 = self._make_layer(64, 128, 2, stride=2)
-        self.layer3 = self._make_layer(128, 256, 2, stride=2)
-        self.layer4 = self._make_layer(256, 512, 2, stride=2)
-        
-        # Global average pooling
-        self.global_avg_pool = nn.AdaptiveAvgPool2d(1)
+        # Residual blocks: four stages of two, held flat so the backbone is
+        # straight-line code under torch.compile
+        self.blocks = nn.ModuleList(
+            self._make_layer(32, 64, 2, stride=1) +
+            self._make_layer(64, 128, 2, stride=2) +
+            self._make_layer(128, 256, 2, stride=2) +
+            self._make_layer(256, 512, 2, stride=2)
+        )
         
         # Fully connected layers
         self.dropout = nn.Dropout(dropout_rate)
@@ -57,44 +94,90 @@ class FRA2DCNN(nn.Module):
         # Shared feature extractor
         self.fc_shared = nn.Linear(512, 256)
         
-        # Classification heads
-        self.fc_fault = nn.Sequential(
-            nn.Linear(256, 128),
-            nn.ReLU(),
-            nn.Dropout(dropout_rate),
-            nn.Linear(128, num_fault_classes)
-        )
+        # Classification heads: the hidden layers of the fault (128),
+        # severity (64) and anomaly (64) heads share one fused Linear
+        self.head_sizes = [128, 64, 64]
+        self.fc_heads_in = nn.Linear(256, sum(self.head_sizes))
+        self.head_dropout = nn.Dropout(dropout_rate)
         
-        self.fc_severity = nn.Sequential(
-            nn.Linear(256, 64),
-            nn.ReLU(),
-            nn.Dropout(dropout_rate),
-            nn.Linear(64, num_severity_classes)
-        )
+        self.fc_fault_out = nn.Linear(128, num_fault_classes)
+        self.fc_severity_out = nn.Linear(64, num_severity_classes)
+        self.fc_anomaly_out = nn.Linear(64, 2)
         
-        self.fc_anomaly = nn.Sequential(
-            nn.Linear(256, 64),
-            nn.ReLU(),
-            nn.Dropout(dropout_rate),
-            nn.Linear(64, 2)
-        )
+        # Block-diagonal packing of the three output Linears, built by
+        # fuse_for_inference() so eval runs one GEMM for all heads
+        self.head_out_sizes = [num_fault_classes, num_severity_classes, 2]
+        self.register_buffer('_head_out_weight_t', None, persistent=False)
+        self.register_buffer('_head_out_bias', None, persistent=False)
         
         # Initialize weights
         self._initialize_weights()
+        
+        if memory_format == "channels_last":
+            self.to_channels_last()
+    
+    @classmethod
+    def compiled(cls, *args, mode: str = "reduce-overhead", **kwargs) -> nn.Module:
+        """Build an eval-mode model wrapped in torch.compile for inference.
+        
+        The graph is compiled with fullgraph=True and dynamic=False, so keep the
+        batch size and input_size fixed and call it under torch.inference_mode().
+        Falls back to the eager model when torch.compile is unavailable.
+        
+        Args:
+            *args: Positional arguments for FRA2DCNN
+            mode: torch.compile mode ("reduce-overhead" enables CUDA graphs)
+            **kwargs: Keyword arguments for FRA2DCNN
+            
+        Returns:
+            Compiled (or eager) model in eval mode
+        """
+        kwargs.setdefault('inplace_relu', False)
+        model = cls(*args, **kwargs).eval()
+        
+        if not hasattr(torch, "compile"):
+            logger.warning("torch.compile not available, using eager model")
+            return model
+        
+        return torch.compile(model, mode=mode, fullgraph=True, dynamic=False)
+    
+    def to_channels_last(self) -> 'FRA2DCNN':
+        """Store conv weights in channels_last layout for cuDNN NHWC kernels.
+        
+        Returns:
+            The model itself, for chaining
+        """
+        self.to(memory_format=torch.channels_last)
+        self.channels_last = True
+        return self
+    
+    def _prepare_input(self, x: torch.Tensor) -> torch.Tensor:
+        """Add the channel dimension and pick the input memory layout."""
+        if len(x.shape) == 3:
+            x = x.unsqueeze(1)  # (batch_size, 1, height, width)
+        
+        if self.inference_dtype is not None:
+            x = x.to(self.inference_dtype)
+        
+        # NHWC only pays off for half precision on GPU; FP32 is often slower
+        if self.channels_last and x.is_cuda and x.dtype in (torch.float16, torch.bfloat16):
+            x = x.contiguous(memory_format=torch.channels_last)
+        
+        return x
     
     def _make_layer(self, in_channels: int, out_channels: int, 
-                   num_blocks: int, stride: int = 1) -> nn.Sequential:
-        """Create a residual layer with multiple blocks."""
+                   num_blocks: int, stride: int = 1) -> List['ResidualBlock']:
+        """Create the blocks of one residual stage."""
         layers = []
         
         # First block may have stride > 1 for downsampling
-        layers.append(ResidualBlock(in_channels, out_channels, stride))
+        layers.append(ResidualBlock(in_channels, out_channels, stride, self.inplace_relu))
         
         # Remaining blocks have stride = 1
         for _ in range(1, num_blocks):
-            layers.append(ResidualBlock(out_channels, out_channels, 1))
+            layers.append(ResidualBlock(out_channels, out_channels, 1, self.inplace_relu))
         
-        return nn.Sequential(*layers)
+        return layers
     
     def _initialize_weights(self):
         """Initialize model weights."""
@@ -114,6 +197,10 @@ class FRA2DCNN(nn.Module):
     def forward(self, x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
         """Forward pass through the network.
         
+        Thin wrapper that adds the channel dimension and input layout before
+        calling _forward_impl. For torch.compile(fullgraph=True), compile
+        _forward_impl directly with 4-D input so the graph has no shape branch.
+        
         Args:
             x: Input tensor of shape (batch_size, height, width) or (batch_size, 1, height, width)
             
@@ -121,30 +208,27 @@ class FRA2DCNN(nn.Module):
             Tuple of (fault_logits, severity_logits, anomaly_logits)
         """
         # Add channel dimension if needed
-        if len(x.shape) == 3:
-            x = x.unsqueeze(1)  # (batch_size, 1, height, width)
-        
-        # Initial convolution
-        x = self.pool1(F.relu(self.bn1(self.conv1(x))))
+        return self._forward_impl(self._prepare_input(x))
+    
+    def _forward_impl(self, x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Forward pass for 4-D input of shape (batch_size, 1, height, width)."""
+        # Backbone and shared feature representation
+        x = self._shared_features(x)
+        x = self.dropout(x)
         
-        # Residual layers
-        x = self.layer1(x)
-        x = self.layer2(x)
-        x = self.layer3(x)
-        x = self.layer4(x)
+        # Classification heads (one GEMM for all three hidden layers)
+        h = self.head_dropout(F.relu(self.fc_heads_in(x), inplace=self.inplace_relu))
+        h_fault, h_severity, h_anomaly = h.split(self.head_sizes, dim=1)
         
-        # Global average pooling
-        x = self.global_avg_pool(x)
-        x = x.view(x.size(0), -1)  # Flatten
+        if self._head_out_weight_t is not None and not self.training:
+            # Bias is added in the GEMM epilogue (beta=1), no separate add
+            logits = torch.addmm(self._head_out_bias, h, self._head_out_weight_t)
+            fault_logits, severity_logits, anomaly_logits = logits.split(self.head_out_sizes, dim=1)
+            return fault_logits, severity_logits, anomaly_logits
         
-        # Shared feature representation
-        x = F.relu(self.fc_shared(x))
-        x = self.dropout(x)
-        
-        # Classification heads
-        fault_logits = self.fc_fault(x)
-        severity_logits = self.fc_severity(x)
-        anomaly_logits = self.fc_anomaly(x)
+        fault_logits = self.fc_fault_out(h_fault)
+        severity_logits = self.fc_severity_out(h_severity)
+        anomaly_logits = self.fc_anomaly_out(h_anomaly)
         
         return fault_logits, severity_logits, anomaly_logits
     
@@ -157,33 +241,150 @@ class FRA2DCNN(nn.Module):
         Returns:
             Feature tensor of shape (batch_size, 256)
         """
-        with torch.no_grad():
-            if len(x.shape) == 3:
-                x = x.unsqueeze(1)
-            
-            # Forward through backbone
-            x = self.pool1(F.relu(self.bn1(self.conv1(x))))
-            x = self.layer1(x)
-            x = self.layer2(x)
-            x = self.layer3(x)
-            x = self.layer4(x)
-            
-            # Global average pooling
-            x = self.global_avg_pool(x)
-            x = x.view(x.size(0), -1)
+        with torch.inference_mode():
+            return self._shared_features(self._prepare_input(x))
+    
+    @torch.inference_mode()
+    def predict(self, x: torch.Tensor,
+                dtype: torch.dtype = torch.float16) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Mixed-precision, channels_last inference pass.
+        
+        Runs forward under torch.autocast in eval mode, so BatchNorm uses its
+        FP32 running statistics. On CPU float16 is replaced by bfloat16.
+        
+        Args:
+            x: Input tensor of shape (batch_size, height, width) or (batch_size, 1, height, width)
+            dtype: Autocast compute dtype (torch.float16 or torch.bfloat16)
             
-            # Shared features
-            x = F.relu(self.fc_shared(x))
+        Returns:
+            Tuple of (fault_logits, severity_logits, anomaly_logits)
+        """
+        self.eval()
+        
+        if len(x.shape) == 3:
+            x = x.unsqueeze(1)
+        x = x.contiguous(memory_format=torch.channels_last)
+        
+        device_type = x.device.type
+        if device_type == 'cpu' and dtype == torch.float16:
+            dtype = torch.bfloat16
+        
+        with torch.autocast(device_type=device_type, dtype=dtype):
+            return self._forward_impl(x)
+    
+    def _shared_features(self, x: torch.Tensor) -> torch.Tensor:
+        """Backbone and shared FC layer, without any grad-mode context.
+        
+        Kept free of torch.no_grad() so a compiled model can reuse the same
+        graph when the caller already runs under torch.inference_mode().
+        """
+        # Forward through backbone
+        x = self.pool1(F.relu(self.bn1(self.conv1(x)), inplace=self.inplace_relu))
+        for block in self.blocks:
+            x = block(x)
+        
+        # Global average pooling (single reduction, output already flat)
+        x = x.mean(dim=(2, 3))
+        
+        # Shared features
+        return F.relu(self.fc_shared(x), inplace=self.inplace_relu)
+    
+    def conv_bn_fuse_groups(self) -> List[List[str]]:
+        """List [conv, bn] module-name pairs for torch.ao.quantization.fuse_modules.
+        
+        Found by walking named_modules() for a BatchNorm2d registered directly
+        after a Conv2d (the stem, both convs of every ResidualBlock and the
+        projection shortcuts). The ReLUs are functional, so groups never include
+        them; already-fused pairs (BN replaced by Identity) are skipped.
+        
+        Returns:
+            List of [conv_name, bn_name] pairs
+        """
+        groups = []
+        prev_name, prev_module = None, None
+        for name, module in self.named_modules():
+            if isinstance(module, nn.BatchNorm2d) and isinstance(prev_module, nn.Conv2d):
+                groups.append([prev_name, name])
+            prev_name, prev_module = name, module
+        return groups
+    
+    def fuse_for_inference(self) -> 'FRA2DCNN':
+        """Fold every Conv2d/BatchNorm2d pair into a single Conv2d.
+        
+        Puts the model in eval mode and replaces each folded BatchNorm2d with
+        nn.Identity, so inference runs one conv kernel per pair. The three head
+        output Linears are also packed into one block-diagonal GEMM used in eval
+        mode. The fused model must not be trained further.
+        
+        The last BN of the final stage is folded into its conv like the others rather
+        than into fc_shared: the block's residual add and ReLU sit between it
+        and the global average pool, so its affine does not commute into the
+        FC weights.
+        
+        Returns:
+            The model itself, for chaining
+        """
+        self.eval()
+        
+        groups = self.conv_bn_fuse_groups()
+        if groups:
+            torch.ao.quantization.fuse_modules(self, groups, inplace=True)
+        
+        with torch.no_grad():
+            # Pack the head output layers; the hidden layers are already one
+            # fc_heads_in GEMM, but the ReLU in between prevents merging further
+            # Stored pre-transposed as (in, out) for torch.addmm
+            self._head_out_weight_t = torch.block_diag(
+                self.fc_fault_out.weight, self.fc_severity_out.weight, self.fc_anomaly_out.weight
+            ).t().contiguous()
+            self._head_out_bias = torch.cat([
+                self.fc_fault_out.bias, self.fc_severity_out.bias, self.fc_anomaly_out.bias
+            ])
+        
+        if self.channels_last:
+            self.to_channels_last()
+        
+        return self
+
+
+    def to_inference_fp16(self, dtype: Optional[torch.dtype] = None) -> 'FRA2DCNN':
+        """Convert the model to reduced-precision weights for inference only.
+        
+        Fuses conv/BN first, then casts the weights to float16 (bfloat16 when
+        the model lives on the CPU) in channels_last layout. Any BatchNorm left
+        unfused keeps FP32 parameters and statistics. Inputs passed to forward
+        are cast to the same dtype. Do not train the converted model.
+        
+        Args:
+            dtype: torch.float16 or torch.bfloat16; chosen from the device if None
             
-            return x
+        Returns:
+            The model itself, for chaining
+        """
+        self.fuse_for_inference()
+        
+        if dtype is None:
+            on_cuda = next(self.parameters()).is_cuda
+            dtype = torch.float16 if on_cuda else torch.bfloat16
+        
+        self.to(dtype)
+        for m in self.modules():
+            if isinstance(m, nn.BatchNorm2d):
+                m.float()
+        
+        self.inference_dtype = dtype
+        return self.to_channels_last()
 
 
 class ResidualBlock(nn.Module):
     """Residual block for 2D CNN."""
     
-    def __init__(self, in_channels: int, out_channels: int, stride: int = 1):
+    def __init__(self, in_channels: int, out_channels: int, stride: int = 1,
+                 inplace_relu: bool = True):
         super(ResidualBlock, self).__init__()
         
+        self.inplace_relu = inplace_relu
+        
         self.conv1 = nn.Conv2d(in_channels, out_channels, kernel_size=3, 
                               stride=stride, padding=1, bias=False)
         self.bn1 = nn.BatchNorm2d(out_channels)
@@ -204,64 +405,135 @@ class ResidualBlock(nn.Module):
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         residual = self.shortcut(x)
         
-        out = F.relu(self.bn1(self.conv1(x)))
+        out = F.relu(self.bn1(self.conv1(x)), inplace=self.inplace_relu)
         out = self.bn2(self.conv2(out))
         
         out += residual
-        out = F.relu(out)
+        out = F.relu(out, inplace=self.inplace_relu)
         
         return out
 
 
 class FRAImageConverter:
-    """Converts FRA data to 2D image representations for CNN analysis."""
+    """Converts FRA data to 2D image representations for CNN analysis.
+    
+    With reuse_buffers=True the plot and grid images are drawn into
+    per-instance buffers that are returned directly and overwritten by the
+    next call; such a converter is not thread-safe.
+    """
     
-    def __init__(self, image_size: Tuple[int, int] = (224, 224)):
+    def __init__(self, image_size: Tuple[int, int] = (224, 224),
+                 reuse_buffers: bool = False):
         self.image_size = image_size
+        self.reuse_buffers = reuse_buffers
+        
+        self._plot_buf = None
+        self._grid_buf = None
+        if reuse_buffers:
+            self._plot_buf = np.empty(image_size, dtype=np.float32)
+            self._grid_buf = np.empty(image_size, dtype=np.float32)
+        
+        # Pixel columns per frequency grid; sweeps usually share one grid
+        self._freq_cache = {}
+    
+    def clear_cache(self):
+        """Drop the cached frequency-to-column mappings."""
+        self._freq_cache.clear()
+    
+    def _freq_columns(self, frequencies: np.ndarray, rounded: bool) -> np.ndarray:
+        """Map frequencies to pixel columns on a log axis, cached per grid.
+        
+        Args:
+            frequencies: Frequency points
+            rounded: Round to the nearest column (plot) instead of truncating (grid)
+            
+        Returns:
+            Read-only array of column indices clipped to the image width
+        """
+        frequencies = np.asarray(frequencies)
+        width = self.image_size[1]
+        key = (frequencies.dtype.str, frequencies.shape, hash(frequencies.tobytes()),
+               width, rounded)
+        
+        xs = self._freq_cache.get(key)
+        if xs is None:
+            log_freq = np.log10(frequencies)
+            freq_min = log_freq.min()
+            freq_span = (log_freq.max() - freq_min) or 1.0
+            
+            pos = (log_freq - freq_min) / freq_span * (width - 1)
+            if rounded:
+                np.rint(pos, out=pos)
+            xs = np.clip(pos.astype(np.intp), 0, width - 1)
+            xs.flags.writeable = False
+            
+            if len(self._freq_cache) >= _FREQ_CACHE_SIZE:
+                self._freq_cache.clear()
+            self._freq_cache[key] = xs
+        
+        return xs
+    
+    def _canvas(self, buf: Optional[np.ndarray], fill_value: float,
+                out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return a filled output image: out if given, else buf when buffers are enabled."""
+        if out is not None:
+            buf = out
+        if buf is not None:
+            buf.fill(fill_value)
+            return buf
+        return np.full(self.image_size, fill_value, dtype=np.float32)
     
     def fra_to_spectrogram(self, frequencies: np.ndarray, 
                           magnitudes: np.ndarray,
-                          phases: Optional[np.ndarray] = None) -> np.ndarray:
+                          phases: Optional[np.ndarray] = None,
+                          device: Optional[str] = None) -> np.ndarray:
         """Convert FRA data to spectrogram representation.
         
         Args:
             frequencies: Frequency points
             magnitudes: Magnitude values
             phases: Phase values (optional)
+            device: Torch device (e.g. 'cuda') to compute the STFT and resize on;
+                None uses scipy.signal.spectrogram on the CPU
             
         Returns:
             2D spectrogram image
         """
         try:
-            import matplotlib.pyplot as plt
-            from scipy import signal
-            
             # Create spectrogram using STFT of magnitude data
             nperseg = min(256, len(magnitudes) // 4)
-            f, t, Sxx = signal.spectrogram(
-                magnitudes, 
-                fs=len(magnitudes),
-                nperseg=nperseg,
-                mode='magnitude'
-            )
             
-            # Convert to dB scale
-            Sxx_db = 20 * np.log10(np.maximum(Sxx, 1e-12))
+            if device is None:
+                f, t, Sxx = signal.spectrogram(
+                    magnitudes, 
+                    fs=len(magnitudes),
+                    nperseg=nperseg,
+                    mode='magnitude'
+                )
+                
+                # Convert to dB scale in place
+                Sxx_db = np.maximum(Sxx, 1e-12, out=Sxx).astype(np.float32, copy=False)
+                np.log10(Sxx_db, out=Sxx_db)
+                Sxx_db *= 20.0
+                Sxx_db = torch.from_numpy(Sxx_db)
+            else:
+                Sxx_db = self._spectrogram_db_torch(magnitudes, nperseg, device)
             
-            # Resize to target image size
-            from scipy.ndimage import zoom
-            
-            zoom_factors = (
-                self.image_size[0] / Sxx_db.shape[0],
-                self.image_size[1] / Sxx_db.shape[1]
+            # Resize to target image size (bilinear, vectorized torch kernel)
+            resized = F.interpolate(
+                Sxx_db[None, None],
+                size=tuple(self.image_size),
+                mode='bilinear',
+                align_corners=False,
+                antialias=True
             )
+            spectrogram_image = resized[0, 0].cpu().numpy()
             
-            spectrogram_image = zoom(Sxx_db, zoom_factors)
-            
-            # Normalize to [0, 1]
-            spectrogram_image = (spectrogram_image - spectrogram_image.min()) / (
-                spectrogram_image.max() - spectrogram_image.min() + 1e-8
-            )
+            # Normalize to [0, 1] in place
+            img_min = spectrogram_image.min()
+            img_max = spectrogram_image.max()
+            spectrogram_image -= img_min
+            spectrogram_image *= 1.0 / (img_max - img_min + 1e-8)
             
             return spectrogram_image
             
@@ -270,23 +542,61 @@ class FRAImageConverter:
             # Fallback to simple 2D representation
             return self.fra_to_plot_image(frequencies, magnitudes, phases)
     
+    @staticmethod
+    def _spectrogram_db_torch(magnitudes: np.ndarray, nperseg: int,
+                              device: str) -> torch.Tensor:
+        """Torch equivalent of scipy.signal.spectrogram(mode='magnitude') in dB.
+        
+        Uses the same Tukey window, nperseg // 8 overlap, per-segment mean
+        detrend and scaling as SciPy, with frames batched through one rFFT.
+        The STFT runs in float64 like SciPy's: smooth FRA traces leave
+        high-frequency bins near the rounding floor, where float32 would
+        shift their dB values by several dB. Only the dB result is float32.
+        """
+        mag = torch.as_tensor(magnitudes, device=device, dtype=torch.float64)
+        
+        frames = mag.unfold(0, nperseg, nperseg - nperseg // 8)
+        frames = frames - frames.mean(dim=1, keepdim=True)
+        
+        window = torch.as_tensor(signal.get_window(('tukey', 0.25), nperseg),
+                                 device=device, dtype=torch.float64)
+        scale = torch.rsqrt(len(magnitudes) * (window * window).sum())
+        
+        Sxx = torch.fft.rfft(frames * window, dim=1).abs().T * scale
+        return (20.0 * torch.log10(Sxx.clamp_min(1e-12))).to(torch.float32)
+    
     def fra_to_plot_image(self, frequencies: np.ndarray,
                          magnitudes: np.ndarray, 
-                         phases: Optional[np.ndarray] = None) -> np.ndarray:
+                         phases: Optional[np.ndarray] = None,
+                         high_quality: bool = False) -> np.ndarray:
         """Convert FRA data to plot-based image representation.
         
+        By default the magnitude trace is rasterized directly with NumPy. Set
+        high_quality to render through matplotlib with LANCZOS resampling.
+        
         Args:
             frequencies: Frequency points
             magnitudes: Magnitude values
             phases: Phase values (optional)
+            high_quality: Use the (much slower) matplotlib rendering path
             
         Returns:
             2D plot image
         """
+        # Both renderers index and reduce the inputs as arrays; the
+        # normalizer's records hold plain lists
+        frequencies = np.asarray(frequencies, dtype=float)
+        magnitudes = np.asarray(magnitudes, dtype=float)
+        
+        if not high_quality:
+            try:
+                return self._rasterize_plot(frequencies, magnitudes)
+            except Exception as e:
+                logger.warning(f"Plot image rasterization failed: {e}")
+                return self._create_simple_grid(frequencies, magnitudes)
+        
         try:
-            import matplotlib.pyplot as plt
-            from io import BytesIO
-            from PIL import Image
+            plt, Image = _load_plotting()
             
             # Create figure with specified size
             fig, ax = plt.subplots(figsize=(8, 6), dpi=28)  # Gives ~224x168
@@ -324,35 +634,102 @@ class FRAImageConverter:
             # Fallback to simple grid representation
             return self._create_simple_grid(frequencies, magnitudes)
     
+    def convert_batch(self, freq_list: Sequence[np.ndarray],
+                      mag_list: Sequence[np.ndarray],
+                      num_workers: Optional[int] = None) -> np.ndarray:
+        """Rasterize many FRA sweeps into plot images using a thread pool.
+        
+        Uses the NumPy rasterizer (never matplotlib, which is not thread-safe);
+        its vectorized operations release the GIL, so threads scale. Each worker
+        draws straight into its slice of one preallocated output array.
+        
+        Args:
+            freq_list: Frequency arrays, one per sweep
+            mag_list: Magnitude arrays, one per sweep
+            num_workers: Thread count (defaults to os.cpu_count())
+            
+        Returns:
+            Array of shape (num_sweeps, height, width)
+        """
+        if len(freq_list) != len(mag_list):
+            raise ValueError("freq_list and mag_list must have the same length")
+        
+        images = np.empty((len(freq_list), *self.image_size), dtype=np.float32)
+        
+        def convert(i):
+            # Sweeps may be plain lists, as fra_to_plot_image accepts
+            frequencies = np.asarray(freq_list[i], dtype=float)
+            magnitudes = np.asarray(mag_list[i], dtype=float)
+            try:
+                self._rasterize_plot(frequencies, magnitudes, out=images[i])
+            except Exception as e:
+                logger.warning(f"Plot image rasterization failed: {e}")
+                self._create_simple_grid(frequencies, magnitudes, out=images[i])
+        
+        with ThreadPoolExecutor(max_workers=num_workers or os.cpu_count()) as executor:
+            list(executor.map(convert, range(len(freq_list))))
+        
+        return images
+    
+    def _rasterize_plot(self, frequencies: np.ndarray,
+                        magnitudes: np.ndarray,
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Draw the semilog magnitude trace as a dark line on a white canvas."""
+        height, width = self.image_size
+        canvas = self._canvas(self._plot_buf, 1.0, out)
+        
+        mag_min, mag_max = magnitudes.min(), magnitudes.max()
+        mag_span = (mag_max - mag_min) or 1.0
+        
+        # Pixel coordinates of each sample (higher magnitude at top)
+        xs = self._freq_columns(frequencies, rounded=True)
+        ys = (height - 1) - np.rint((magnitudes - mag_min) / mag_span * (height - 1)).astype(np.intp)
+        
+        if len(xs) < 2:
+            canvas[ys, xs] = 0.0
+            return canvas
+        
+        # Connect consecutive samples: one interpolated point per pixel step
+        dx = np.diff(xs)
+        dy = np.diff(ys)
+        steps = np.maximum(np.abs(dx), np.abs(dy)) + 1
+        seg = np.repeat(np.arange(len(steps)), steps)
+        offsets = np.arange(len(seg)) - np.repeat(np.cumsum(steps) - steps, steps)
+        t = offsets / np.maximum(steps - 1, 1)[seg]
+        
+        line_x = np.rint(xs[:-1][seg] + t * dx[seg]).astype(np.intp)
+        line_y = np.rint(ys[:-1][seg] + t * dy[seg]).astype(np.intp)
+        canvas[line_y, line_x] = 0.0
+        
+        return canvas
+    
     def _create_simple_grid(self, frequencies: np.ndarray, 
-                           magnitudes: np.ndarray) -> np.ndarray:
+                           magnitudes: np.ndarray,
+                           out: Optional[np.ndarray] = None) -> np.ndarray:
         """Create simple grid representation as fallback."""
         # Create a simple 2D grid representation
-        grid = np.zeros(self.image_size)
+        grid = self._canvas(self._grid_buf, 0.0, out)
         
         # Map frequency and magnitude to grid coordinates
-        log_freq = np.log10(frequencies)
-        
-        freq_min, freq_max = log_freq.min(), log_freq.max()
         mag_min, mag_max = magnitudes.min(), magnitudes.max()
+        mag_span = (mag_max - mag_min) or 1.0
         
-        for i, (f, m) in enumerate(zip(log_freq, magnitudes)):
-            # Map to grid coordinates
-            x = int((f - freq_min) / (freq_max - freq_min) * (self.image_size[1] - 1))
-            y = int((m - mag_min) / (mag_max - mag_min) * (self.image_size[0] - 1))
-            
-            # Invert y-axis (higher magnitude at top)
-            y = self.image_size[0] - 1 - y
-            
-            if 0 <= x < self.image_size[1] and 0 <= y < self.image_size[0]:
-                grid[y, x] = 1.0
+        # Map all points to grid coordinates at once
+        xs = self._freq_columns(frequencies, rounded=False)
+        ys = ((magnitudes - mag_min) / mag_span * (self.image_size[0] - 1)).astype(np.intp)
+        
+        # Invert y-axis (higher magnitude at top)
+        ys = self.image_size[0] - 1 - ys
+        
+        np.clip(ys, 0, self.image_size[0] - 1, out=ys)
+        grid[ys, xs] = 1.0
         
         return grid
 
 
 # Test function
-def test_2d_cnn():
-    """Test 2D CNN model with sample data."""
+def test_2d_cnn_forward():
+    """Test 2D CNN model forward pass with sample data."""
     print("\nTesting 2D CNN FRA Model...")
     
     # Model parameters
@@ -385,17 +762,6 @@ def test_2d_cnn():
         features = model.extract_features(sample_input)
         print(f"✓ Feature extraction shape: {features.shape}")
         
-        # Test image converter
-        converter = FRAImageConverter(image_size)
-        
-        # Create sample FRA data
-        frequencies = np.logspace(4, 7, 1000)
-        magnitudes = 40 - 10 * np.log10(frequencies / 1e4)
-        
-        # Convert to image
-        fra_image = converter.fra_to_plot_image(frequencies, magnitudes)
-        print(f"✓ FRA to image conversion shape: {fra_image.shape}")
-        
         # Count parameters
         total_params = sum(p.numel() for p in model.parameters())
         trainable_params = sum(p.numel() for p in model.parameters() if p.requires_grad)
@@ -410,5 +776,35 @@ def test_2d_cnn():
         return None
 
 
+def test_2d_cnn_image_conversion():
+    """Test FRA to image conversion (includes the matplotlib render path)."""
+    print("\nTesting FRA Image Converter...")
+    
+    image_size = (224, 224)
+    converter = FRAImageConverter(image_size)
+    
+    # Create sample FRA data
+    frequencies = np.logspace(4, 7, 1000)
+    magnitudes = 40 - 10 * np.log10(frequencies / 1e4)
+    
+    try:
+        # Convert to image
+        fra_image = converter.fra_to_plot_image(frequencies, magnitudes)
+        print(f"✓ FRA to image conversion shape: {fra_image.shape}")
+        
+        hq_image = converter.fra_to_plot_image(frequencies, magnitudes, high_quality=True)
+        print(f"✓ High-quality FRA to image conversion shape: {hq_image.shape}")
+        
+        spectrogram = converter.fra_to_spectrogram(frequencies, magnitudes)
+        print(f"✓ FRA to spectrogram conversion shape: {spectrogram.shape}")
+        
+        return converter
+        
+    except Exception as e:
+        print(f"✗ Image conversion test failed: {e}")
+        return None
+
+
 if __name__ == "__main__":
-    test_2d_cnn()
+    # Image conversion pulls in matplotlib/PIL; run test_2d_cnn_image_conversion() explicitly
+    test_2d_cnn_forward()
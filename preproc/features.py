@@ -7,56 +7,710 @@ Includes frequency-domain, statistical, and domain-specific features.
 """
 
 import numpy as np
-from scipy import signal, stats
+from scipy import signal
 from sklearn.preprocessing import StandardScaler
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the NumPy implementations are used instead
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+# Max number of frequency grids FRAFeatureExtractor keeps band indices for
+_GRID_CACHE_SIZE = 32
+
+# (is_dyn_winding, is_ynyn_winding) for known winding configurations; other
+# values are classified by substring once and memoized per extractor (up to
+# _WINDING_CACHE_SIZE entries)
+_WINDING_CACHE_SIZE = 256
+_WINDING_FLAGS = {
+    'unknown': (0.0, 0.0),
+    'Dyn1': (1.0, 0.0),
+    'Dyn11': (1.0, 0.0),
+    'YNyn0': (0.0, 1.0),
+}
+
+# is_capacitive_coupling per coupling type
+_COUPLING_FLAGS = {'capacitive': 1.0}
+
+# 10**(dB / 20) == exp(dB * _DB_TO_LOG_AMPLITUDE)
+_DB_TO_LOG_AMPLITUDE = np.log(10.0) / 20.0
+
+
+def _db_to_linear(magnitudes: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert dB magnitudes to float64 linear amplitude with a single exp pass."""
+    out = np.multiply(magnitudes, _DB_TO_LOG_AMPLITUDE, dtype=np.float64, out=out)
+    return np.exp(out, out=out)
+
+
+def _linregress(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Closed-form least-squares slope, r and slope std error.
+    
+    Same results as scipy.stats.linregress (centred sums of squares, r clipped
+    to [-1, 1] and set to 0 for constant data) without its validation and
+    p-value overhead. y may be (N,) or (M, N) with rows regressed on a shared x.
+    
+    Args:
+        x: Independent variable, shape (N,)
+        y: Dependent variable, shape (N,) or (M, N)
+        
+    Returns:
+        Tuple of (slope, r_value, std_err)
+    """
+    xm = x - x.mean()
+    ym = y - y.mean(axis=-1, keepdims=True, dtype=np.float64)
+    ssx = np.dot(xm, xm)
+    ssy = np.einsum('...i,...i->...', ym, ym)
+    sxy = ym @ xm
+    
+    den = np.sqrt(ssx * ssy)
+    r_value = np.clip(np.where(den > 0, sxy / np.where(den > 0, den, 1.0), 0.0), -1.0, 1.0)
+    slope = sxy / ssx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std_err = np.sqrt((1 - r_value**2) * ssy / ssx / (len(x) - 2))
+    
+    return slope, r_value, std_err
+
+
+def _central_moments(x: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Order and moment statistics of x along its last axis in shared passes.
+    
+    The deviations from the mean are reused for variance, skewness and excess
+    kurtosis (same Fisher-Pearson estimators and near-constant NaN handling as
+    scipy.stats), and one np.partition yields min, max and the linearly
+    interpolated quartiles of np.percentile.
+    
+    Args:
+        x: Values, shape (N,) or (M, N); float32 input is accumulated in float64
+        
+    Returns:
+        Tuple of (mean, std, var, skew, kurt, min, max, q25, q75)
+    """
+    n = x.shape[-1]
+    mean = x.mean(axis=-1, keepdims=True, dtype=np.float64)
+    d = x - mean
+    d2 = d * d
+    var = d2.mean(axis=-1)
+    m3 = (d2 * d).mean(axis=-1)
+    m4 = (d2 * d2).mean(axis=-1)
+    mean = mean[..., 0]
+    
+    eps = np.finfo(var.dtype).resolution
+    zero = var <= (eps * mean)**2
+    safe_var = np.where(zero, 1.0, var)
+    skew = np.where(zero, np.nan, m3 / safe_var**1.5)
+    kurt = np.where(zero, np.nan, m4 / safe_var**2 - 3.0)
+    
+    positions = np.array([0.25, 0.75]) * (n - 1)
+    lo = np.floor(positions).astype(int)
+    hi = np.minimum(lo + 1, n - 1)
+    part = np.partition(x, np.unique([0, n - 1, *lo, *hi]), axis=-1)
+    a, b = part[..., lo], part[..., hi]
+    t = positions - lo
+    quartiles = np.where(t >= 0.5, b - (b - a) * (1 - t), a + (b - a) * t)
+    
+    return (mean, np.sqrt(var), var, skew, kurt, part[..., 0], part[..., n - 1],
+            quartiles[..., 0], quartiles[..., 1])
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _spectral_moments_kernel(frequencies, normalized_power):
+        """Fused centroid and central moments 2-4, one row per spectrum."""
+        num_rows, num_points = normalized_power.shape
+        moments = np.empty((num_rows, 4))
+        for row in range(num_rows):
+            centroid = 0.0
+            for i in range(num_points):
+                centroid += frequencies[i] * normalized_power[row, i]
+            m2 = 0.0
+            m3 = 0.0
+            m4 = 0.0
+            for i in range(num_points):
+                d = frequencies[i] - centroid
+                d2p = d * d * normalized_power[row, i]
+                m2 += d2p
+                m3 += d2p * d
+                m4 += d2p * d * d
+            moments[row, 0] = centroid
+            moments[row, 1] = m2
+            moments[row, 2] = m3
+            moments[row, 3] = m4
+        return moments
+else:
+    _spectral_moments_kernel = None
+
+
+def _spectral_moments(frequencies: np.ndarray, normalized_power: np.ndarray) -> np.ndarray:
+    """Spectral centroid and central moments 2-4 of one or more power spectra.
+    
+    Args:
+        frequencies: Frequency points, shape (N,)
+        normalized_power: Power distributions summing to 1, shape (M, N)
+        
+    Returns:
+        Array of shape (M, 4) with columns (centroid, m2, m3, m4)
+    """
+    if _spectral_moments_kernel is not None:
+        return _spectral_moments_kernel(frequencies.astype(np.float64, copy=False),
+                                        normalized_power.astype(np.float64, copy=False))
+    
+    moments = np.empty((normalized_power.shape[0], 4))
+    centroid = np.matmul(normalized_power, frequencies, out=moments[:, 0])
+    
+    # Two scratch arrays: deviations d and the running d**k * p, updated in place
+    d = np.subtract(frequencies, centroid[:, None])
+    weighted = np.multiply(d, d)
+    weighted *= normalized_power
+    weighted.sum(axis=1, out=moments[:, 1])
+    weighted *= d
+    weighted.sum(axis=1, out=moments[:, 2])
+    weighted *= d
+    weighted.sum(axis=1, out=moments[:, 3])
+    return moments
+
+
+# Output layout of _extract_core_kernel after the per-band values
+_CORE_STAT_NAMES = (
+    'mag_mean', 'mag_std', 'mag_var', 'mag_skewness', 'mag_kurtosis',
+    'mag_min', 'mag_max', 'mag_range', 'mag_q25', 'mag_q75', 'mag_iqr',
+    'mag_diff1_mean', 'mag_diff1_std', 'mag_diff2_mean', 'mag_diff2_std',
+    'phase_mean', 'phase_std', 'phase_var', 'phase_skewness',
+    'phase_kurtosis', 'phase_range', 'phase_diff1_mean', 'phase_diff1_std'
+)
+_CORE_SPECTRAL_NAMES = (
+    'spectral_centroid', 'spectral_spread', 'spectral_skewness',
+    'spectral_kurtosis', 'spectral_rolloff', 'zero_crossing_rate'
+)
+
+# Standard frequency bands for analysis
+_STANDARD_FREQUENCY_BANDS = {
+    'low': (20e3, 100e3),      # 20-100 kHz
+    'mid_low': (100e3, 500e3), # 100-500 kHz
+    'mid': (500e3, 2e6),       # 500 kHz - 2 MHz
+    'mid_high': (2e6, 5e6),    # 2-5 MHz
+    'high': (5e6, 12e6)        # 5-12 MHz
+}
+
+# Scalar outputs of find_resonance_peaks and _metadata_features
+_PEAK_NAMES = (
+    'num_peaks', 'mean_peak_frequency', 'std_peak_frequency',
+    'max_peak_magnitude', 'mean_peak_prominence'
+)
+_METADATA_NAMES = (
+    'transformer_rating_mva', 'is_dyn_winding', 'is_ynyn_winding',
+    'test_voltage', 'ambient_temperature', 'is_capacitive_coupling'
+)
+
+
+def _feature_names(band_names: List[str]) -> Tuple[str, ...]:
+    """Sorted names of every feature extract_all_features can produce."""
+    names = [f'energy_ratio_{band}' for band in band_names]
+    names += ['low_to_high_ratio', 'mid_to_high_ratio', *_PEAK_NAMES]
+    for band in band_names:
+        names += [f'slope_{band}', f'slope_r2_{band}', f'slope_std_err_{band}']
+    names += ['overall_slope', 'overall_slope_r2', *_CORE_STAT_NAMES,
+              *_CORE_SPECTRAL_NAMES, *_METADATA_NAMES]
+    return tuple(sorted(names))
+
+
+# Column order of feature rows/matrices for the standard bands (the order
+# create_feature_matrix uses when the first sample has metadata)
+FEATURE_NAMES = _feature_names(list(_STANDARD_FREQUENCY_BANDS))
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+if njit is not None:
+    @njit(cache=True, nogil=True, error_model='numpy')
+    def _moments_kernel(x):
+        """Population mean, variance, skewness and excess kurtosis (as scipy.stats)."""
+        n = x.shape[0]
+        mean = 0.0
+        for i in range(n):
+            mean += x[i]
+        mean /= n
+        m2 = 0.0
+        m3 = 0.0
+        m4 = 0.0
+        for i in range(n):
+            d = x[i] - mean
+            d2 = d * d
+            m2 += d2
+            m3 += d2 * d
+            m4 += d2 * d2
+        m2 /= n
+        m3 /= n
+        m4 /= n
+        # scipy returns NaN when the variance is lost in round-off
+        eps = np.finfo(np.float64).eps
+        if m2 <= (eps * mean) ** 2:
+            return mean, m2, np.nan, np.nan
+        return mean, m2, m3 / m2 ** 1.5, m4 / (m2 * m2) - 3.0
+    
+    @njit(cache=True, nogil=True, error_model='numpy')
+    def _diff_stats_kernel(x):
+        """Mean |d| and population std of the first and second differences d of x.
+        
+        One pass without storing the differences: their means telescope to
+        end-point expressions, so the variances still use exact deviations.
+        """
+        n = x.shape[0]
+        mean1 = (np.float64(x[n - 1]) - x[0]) / (n - 1) if n >= 2 else np.nan
+        mean2 = (np.float64(x[n - 1]) - x[n - 2] - x[1] + x[0]) / (n - 2) if n >= 3 else np.nan
+        abs1 = 0.0
+        var1 = 0.0
+        abs2 = 0.0
+        var2 = 0.0
+        prev_d1 = 0.0
+        for i in range(1, n):
+            d1 = np.float64(x[i]) - x[i - 1]
+            abs1 += abs(d1)
+            var1 += (d1 - mean1) ** 2
+            if i >= 2:
+                d2 = d1 - prev_d1
+                abs2 += abs(d2)
+                var2 += (d2 - mean2) ** 2
+            prev_d1 = d1
+        return (abs1 / (n - 1), np.sqrt(var1 / (n - 1)),
+                abs2 / (n - 2), np.sqrt(var2 / (n - 2)))
+    
+    @njit(cache=True, nogil=True, error_model='numpy')
+    def _unwrap_degrees_kernel(phases, out):
+        """out = np.unwrap(np.radians(phases)), converting and unwrapping in one pass."""
+        n = phases.shape[0]
+        if n == 0:
+            return
+        correction = 0.0
+        prev = phases[0] * (np.pi / 180.0)
+        out[0] = prev
+        for i in range(1, n):
+            cur = phases[i] * (np.pi / 180.0)
+            dd = cur - prev
+            ddmod = (dd + np.pi) % (2.0 * np.pi) - np.pi
+            if ddmod == -np.pi and dd > 0:
+                ddmod = np.pi
+            if abs(dd) >= np.pi:
+                correction += ddmod - dd
+            out[i] = cur + correction
+            prev = cur
+    
+    @njit(cache=True, nogil=True)
+    def _unwrap_degrees_rows_kernel(phases):
+        """_unwrap_degrees_kernel for each row of a 2-D array."""
+        out = np.empty(phases.shape)
+        for row in range(phases.shape[0]):
+            _unwrap_degrees_kernel(phases[row], out[row])
+        return out
+    
+    @njit(cache=True, nogil=True)
+    def _diff_stats_rows_kernel(x):
+        """_diff_stats_kernel for each row of a 2-D array."""
+        out = np.empty((x.shape[0], 4))
+        for row in range(x.shape[0]):
+            out[row, 0], out[row, 1], out[row, 2], out[row, 3] = _diff_stats_kernel(x[row])
+        return out
+    
+    @njit(cache=True, nogil=True, error_model='numpy')
+    def _slope_kernel(x, y):
+        """Least-squares slope, r and slope std error (as scipy linregress)."""
+        n = x.shape[0]
+        x_mean = 0.0
+        y_mean = 0.0
+        for i in range(n):
+            x_mean += x[i]
+            y_mean += y[i]
+        x_mean /= n
+        y_mean /= n
+        ssx = 0.0
+        ssy = 0.0
+        sxy = 0.0
+        for i in range(n):
+            dx = x[i] - x_mean
+            dy = y[i] - y_mean
+            ssx += dx * dx
+            ssy += dy * dy
+            sxy += dx * dy
+        den = np.sqrt(ssx * ssy)
+        r_value = sxy / den if den > 0 else 0.0
+        r_value = min(max(r_value, -1.0), 1.0)
+        slope = sxy / ssx
+        std_err = np.sqrt((1 - r_value * r_value) * ssy / ssx / (n - 2))
+        return slope, r_value, std_err
+    
+    @njit(cache=True, nogil=True, error_model='numpy')
+    def _extract_core_kernel(frequencies, log_frequencies, magnitudes, diff_magnitudes,
+                             phases, has_phases, band_bounds, scratch):
+        """Band, slope, statistical and spectral features of one sample.
+        
+        diff_magnitudes are the float64 magnitudes for the derivative
+        statistics, which cancel too much to take from rounded storage.
+        scratch is a (3, N) float64 work array for power, normalized power
+        and unwrapped phases. Returns [band energies (B), (slope, r2, std_err)
+        per band (3B), overall slope, overall r2, _CORE_STAT_NAMES...,
+        _CORE_SPECTRAL_NAMES...].
+        """
+        n = magnitudes.shape[0]
+        num_bands = band_bounds.shape[0]
+        out = np.zeros(4 * num_bands + 2 + 23 + 6)
+        
+        # Linear power per point, reused by band energies and spectral features
+        power = scratch[0]
+        power_sum = 0.0
+        for i in range(n):
+            power[i] = np.exp(magnitudes[i] * (2.0 * _DB_TO_LOG_AMPLITUDE))
+            power_sum += power[i]
+        
+        # Band energies and per-band slopes
+        for b in range(num_bands):
+            lo = band_bounds[b, 0]
+            hi = band_bounds[b, 1]
+            energy = 0.0
+            for i in range(lo, hi):
+                energy += power[i]
+            out[b] = energy
+            if hi - lo >= 3:
+                slope, r_value, std_err = _slope_kernel(log_frequencies[lo:hi], magnitudes[lo:hi])
+                out[num_bands + 3 * b] = slope
+                out[num_bands + 3 * b + 1] = r_value * r_value
+                out[num_bands + 3 * b + 2] = std_err
+        k = 4 * num_bands
+        if n >= 3:
+            slope, r_value, _ = _slope_kernel(log_frequencies, magnitudes)
+            out[k] = slope
+            out[k + 1] = r_value * r_value
+        k += 2
+        
+        # Magnitude statistics
+        mean, var, skew, kurt = _moments_kernel(magnitudes)
+        
+        # Min, max and the quartile neighbours from one O(N) partition
+        kth = np.empty(6, dtype=np.int64)
+        kth[0] = 0
+        kth[1] = n - 1
+        for q in range(2):
+            kth[2 + 2 * q] = int(np.floor((0.25 + 0.5 * q) * (n - 1)))
+            kth[3 + 2 * q] = min(kth[2 + 2 * q] + 1, n - 1)
+        part = np.partition(magnitudes, kth)
+        quartiles = np.empty(2)
+        for q in range(2):
+            t = (0.25 + 0.5 * q) * (n - 1) - kth[2 + 2 * q]
+            a = np.float64(part[kth[2 + 2 * q]])
+            b = np.float64(part[kth[3 + 2 * q]])
+            # Same interpolation as np.percentile's 'linear' method
+            quartiles[q] = b - (b - a) * (1 - t) if t >= 0.5 else a + (b - a) * t
+        out[k] = mean
+        out[k + 1] = np.sqrt(var)
+        out[k + 2] = var
+        out[k + 3] = skew
+        out[k + 4] = kurt
+        out[k + 5] = part[0]
+        out[k + 6] = part[n - 1]
+        out[k + 7] = np.float64(part[n - 1]) - part[0]
+        out[k + 8] = quartiles[0]
+        out[k + 9] = quartiles[1]
+        out[k + 10] = quartiles[1] - quartiles[0]
+        
+        out[k + 11], out[k + 12], out[k + 13], out[k + 14] = _diff_stats_kernel(diff_magnitudes)
+        
+        # Phase statistics on unwrapped radians (np.unwrap semantics)
+        if has_phases:
+            num_phases = phases.shape[0]
+            unwrapped = scratch[2] if num_phases == n else np.empty(num_phases)
+            _unwrap_degrees_kernel(phases, unwrapped)
+            
+            p_mean, p_var, p_skew, p_kurt = _moments_kernel(unwrapped)
+            d_abs_mean, d_std, _, _ = _diff_stats_kernel(unwrapped)
+            out[k + 15] = p_mean
+            out[k + 16] = np.sqrt(p_var)
+            out[k + 17] = p_var
+            out[k + 18] = p_skew
+            out[k + 19] = p_kurt
+            out[k + 20] = unwrapped.max() - unwrapped.min()
+            out[k + 21] = d_abs_mean
+            out[k + 22] = d_std
+        k += 23
+        
+        # Spectral features
+        normalized_power = scratch[1:2]
+        for i in range(n):
+            normalized_power[0, i] = power[i] / power_sum if power_sum > 0 else 1.0 / n
+        moments = _spectral_moments_kernel(frequencies, normalized_power)
+        spread = np.sqrt(moments[0, 1])
+        out[k] = moments[0, 0]
+        out[k + 1] = spread
+        if spread > 0:
+            out[k + 2] = moments[0, 2] / spread ** 3
+            out[k + 3] = moments[0, 3] / spread ** 4
+        
+        rolloff = frequencies[n - 1]
+        cumulative = 0.0
+        for i in range(n):
+            cumulative += normalized_power[0, i]
+            if cumulative >= 0.85:
+                rolloff = frequencies[i]
+                break
+        out[k + 4] = rolloff
+        
+        crossings = 0
+        prev_negative = np.signbit(magnitudes[0] - mean)
+        for i in range(1, n):
+            negative = np.signbit(magnitudes[i] - mean)
+            if negative != prev_negative:
+                crossings += 1
+            prev_negative = negative
+        out[k + 5] = crossings / n
+        
+        return out
+    
+    @njit(cache=True, nogil=True)
+    def _find_peaks_kernel(x, min_prominence, min_width):
+        """signal.find_peaks(x, prominence=min_prominence, width=min_width).
+        
+        Same plateau handling, unbounded-window prominences and half-prominence
+        interpolated widths as scipy, done in one pass per candidate maximum.
+        x must be float64, as scipy converts it. Returns (peak indices,
+        prominences, widths).
+        """
+        n = x.shape[0]
+        peaks = np.empty(n // 2 + 1, dtype=np.int64)
+        prominences = np.empty(n // 2 + 1)
+        widths = np.empty(n // 2 + 1)
+        num_peaks = 0
+        
+        i = 1
+        while i < n - 1:
+            if x[i - 1] < x[i]:
+                i_ahead = i + 1
+                while i_ahead < n - 1 and x[i_ahead] == x[i]:
+                    i_ahead += 1
+                if x[i_ahead] < x[i]:
+                    peak = (i + i_ahead - 1) // 2
+                    height = x[peak]
+                    
+                    # Prominence: lowest point on each side before higher ground
+                    left_base = peak
+                    left_min = height
+                    j = peak
+                    while j >= 0 and x[j] <= height:
+                        if x[j] < left_min:
+                            left_min = x[j]
+                            left_base = j
+                        j -= 1
+                    right_base = peak
+                    right_min = height
+                    j = peak
+                    while j <= n - 1 and x[j] <= height:
+                        if x[j] < right_min:
+                            right_min = x[j]
+                            right_base = j
+                        j += 1
+                    prominence = height - max(left_min, right_min)
+                    
+                    if prominence >= min_prominence:
+                        # Width at half prominence, linearly interpolated
+                        ref = height - prominence * 0.5
+                        j = peak
+                        while left_base < j and ref < x[j]:
+                            j -= 1
+                        left_ip = float(j)
+                        if x[j] < ref:
+                            left_ip += (ref - x[j]) / (x[j + 1] - x[j])
+                        j = peak
+                        while j < right_base and ref < x[j]:
+                            j += 1
+                        right_ip = float(j)
+                        if x[j] < ref:
+                            right_ip -= (ref - x[j]) / (x[j - 1] - x[j])
+                        width = right_ip - left_ip
+                        
+                        if width >= min_width:
+                            peaks[num_peaks] = peak
+                            prominences[num_peaks] = prominence
+                            widths[num_peaks] = width
+                            num_peaks += 1
+                    i = i_ahead
+            i += 1
+        
+        return peaks[:num_peaks], prominences[:num_peaks], widths[:num_peaks]
+else:
+    _extract_core_kernel = None
+    _find_peaks_kernel = None
+    _diff_stats_rows_kernel = None
+    _unwrap_degrees_rows_kernel = None
+
+
+def _unwrap_degrees(phases: np.ndarray) -> np.ndarray:
+    """np.unwrap(np.radians(phases)) along the last axis, in float64.
+    
+    Args:
+        phases: Phase values (degrees), shape (N,) or (M, N)
+        
+    Returns:
+        Unwrapped phases (radians) with the shape of phases
+    """
+    if _unwrap_degrees_rows_kernel is not None:
+        return _unwrap_degrees_rows_kernel(phases.reshape(-1, phases.shape[-1])).reshape(phases.shape)
+    
+    return np.unwrap(np.radians(phases, dtype=np.float64), axis=-1)
+
+
+def _diff_stats(x: np.ndarray) -> np.ndarray:
+    """Derivative statistics of each row of x.
+    
+    Second differences of smooth traces cancel almost completely, so
+    callers pass float64 values rather than the float32 storage arrays.
+    
+    Args:
+        x: Values, shape (M, N)
+        
+    Returns:
+        Array of shape (M, 4) with columns (mean |diff1|, std diff1,
+        mean |diff2|, std diff2)
+    """
+    if _diff_stats_rows_kernel is not None:
+        return _diff_stats_rows_kernel(x)
+    
+    diff1 = np.diff(x, axis=1)
+    diff2 = np.diff(diff1, axis=1)
+    return np.stack([np.abs(diff1).mean(axis=1, dtype=np.float64), diff1.std(axis=1, dtype=np.float64),
+                     np.abs(diff2).mean(axis=1, dtype=np.float64), diff2.std(axis=1, dtype=np.float64)], axis=1)
+
 class FRAFeatureExtractor:
     """Extracts various features from FRA measurement data."""
     
-    def __init__(self):
+    def __init__(self, dtype: np.dtype = np.float32):
+        """Initialize feature extractor.
+        
+        Args:
+            dtype: Storage dtype for magnitudes and phases. float32 halves the
+                memory traffic of the per-sample arrays; reductions still
+                accumulate in float64. Frequencies are always kept in float64.
+        """
+        self.dtype = np.dtype(dtype)
+        
         # Define standard frequency bands for analysis
-        self.frequency_bands = {
-            'low': (20e3, 100e3),      # 20-100 kHz
-            'mid_low': (100e3, 500e3), # 100-500 kHz
-            'mid': (500e3, 2e6),       # 500 kHz - 2 MHz
-            'mid_high': (2e6, 5e6),    # 2-5 MHz
-            'high': (5e6, 12e6)        # 5-12 MHz
-        }
+        self.frequency_bands = dict(_STANDARD_FREQUENCY_BANDS)
         
         # Peak detection parameters
         self.peak_prominence = 2.0  # dB
         self.peak_width = 5        # Points
         
+        # Band indices and log10 frequencies per frequency grid; samples
+        # processed by FRANormalizer all share one grid
+        self._grid_cache = {}
+        
+        # Winding configuration -> encoded flags
+        self._winding_flags = dict(_WINDING_FLAGS)
+        
+        # Per-thread scratch arrays reused across extract_all_features calls
+        self._scratch = threading.local()
+    
+    def _scratch_buffer(self, num_points: int) -> np.ndarray:
+        """Get the calling thread's (3, num_points) float64 scratch array.
+        
+        The array is reallocated only when the trace length changes. Contents
+        are overwritten by every call, so it must not outlive one extraction.
+        """
+        buffer = getattr(self._scratch, 'buffer', None)
+        if buffer is None or buffer.shape[1] != num_points:
+            buffer = np.empty((3, num_points))
+            self._scratch.buffer = buffer
+        return buffer
+    
+    def reset_buffers(self, num_points: Optional[int] = None):
+        """Release or preallocate the calling thread's scratch buffers.
+        
+        Scratch buffers are thread-local, so one extractor can be shared by
+        worker threads (as create_feature_matrix does with n_jobs > 1); each
+        thread allocates its own set on first use.
+        
+        Args:
+            num_points: Trace length to preallocate for (None = release)
+        """
+        self._scratch.buffer = None
+        if num_points is not None:
+            self._scratch_buffer(num_points)
+    
+    def _frequency_grid(self, frequencies: np.ndarray) -> Dict:
+        """Get cached band index ranges and log10 frequencies for a grid.
+        
+        Args:
+            frequencies: Frequency points (Hz)
+            
+        Returns:
+            Dictionary with 'bands' (band name -> (index, num_points)),
+            'band_bounds' ((B, 2) index ranges, None for unsorted grids),
+            'band_weights' ((N, B) 0/1 band membership) and 'log_frequencies'
+        """
+        key = (frequencies.dtype.str, frequencies.shape, hash(frequencies.tobytes()))
+        grid = self._grid_cache.get(key)
+        if grid is not None:
+            return grid
+        
+        # Membership of every point in every (closed, possibly shared-edge)
+        # band from one broadcast comparison; energies of all bands are then
+        # a single matrix product instead of one masked sum per band
+        band_edges = np.array(list(self.frequency_bands.values()), dtype=np.float64).reshape(-1, 2)
+        membership = ((frequencies[:, None] >= band_edges[:, 0]) &
+                      (frequencies[:, None] <= band_edges[:, 1]))
+        
+        # Sorted grids use contiguous slices; otherwise fall back to index arrays
+        is_sorted = bool(np.all(frequencies[1:] >= frequencies[:-1]))
+        
+        bands = {}
+        for b, (band_name, (f_min, f_max)) in enumerate(self.frequency_bands.items()):
+            if is_sorted:
+                lo = int(np.searchsorted(frequencies, f_min, side='left'))
+                hi = int(np.searchsorted(frequencies, f_max, side='right'))
+                bands[band_name] = (slice(lo, hi), max(hi - lo, 0))
+            else:
+                idx = np.flatnonzero(membership[:, b])
+                bands[band_name] = (idx, len(idx))
+        
+        band_bounds = None
+        if is_sorted:
+            band_bounds = np.array([[sl.start, max(sl.stop, sl.start)] for sl, _ in bands.values()],
+                                   dtype=np.int64).reshape(-1, 2)
+        
+        grid = {
+            'bands': bands,
+            'band_bounds': band_bounds,
+            'band_weights': membership.astype(np.float64),
+            'log_frequencies': np.log10(frequencies)
+        }
+        
+        if len(self._grid_cache) >= _GRID_CACHE_SIZE:
+            self._grid_cache.clear()
+        self._grid_cache[key] = grid
+        
+        return grid
+    
     def extract_band_energy_ratios(self, frequencies: np.ndarray, 
-                                  magnitudes: np.ndarray) -> Dict[str, float]:
+                                  magnitudes: np.ndarray,
+                                  linear_magnitudes: Optional[np.ndarray] = None) -> Dict[str, float]:
         """Calculate energy ratios across frequency bands.
         
         Args:
             frequencies: Frequency points (Hz)
             magnitudes: Magnitude values (dB)
+            linear_magnitudes: Precomputed 10**(magnitudes/20) (optional)
             
         Returns:
             Dictionary of band energy ratios
         """
         # Convert dB to linear for energy calculation
-        linear_magnitudes = 10**(magnitudes / 20)
+        if linear_magnitudes is None:
+            linear_magnitudes = _db_to_linear(magnitudes)
+        power = linear_magnitudes * linear_magnitudes
         
-        band_energies = {}
-        
-        for band_name, (f_min, f_max) in self.frequency_bands.items():
-            # Find indices in frequency band
-            band_mask = (frequencies >= f_min) & (frequencies <= f_max)
-            
-            if np.any(band_mask):
-                # Calculate energy in band (sum of squared magnitudes)
-                band_energy = np.sum(linear_magnitudes[band_mask]**2)
-                band_energies[band_name] = band_energy
-            else:
-                band_energies[band_name] = 0.0
+        # Calculate energy in each band (sum of squared magnitudes) in one pass
+        band_weights = self._frequency_grid(frequencies)['band_weights']
+        band_energies = dict(zip(self.frequency_bands, (power @ band_weights).tolist()))
         
         # Calculate total energy
         total_energy = sum(band_energies.values())
@@ -93,11 +747,17 @@ class FRAFeatureExtractor:
         """
         try:
             # Find peaks with minimum prominence and width
-            peaks, properties = signal.find_peaks(
-                magnitudes,
-                prominence=self.peak_prominence,
-                width=self.peak_width
-            )
+            if _find_peaks_kernel is not None:
+                peaks, prominences, widths = _find_peaks_kernel(
+                    magnitudes.astype(np.float64, copy=False),
+                    float(self.peak_prominence), float(self.peak_width))
+                properties = {'prominences': prominences, 'widths': widths}
+            else:
+                peaks, properties = signal.find_peaks(
+                    magnitudes,
+                    prominence=self.peak_prominence,
+                    width=self.peak_width
+                )
             
             peak_features = {
                 'num_peaks': len(peaks),
@@ -116,7 +776,7 @@ class FRAFeatureExtractor:
                 # Calculate peak statistics
                 peak_features['mean_peak_frequency'] = np.mean(frequencies[peaks])
                 peak_features['std_peak_frequency'] = np.std(frequencies[peaks])
-                peak_features['max_peak_magnitude'] = np.max(magnitudes[peaks])
+                peak_features['max_peak_magnitude'] = float(np.max(magnitudes[peaks]))
                 peak_features['mean_peak_prominence'] = np.mean(properties['prominences'])
             else:
                 # No peaks found
@@ -154,24 +814,21 @@ class FRAFeatureExtractor:
         Returns:
             Dictionary of slope indices
         """
-        log_frequencies = np.log10(frequencies)
+        grid = self._frequency_grid(frequencies)
+        log_frequencies = grid['log_frequencies']
         slope_features = {}
         
-        for band_name, (f_min, f_max) in self.frequency_bands.items():
-            band_mask = (frequencies >= f_min) & (frequencies <= f_max)
-            
-            if np.sum(band_mask) >= 3:  # Need at least 3 points for slope calculation
-                band_log_freq = log_frequencies[band_mask]
-                band_magnitudes = magnitudes[band_mask]
+        for band_name, (band_idx, num_points) in grid['bands'].items():
+            if num_points >= 3:  # Need at least 3 points for slope calculation
+                band_log_freq = log_frequencies[band_idx]
+                band_magnitudes = magnitudes[band_idx]
                 
                 # Linear regression to find slope
-                slope, intercept, r_value, p_value, std_err = stats.linregress(
-                    band_log_freq, band_magnitudes
-                )
+                slope, r_value, std_err = _linregress(band_log_freq, band_magnitudes)
                 
-                slope_features[f'slope_{band_name}'] = slope
-                slope_features[f'slope_r2_{band_name}'] = r_value**2
-                slope_features[f'slope_std_err_{band_name}'] = std_err
+                slope_features[f'slope_{band_name}'] = float(slope)
+                slope_features[f'slope_r2_{band_name}'] = float(r_value**2)
+                slope_features[f'slope_std_err_{band_name}'] = float(std_err)
             else:
                 slope_features[f'slope_{band_name}'] = 0.0
                 slope_features[f'slope_r2_{band_name}'] = 0.0
@@ -179,9 +836,9 @@ class FRAFeatureExtractor:
         
         # Overall slope across entire frequency range
         if len(log_frequencies) >= 3:
-            overall_slope, _, overall_r2, _, _ = stats.linregress(log_frequencies, magnitudes)
-            slope_features['overall_slope'] = overall_slope
-            slope_features['overall_slope_r2'] = overall_r2**2
+            overall_slope, overall_r, _ = _linregress(log_frequencies, magnitudes)
+            slope_features['overall_slope'] = float(overall_slope)
+            slope_features['overall_slope_r2'] = float(overall_r**2)
         else:
             slope_features['overall_slope'] = 0.0
             slope_features['overall_slope_r2'] = 0.0
@@ -189,12 +846,15 @@ class FRAFeatureExtractor:
         return slope_features
     
     def calculate_statistical_features(self, magnitudes: np.ndarray, 
-                                     phases: Optional[np.ndarray] = None) -> Dict[str, float]:
+                                     phases: Optional[np.ndarray] = None,
+                                     diff_magnitudes: Optional[np.ndarray] = None) -> Dict[str, float]:
         """Calculate statistical features from magnitude and phase data.
         
         Args:
             magnitudes: Magnitude values
             phases: Phase values (optional)
+            diff_magnitudes: Float64 magnitudes for the derivative statistics
+                when magnitudes are stored at lower precision (optional)
             
         Returns:
             Dictionary of statistical features
@@ -202,38 +862,30 @@ class FRAFeatureExtractor:
         stat_features = {}
         
         # Magnitude statistics
-        stat_features['mag_mean'] = np.mean(magnitudes)
-        stat_features['mag_std'] = np.std(magnitudes)
-        stat_features['mag_var'] = np.var(magnitudes)
-        stat_features['mag_skewness'] = stats.skew(magnitudes)
-        stat_features['mag_kurtosis'] = stats.kurtosis(magnitudes)
-        stat_features['mag_min'] = np.min(magnitudes)
-        stat_features['mag_max'] = np.max(magnitudes)
+        (stat_features['mag_mean'], stat_features['mag_std'], stat_features['mag_var'],
+         stat_features['mag_skewness'], stat_features['mag_kurtosis'],
+         stat_features['mag_min'], stat_features['mag_max'],
+         q25, q75) = (float(v) for v in _central_moments(magnitudes))
         stat_features['mag_range'] = stat_features['mag_max'] - stat_features['mag_min']
-        stat_features['mag_q25'] = np.percentile(magnitudes, 25)
-        stat_features['mag_q75'] = np.percentile(magnitudes, 75)
+        stat_features['mag_q25'] = q25
+        stat_features['mag_q75'] = q75
         stat_features['mag_iqr'] = stat_features['mag_q75'] - stat_features['mag_q25']
         
         # Magnitude first and second derivatives (smoothness indicators)
-        mag_diff1 = np.diff(magnitudes)
-        mag_diff2 = np.diff(magnitudes, n=2)
-        
-        stat_features['mag_diff1_mean'] = np.mean(np.abs(mag_diff1))
-        stat_features['mag_diff1_std'] = np.std(mag_diff1)
-        stat_features['mag_diff2_mean'] = np.mean(np.abs(mag_diff2))
-        stat_features['mag_diff2_std'] = np.std(mag_diff2)
+        (stat_features['mag_diff1_mean'], stat_features['mag_diff1_std'],
+         stat_features['mag_diff2_mean'], stat_features['mag_diff2_std']) = (
+            _diff_stats(np.asarray(magnitudes if diff_magnitudes is None else diff_magnitudes,
+                                   dtype=np.float64)[None, :])[0].tolist())
         
         # Phase statistics (if available)
         if phases is not None:
             # Unwrap phases for better statistics
-            unwrapped_phases = np.unwrap(np.radians(phases))
+            unwrapped_phases = _unwrap_degrees(np.asarray(phases))
             
-            stat_features['phase_mean'] = np.mean(unwrapped_phases)
-            stat_features['phase_std'] = np.std(unwrapped_phases)
-            stat_features['phase_var'] = np.var(unwrapped_phases)
-            stat_features['phase_skewness'] = stats.skew(unwrapped_phases)
-            stat_features['phase_kurtosis'] = stats.kurtosis(unwrapped_phases)
-            stat_features['phase_range'] = np.max(unwrapped_phases) - np.min(unwrapped_phases)
+            (stat_features['phase_mean'], stat_features['phase_std'], stat_features['phase_var'],
+             stat_features['phase_skewness'], stat_features['phase_kurtosis'],
+             phase_min, phase_max, _, _) = (float(v) for v in _central_moments(unwrapped_phases))
+            stat_features['phase_range'] = phase_max - phase_min
             
             # Phase derivatives
             phase_diff1 = np.diff(unwrapped_phases)
@@ -249,94 +901,121 @@ class FRAFeatureExtractor:
         return stat_features
     
     def calculate_spectral_features(self, frequencies: np.ndarray, 
-                                   magnitudes: np.ndarray) -> Dict[str, float]:
+                                   magnitudes: np.ndarray,
+                                   linear_magnitudes: Optional[np.ndarray] = None) -> Dict[str, float]:
         """Calculate spectral features like centroid, bandwidth, etc.
         
         Args:
             frequencies: Frequency points (Hz)
             magnitudes: Magnitude values (dB)
+            linear_magnitudes: Precomputed 10**(magnitudes/20) (optional)
             
         Returns:
             Dictionary of spectral features
         """
         # Convert to linear scale for spectral calculations
-        linear_magnitudes = 10**(magnitudes / 20)
+        if linear_magnitudes is None:
+            linear_magnitudes = _db_to_linear(magnitudes)
+        power = linear_magnitudes * linear_magnitudes
         
-        # Normalize to create probability distribution
-        power_sum = np.sum(linear_magnitudes**2)
+        # Normalize to create probability distribution (in place, power is a temporary)
+        power_sum = np.sum(power)
         if power_sum > 0:
-            normalized_power = (linear_magnitudes**2) / power_sum
+            power /= power_sum
+            normalized_power = power
         else:
             normalized_power = np.ones_like(linear_magnitudes) / len(linear_magnitudes)
         
         spectral_features = {}
         
-        # Spectral centroid (center of mass)
-        spectral_features['spectral_centroid'] = np.sum(frequencies * normalized_power)
+        # Centroid (center of mass) and central moments in one fused pass
+        centroid, m2, m3, m4 = _spectral_moments(frequencies, normalized_power[None, :])[0]
+        spread = np.sqrt(m2)
+        
+        spectral_features['spectral_centroid'] = float(centroid)
         
         # Spectral spread (second moment)
-        centroid = spectral_features['spectral_centroid']
-        spectral_features['spectral_spread'] = np.sqrt(
-            np.sum(((frequencies - centroid)**2) * normalized_power)
-        )
-        
-        # Spectral skewness (third moment)
-        if spectral_features['spectral_spread'] > 0:
-            spectral_features['spectral_skewness'] = (
-                np.sum(((frequencies - centroid)**3) * normalized_power) / 
-                (spectral_features['spectral_spread']**3)
-            )
-        else:
-            spectral_features['spectral_skewness'] = 0.0
+        spectral_features['spectral_spread'] = float(spread)
         
-        # Spectral kurtosis (fourth moment)
-        if spectral_features['spectral_spread'] > 0:
-            spectral_features['spectral_kurtosis'] = (
-                np.sum(((frequencies - centroid)**4) * normalized_power) / 
-                (spectral_features['spectral_spread']**4)
-            )
+        # Spectral skewness (third moment) and kurtosis (fourth moment)
+        if spread > 0:
+            spectral_features['spectral_skewness'] = float(m3 / spread**3)
+            spectral_features['spectral_kurtosis'] = float(m4 / spread**4)
         else:
+            spectral_features['spectral_skewness'] = 0.0
             spectral_features['spectral_kurtosis'] = 0.0
         
         # Spectral rolloff (frequency below which 85% of energy is contained)
+        # (the cumulative sum is non-decreasing, so a binary search finds it)
         cumulative_power = np.cumsum(normalized_power)
-        rolloff_idx = np.where(cumulative_power >= 0.85)[0]
-        if len(rolloff_idx) > 0:
-            spectral_features['spectral_rolloff'] = frequencies[rolloff_idx[0]]
-        else:
-            spectral_features['spectral_rolloff'] = frequencies[-1]
+        rolloff_idx = int(np.searchsorted(cumulative_power, 0.85, side='left'))
+        spectral_features['spectral_rolloff'] = float(frequencies[min(rolloff_idx, len(frequencies) - 1)])
         
         # Zero crossing rate in magnitude (indication of oscillations)
-        mag_centered = magnitudes - np.mean(magnitudes)
-        zero_crossings = np.sum(np.diff(np.signbit(mag_centered)))
+        negative = np.signbit(magnitudes - np.mean(magnitudes, dtype=np.float64))
+        zero_crossings = np.count_nonzero(negative[1:] != negative[:-1])
         spectral_features['zero_crossing_rate'] = zero_crossings / len(magnitudes)
         
         return spectral_features
     
-    def extract_all_features(self, processed_data: Dict) -> Dict[str, float]:
+    def extract_all_features(self, processed_data: Dict,
+                             out: Optional[np.ndarray] = None) -> Dict[str, float]:
         """Extract complete feature set from processed FRA data.
         
         Args:
             processed_data: Processed FRA data from normalizer
+            out: Optional row of length len(FEATURE_NAMES) that also receives
+                the features at their FEATURE_INDEX columns (standard bands
+                only); columns of features the sample lacks are left untouched
             
         Returns:
             Dictionary containing all extracted features
         """
+        if out is not None:
+            if out.shape != (len(FEATURE_NAMES),):
+                raise ValueError(f"out must have shape ({len(FEATURE_NAMES)},), got {out.shape}")
+            if list(self.frequency_bands) != list(_STANDARD_FREQUENCY_BANDS):
+                raise ValueError("out= requires the standard frequency bands; use the returned dict")
+        
         measurement = processed_data['measurement']
         
-        frequencies = np.array(measurement['frequencies'])
-        magnitudes = np.array(measurement['magnitudes'])
-        phases = np.array(measurement.get('phases', []))
+        # asarray only copies when the input is a list or has another dtype
+        frequencies = np.asarray(measurement['frequencies'], dtype=np.float64)
+        # Derivative statistics use the float64 values (see _diff_stats)
+        magnitudes64 = np.asarray(measurement['magnitudes'], dtype=np.float64)
+        magnitudes = magnitudes64.astype(self.dtype, copy=False)
+        phases = measurement.get('phases')
         
-        if len(phases) == 0:
+        if phases is None or len(phases) == 0:
             phases = None
+        else:
+            phases = np.asarray(phases, dtype=self.dtype)
         
         # Extract all feature categories
         features = {}
         
         try:
+            grid = self._frequency_grid(frequencies)
+            # The kernel indexes every array by the magnitude length without
+            # bounds checks; other shapes go through the NumPy path, which
+            # raises for them
+            num_points = len(magnitudes)
+            same_length = (num_points > 0 and len(frequencies) == num_points and
+                           (phases is None or len(phases) == num_points))
+            if _extract_core_kernel is not None and grid['band_bounds'] is not None and same_length:
+                features = self._extract_core_features(frequencies, magnitudes, phases, grid,
+                                                       magnitudes64)
+                features.update(self._metadata_features(processed_data))
+                logger.info(f"Extracted {len(features)} features from FRA data")
+                if out is not None:
+                    self._write_feature_row(features, out)
+                return features
+            
+            # dB -> linear conversion shared by band energies and spectral features
+            linear_magnitudes = _db_to_linear(magnitudes, out=self._scratch_buffer(len(magnitudes))[0])
+            
             # Band energy ratios
-            energy_features = self.extract_band_energy_ratios(frequencies, magnitudes)
+            energy_features = self.extract_band_energy_ratios(frequencies, magnitudes, linear_magnitudes)
             features.update(energy_features)
             
             # Peak characteristics
@@ -353,34 +1032,19 @@ class FRAFeatureExtractor:
             features.update(slope_features)
             
             # Statistical features
-            stat_features = self.calculate_statistical_features(magnitudes, phases)
+            stat_features = self.calculate_statistical_features(magnitudes, phases, magnitudes64)
             features.update(stat_features)
             
             # Spectral features
-            spectral_features = self.calculate_spectral_features(frequencies, magnitudes)
+            spectral_features = self.calculate_spectral_features(frequencies, magnitudes, linear_magnitudes)
             features.update(spectral_features)
             
-            # Asset-specific features (if available)
-            if 'asset_metadata' in processed_data:
-                asset_meta = processed_data['asset_metadata']
-                features['transformer_rating_mva'] = asset_meta.get('rating_MVA', 100)
-                
-                # Encode winding configuration
-                winding_config = asset_meta.get('winding_config', 'unknown')
-                features['is_dyn_winding'] = 1.0 if 'dyn' in winding_config.lower() else 0.0
-                features['is_ynyn_winding'] = 1.0 if 'ynyn' in winding_config.lower() else 0.0
-            
-            # Test condition features
-            if 'test_info' in processed_data:
-                test_info = processed_data['test_info']
-                features['test_voltage'] = test_info.get('test_voltage', 1000)
-                features['ambient_temperature'] = test_info.get('ambient_temp', 25.0)
-                
-                # Coupling type
-                coupling = test_info.get('coupling', 'capacitive')
-                features['is_capacitive_coupling'] = 1.0 if coupling == 'capacitive' else 0.0
+            # Asset and test condition features
+            features.update(self._metadata_features(processed_data))
             
             logger.info(f"Extracted {len(features)} features from FRA data")
+            if out is not None:
+                self._write_feature_row(features, out)
             
         except Exception as e:
             logger.error(f"Feature extraction failed: {e}")
@@ -389,33 +1053,434 @@ class FRAFeatureExtractor:
         
         return features
     
-    def create_feature_matrix(self, dataset_samples: List[Dict]) -> Tuple[np.ndarray, List[str]]:
+    @staticmethod
+    def _write_feature_row(features: Dict[str, float], out: np.ndarray) -> None:
+        """Write a feature dictionary into a FEATURE_NAMES-ordered row."""
+        for name, value in features.items():
+            out[FEATURE_INDEX[name]] = value
+    
+    def _extract_core_features(self, frequencies: np.ndarray, magnitudes: np.ndarray,
+                               phases: Optional[np.ndarray], grid: Dict,
+                               magnitudes64: np.ndarray) -> Dict[str, float]:
+        """Numba-compiled equivalent of the per-category feature methods.
+        
+        Band, slope, statistical and spectral features come from one call to
+        _extract_core_kernel; peaks still use find_resonance_peaks. Keys and
+        their order match extract_all_features' NumPy path.
+        """
+        has_phases = phases is not None
+        values = _extract_core_kernel(
+            frequencies.astype(np.float64, copy=False),
+            grid['log_frequencies'],
+            magnitudes,
+            magnitudes64,
+            phases if has_phases else np.zeros(1, dtype=magnitudes.dtype),
+            has_phases,
+            grid['band_bounds'],
+            self._scratch_buffer(len(magnitudes))
+        ).tolist()
+        
+        band_names = list(self.frequency_bands)
+        num_bands = len(band_names)
+        band_energies = dict(zip(band_names, values[:num_bands]))
+        
+        # Energy ratios
+        features = {}
+        total_energy = sum(band_energies.values())
+        for band_name, energy in band_energies.items():
+            features[f'energy_ratio_{band_name}'] = energy / total_energy if total_energy > 0 else 0.0
+        
+        for name, numerator in (('low_to_high_ratio', 'low'), ('mid_to_high_ratio', 'mid')):
+            num, den = band_energies[numerator], band_energies['high']
+            features[name] = num / den if num > 0 and den > 0 else 0.0
+        
+        # Peak characteristics (scalar features only)
+        peak_features = self.find_resonance_peaks(frequencies, magnitudes)
+        features.update({k: v for k, v in peak_features.items() if not isinstance(v, list)})
+        
+        # Slope indices
+        for b, band_name in enumerate(band_names):
+            slope, r2, std_err = values[num_bands + 3 * b:num_bands + 3 * b + 3]
+            features[f'slope_{band_name}'] = slope
+            features[f'slope_r2_{band_name}'] = r2
+            features[f'slope_std_err_{band_name}'] = std_err
+        k = 4 * num_bands
+        features['overall_slope'] = values[k]
+        features['overall_slope_r2'] = values[k + 1]
+        k += 2
+        
+        # Statistical and spectral features
+        features.update(zip(_CORE_STAT_NAMES, values[k:k + len(_CORE_STAT_NAMES)]))
+        k += len(_CORE_STAT_NAMES)
+        features.update(zip(_CORE_SPECTRAL_NAMES, values[k:k + len(_CORE_SPECTRAL_NAMES)]))
+        
+        return features
+    
+    def _metadata_features(self, processed_data: Dict) -> Dict[str, float]:
+        """Encode asset metadata and test conditions (when present) as features."""
+        features = {}
+        
+        # Asset-specific features (if available)
+        if 'asset_metadata' in processed_data:
+            asset_meta = processed_data['asset_metadata']
+            features['transformer_rating_mva'] = asset_meta.get('rating_MVA', 100)
+            
+            # Encode winding configuration
+            winding_config = asset_meta.get('winding_config', 'unknown')
+            flags = self._winding_flags.get(winding_config)
+            if flags is None:
+                config = winding_config.lower()
+                flags = (1.0 if 'dyn' in config else 0.0, 1.0 if 'ynyn' in config else 0.0)
+                if len(self._winding_flags) < _WINDING_CACHE_SIZE:
+                    self._winding_flags[winding_config] = flags
+            features['is_dyn_winding'], features['is_ynyn_winding'] = flags
+        
+        # Test condition features
+        if 'test_info' in processed_data:
+            test_info = processed_data['test_info']
+            features['test_voltage'] = test_info.get('test_voltage', 1000)
+            features['ambient_temperature'] = test_info.get('ambient_temp', 25.0)
+            
+            # Coupling type
+            coupling = test_info.get('coupling', 'capacitive')
+            features['is_capacitive_coupling'] = _COUPLING_FLAGS.get(coupling, 0.0)
+        
+        return features
+    
+    def extract_all_features_batch(self, dataset_samples: List[Dict]) -> List[Dict[str, float]]:
+        """Extract feature sets for many samples at once.
+        
+        Samples sharing one frequency grid (the FRANormalizer output) are
+        stacked into (M, N) arrays so band, slope, statistical and spectral
+        features are computed with axis-wise NumPy operations; only peak
+        detection still runs per sample. Otherwise, or if the batched path
+        fails, each sample goes through extract_all_features.
+        
+        Args:
+            dataset_samples: List of processed FRA data samples
+            
+        Returns:
+            List of feature dictionaries, one per sample, as extract_all_features
+        """
+        if not dataset_samples:
+            return []
+        
+        batch = self._extract_batch_columns(dataset_samples)
+        if batch is not None:
+            return self._columns_to_features(*batch)
+        
+        return [self.extract_all_features(sample) for sample in dataset_samples]
+    
+    def _extract_batch_common_grid(self, dataset_samples: List[Dict],
+                                   frequencies: np.ndarray) -> Tuple[Dict[str, np.ndarray], List[Dict]]:
+        """Batched feature extraction for samples on one frequency grid.
+        
+        Returns:
+            Tuple of (measurement feature columns, per-sample metadata features)
+        """
+        # Gather the per-sample traces into contiguous (M, N) arrays; the
+        # derivative statistics are taken from the float64 values first
+        magnitudes = np.empty((len(dataset_samples), len(frequencies)), dtype=self.dtype)
+        diff_stats = np.empty((len(dataset_samples), 4))
+        for i, sample in enumerate(dataset_samples):
+            row = np.asarray(sample['measurement']['magnitudes'], dtype=np.float64)
+            diff_stats[i] = _diff_stats(row[None, :])[0]
+            magnitudes[i] = row
+        
+        phase_rows = [i for i, s in enumerate(dataset_samples)
+                      if len(s['measurement'].get('phases', [])) > 0]
+        phases = None
+        if phase_rows:
+            phases = np.empty((len(phase_rows), len(frequencies)), dtype=self.dtype)
+            for j, i in enumerate(phase_rows):
+                phases[j] = dataset_samples[i]['measurement']['phases']
+        
+        columns = self._extract_batch_arrays(frequencies, magnitudes, phases, phase_rows, diff_stats)
+        metadata = [self._metadata_features(sample) for sample in dataset_samples]
+        
+        logger.info(f"Extracted {len(columns) + len(metadata[0])} features from {len(metadata)} FRA samples")
+        
+        return columns, metadata
+    
+    def _extract_batch_columns(self, dataset_samples: List[Dict]) -> Optional[Tuple[Dict[str, np.ndarray], List[Dict]]]:
+        """Run _extract_batch_common_grid if all samples share one grid.
+        
+        Returns:
+            Tuple of (feature columns, metadata features), or None when the
+            grids differ or the batched path fails
+        """
+        try:
+            measurements = [sample['measurement'] for sample in dataset_samples]
+            frequencies = np.asarray(measurements[0]['frequencies'], dtype=float)
+            
+            if all(np.array_equal(m['frequencies'], frequencies) for m in measurements[1:]):
+                return self._extract_batch_common_grid(dataset_samples, frequencies)
+            
+        except Exception as e:
+            logger.warning(f"Batched feature extraction failed, using per-sample path: {e}")
+        
+        return None
+    
+    @staticmethod
+    def _columns_to_features(columns: Dict[str, np.ndarray],
+                             metadata: List[Dict]) -> List[Dict[str, float]]:
+        """Split feature columns back into per-sample dictionaries."""
+        values = {k: column.tolist() for k, column in columns.items()}
+        all_features = []
+        for i, meta in enumerate(metadata):
+            features = {k: column[i] for k, column in values.items()}
+            features.update(meta)
+            all_features.append(features)
+        return all_features
+    
+    def _extract_batch_arrays(self, frequencies: np.ndarray, magnitudes: np.ndarray,
+                              phases: Optional[np.ndarray] = None,
+                              phase_rows: Optional[List[int]] = None,
+                              diff_stats: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Measurement features for an (M, N) magnitude array on one grid.
+        
+        Args:
+            frequencies: Shared frequency points (Hz), shape (N,)
+            magnitudes: Magnitude values (dB), shape (M, N)
+            phases: Phase values (degrees) for the rows in phase_rows (optional)
+            phase_rows: Rows of magnitudes that phases belong to (None = all)
+            diff_stats: (M, 4) _diff_stats of the float64 magnitudes (None =
+                computed from magnitudes)
+            
+        Returns:
+            Dictionary of (M,) feature columns in extract_all_features' key
+            order, without metadata features
+        """
+        num_samples, num_points = magnitudes.shape
+        
+        columns = {}
+        grid = self._frequency_grid(frequencies)
+        bands = grid['bands']
+        log_frequencies = grid['log_frequencies']
+        
+        # Band energy ratios
+        power = np.exp(np.multiply(magnitudes, 2.0 * _DB_TO_LOG_AMPLITUDE, dtype=np.float64))
+        band_energies = dict(zip(bands, (power @ grid['band_weights']).T))
+        total_energy = sum(band_energies.values())
+        safe_total = np.where(total_energy > 0, total_energy, 1.0)
+        for band_name, energy in band_energies.items():
+            columns[f'energy_ratio_{band_name}'] = np.where(total_energy > 0, energy / safe_total, 0.0)
+        
+        for name, numerator in (('low_to_high_ratio', 'low'), ('mid_to_high_ratio', 'mid')):
+            num, den = band_energies[numerator], band_energies['high']
+            valid = (num > 0) & (den > 0)
+            columns[name] = np.where(valid, num / np.where(valid, den, 1.0), 0.0)
+        
+        # Peak characteristics, detected per sample (scalar features only)
+        peak_rows = [self.find_resonance_peaks(frequencies, magnitudes[i]) for i in range(num_samples)]
+        for key, value in peak_rows[0].items():
+            if not isinstance(value, list):
+                columns[key] = np.array([peaks[key] for peaks in peak_rows])
+        
+        # Slope indices
+        for band_name, (band_idx, num_points_band) in bands.items():
+            if num_points_band >= 3:
+                slope, r_value, std_err = _linregress(log_frequencies[band_idx], magnitudes[:, band_idx])
+            else:
+                slope = r_value = std_err = np.zeros(num_samples)
+            columns[f'slope_{band_name}'] = slope
+            columns[f'slope_r2_{band_name}'] = r_value**2
+            columns[f'slope_std_err_{band_name}'] = std_err
+        
+        if num_points >= 3:
+            slope, r_value, _ = _linregress(log_frequencies, magnitudes)
+            columns['overall_slope'] = slope
+            columns['overall_slope_r2'] = r_value**2
+        else:
+            columns['overall_slope'] = columns['overall_slope_r2'] = np.zeros(num_samples)
+        
+        # Statistical features
+        (columns['mag_mean'], columns['mag_std'], columns['mag_var'],
+         columns['mag_skewness'], columns['mag_kurtosis'], columns['mag_min'],
+         columns['mag_max'], q25, q75) = _central_moments(magnitudes)
+        columns['mag_range'] = columns['mag_max'] - columns['mag_min']
+        columns['mag_q25'] = q25
+        columns['mag_q75'] = q75
+        columns['mag_iqr'] = columns['mag_q75'] - columns['mag_q25']
+        
+        (columns['mag_diff1_mean'], columns['mag_diff1_std'],
+         columns['mag_diff2_mean'], columns['mag_diff2_std']) = (
+            _diff_stats(magnitudes) if diff_stats is None else diff_stats).T
+        
+        phase_keys = ['phase_mean', 'phase_std', 'phase_var', 'phase_skewness',
+                      'phase_kurtosis', 'phase_range', 'phase_diff1_mean', 'phase_diff1_std']
+        for key in phase_keys:
+            columns[key] = np.zeros(num_samples)
+        
+        if phases is not None:
+            if phase_rows is None:
+                phase_rows = slice(None)
+            unwrapped_phases = _unwrap_degrees(phases)
+            phase_diff1 = np.diff(unwrapped_phases, axis=1)
+            
+            phase_moments = _central_moments(unwrapped_phases)
+            for key, values in zip(phase_keys[:5], phase_moments[:5]):
+                columns[key][phase_rows] = values
+            columns['phase_range'][phase_rows] = phase_moments[6] - phase_moments[5]
+            columns['phase_diff1_mean'][phase_rows] = np.abs(phase_diff1).mean(axis=1)
+            columns['phase_diff1_std'][phase_rows] = phase_diff1.std(axis=1)
+        
+        # Spectral features
+        power_sum = power.sum(axis=1, keepdims=True)
+        normalized_power = np.where(power_sum > 0, power / np.where(power_sum > 0, power_sum, 1.0),
+                                    1.0 / num_points)
+        centroid, m2, m3, m4 = _spectral_moments(frequencies, normalized_power).T
+        spread = np.sqrt(m2)
+        safe_spread = np.where(spread > 0, spread, 1.0)
+        columns['spectral_centroid'] = centroid
+        columns['spectral_spread'] = spread
+        columns['spectral_skewness'] = np.where(spread > 0, m3 / safe_spread**3, 0.0)
+        columns['spectral_kurtosis'] = np.where(spread > 0, m4 / safe_spread**4, 0.0)
+        
+        # First index reaching 85% == number of entries below it (monotonic cumsum)
+        below = np.count_nonzero(np.cumsum(normalized_power, axis=1) < 0.85, axis=1)
+        rolloff_idx = np.minimum(below, num_points - 1)
+        columns['spectral_rolloff'] = frequencies[rolloff_idx]
+        
+        negative = np.signbit(magnitudes - columns['mag_mean'][:, None])
+        zero_crossings = np.count_nonzero(negative[:, 1:] != negative[:, :-1], axis=1)
+        columns['zero_crossing_rate'] = zero_crossings / num_points
+        
+        return columns
+    
+    def create_feature_matrix(self, dataset_samples: List[Dict],
+                              n_jobs: Optional[int] = 1) -> Tuple[np.ndarray, List[str]]:
         """Create feature matrix from multiple FRA samples.
         
         Args:
             dataset_samples: List of processed FRA data samples
+            n_jobs: Worker threads, each extracting one contiguous chunk of
+                samples (None = all CPUs). The NumPy and Numba kernels release
+                the GIL, so threads avoid process start-up and data copies.
             
         Returns:
             Tuple of (feature_matrix, feature_names)
         """
+        if not dataset_samples:
+            raise ValueError("No features could be extracted from dataset")
+        
+        # Samples on a shared frequency grid are extracted in batched passes
+        n_jobs = min(n_jobs or os.cpu_count() or 1, len(dataset_samples))
+        bounds = np.linspace(0, len(dataset_samples), n_jobs + 1).astype(int)
+        chunks = [dataset_samples[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+        if n_jobs > 1:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                batches = list(executor.map(self._extract_batch_columns, chunks))
+        else:
+            batches = [self._extract_batch_columns(dataset_samples)]
+        
+        # Batched columns go straight into the matrix; otherwise per-sample dicts
+        if all(batch is not None for batch in batches):
+            return self._columns_to_matrix(batches)
+        
+        # Chunks that could not be batched (other grids or malformed samples)
+        # go sample by sample, skipping samples that fail
+        extracted = []
+        for lo, chunk, batch in zip(bounds, chunks, batches):
+            if batch is not None:
+                extracted.extend(self._columns_to_features(*batch))
+                continue
+            
+            for i, sample in enumerate(chunk, start=lo):
+                try:
+                    extracted.append(self.extract_all_features(sample))
+                except Exception as e:
+                    logger.warning(f"Failed to extract features from sample {i}: {e}")
+                    # Skip this sample
+                    continue
+        
+        return self._to_feature_matrix(extracted)
+    
+    def create_feature_matrix_soa(self, frequencies: np.ndarray, magnitudes: np.ndarray,
+                                  phases: Optional[np.ndarray] = None,
+                                  asset_meta_list: Optional[List[Dict]] = None,
+                                  test_info_list: Optional[List[Dict]] = None) -> Tuple[np.ndarray, List[str]]:
+        """Create feature matrix from preassembled arrays on one frequency grid.
+        
+        Structure-of-arrays counterpart of create_feature_matrix for callers
+        that already hold the traces stacked, e.g. loaded from .npy/Parquet,
+        which skips the per-sample dict handling.
+        
+        Args:
+            frequencies: Shared frequency points (Hz), shape (N,)
+            magnitudes: Magnitude values (dB), shape (M, N)
+            phases: Phase values (degrees), shape (M, N) (optional)
+            asset_meta_list: Per-sample asset metadata dicts (optional)
+            test_info_list: Per-sample test info dicts (optional)
+            
+        Returns:
+            Tuple of (feature_matrix, feature_names)
+        """
+        frequencies = np.asarray(frequencies, dtype=np.float64)
+        magnitudes = np.asarray(magnitudes)
+        if magnitudes.ndim != 2 or magnitudes.shape[1] != len(frequencies):
+            raise ValueError(f"magnitudes must have shape (M, {len(frequencies)}), got {magnitudes.shape}")
+        diff_stats = _diff_stats(magnitudes.astype(np.float64, copy=False))
+        magnitudes = magnitudes.astype(self.dtype, copy=False)
+        if phases is not None:
+            phases = np.asarray(phases, dtype=self.dtype)
+            if phases.shape != magnitudes.shape:
+                raise ValueError(f"phases shape {phases.shape} does not match magnitudes {magnitudes.shape}")
+        
+        columns = self._extract_batch_arrays(frequencies, magnitudes, phases, diff_stats=diff_stats)
+        
+        metadata = []
+        for i in range(len(magnitudes)):
+            sample = {}
+            if asset_meta_list is not None:
+                sample['asset_metadata'] = asset_meta_list[i]
+            if test_info_list is not None:
+                sample['test_info'] = test_info_list[i]
+            metadata.append(self._metadata_features(sample))
+        
+        return self._columns_to_matrix([(columns, metadata)])
+    
+    def _columns_to_matrix(self, batches: List[Tuple[Dict[str, np.ndarray], List[Dict]]]) -> Tuple[np.ndarray, List[str]]:
+        """Write batched feature columns directly into a feature matrix.
+        
+        Feature names are taken from the first sample, as in _to_feature_matrix;
+        features missing from a sample are 0.
+        """
+        first_columns, first_metadata = batches[0]
+        feature_names = sorted([*first_columns, *first_metadata[0]])
+        column_index = {name: j for j, name in enumerate(feature_names)}
+        
+        num_samples = sum(len(metadata) for _, metadata in batches)
+        feature_matrix = np.zeros((num_samples, len(feature_names)))
+        
+        row = 0
+        for columns, metadata in batches:
+            rows = slice(row, row + len(metadata))
+            for name, column in columns.items():
+                feature_matrix[rows, column_index[name]] = column
+            for i, meta in enumerate(metadata, start=row):
+                for name, value in meta.items():
+                    j = column_index.get(name)
+                    if j is not None:
+                        feature_matrix[i, j] = value
+            row = rows.stop
+        
+        logger.info(f"Created feature matrix: {feature_matrix.shape} (samples x features)")
+        
+        return feature_matrix, feature_names
+    
+    def _to_feature_matrix(self, extracted: List[Dict[str, float]]) -> Tuple[np.ndarray, List[str]]:
+        """Stack feature dictionaries into a matrix with sorted feature names."""
         all_features = []
         feature_names = None
         
-        for i, sample in enumerate(dataset_samples):
-            try:
-                sample_features = self.extract_all_features(sample)
-                
-                if feature_names is None:
-                    feature_names = sorted(sample_features.keys())
-                
-                # Create feature vector in consistent order
-                feature_vector = [sample_features.get(name, 0.0) for name in feature_names]
-                all_features.append(feature_vector)
-                
-            except Exception as e:
-                logger.warning(f"Failed to extract features from sample {i}: {e}")
-                # Skip this sample
-                continue
+        for sample_features in extracted:
+            if feature_names is None:
+                feature_names = sorted(sample_features.keys())
+            
+            # Create feature vector in consistent order
+            feature_vector = [sample_features.get(name, 0.0) for name in feature_names]
+            all_features.append(feature_vector)
         
         if not all_features:
             raise ValueError("No features could be extracted from dataset")
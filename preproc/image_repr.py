@@ -7,17 +7,158 @@ Supports multiple visualization formats including plots, spectrograms, and heatm
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib import colormaps, colors as mcolors, font_manager, rc_context, rcParams, ticker
 from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from scipy import signal
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 import io
+import base64
+import functools
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
 from typing import Dict, Tuple, Optional, List
 import logging
 
+try:
+    import xxhash
+except ImportError:  # Fall back to hashlib for render cache keys
+    xxhash = None
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the NumPy implementations are used instead
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of rendered images kept per generator
+_RENDER_CACHE_SIZE = 128
+
+# Maximum number of distinct frequency grids with cached log10 values
+_LOG_GRID_CACHE_SIZE = 32
+
+# Maximum number of cached text masks and plot frame templates
+_TEXT_CACHE_SIZE = 512
+_TEMPLATE_CACHE_SIZE = 16
+
+# Maximum number of cached tight_layout results (per figure and label texts)
+_LAYOUT_CACHE_SIZE = 64
+_SUBPLOT_PARAMS = ('left', 'bottom', 'right', 'top', 'wspace', 'hspace')
+
+# Fault palette for create_fault_visualization; unknown faults use the last row
+_FAULT_NAMES = (
+    'healthy', 'axial_displacement', 'radial_deformation', 'core_grounding',
+    'turn_turn_short', 'insulation_degradation', 'partial_discharge'
+)
+_FAULT_INDEX = {name: i for i, name in enumerate(_FAULT_NAMES)}
+_FAULT_COLORS = np.array([
+    [46, 139, 87],    # healthy: #2E8B57
+    [255, 107, 107],  # axial_displacement: #FF6B6B
+    [78, 205, 196],   # radial_deformation: #4ECDC4
+    [69, 183, 209],   # core_grounding: #45B7D1
+    [243, 156, 18],   # turn_turn_short: #F39C12
+    [155, 89, 182],   # insulation_degradation: #9B59B6
+    [231, 76, 60],    # partial_discharge: #E74C3C
+    [31, 119, 180]    # unknown: #1f77b4
+], dtype=np.uint8) / 255.0
+
+# Data URI MIME types for array_to_base64
+_MIME_TYPES = {
+    'PNG': 'image/png',
+    'JPEG': 'image/jpeg',
+    'WEBP': 'image/webp'
+}
+
+# Agg settings applied while drawing pooled figures: merge sub-pixel path
+# segments aggressively and hand long curves to Agg in chunks
+_RENDER_RC = {
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000
+}
+
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def _magnitude_to_db_kernel(Sxx):
+        """In-place 20 * log10(max(Sxx, 1e-12)) in one pass, returning the dB range."""
+        lo = np.inf
+        hi = -np.inf
+        for i in range(Sxx.shape[0]):
+            for j in range(Sxx.shape[1]):
+                value = 20.0 * np.log10(max(Sxx[i, j], 1e-12))
+                Sxx[i, j] = value
+                lo = min(lo, value)
+                hi = max(hi, value)
+        return lo, hi
+else:
+    _magnitude_to_db_kernel = None
+
+
+def _render_cache_key(name: str, generator: 'FRAImageGenerator', args: tuple, kwargs: dict) -> bytes:
+    """Hash a render call (method, array contents, style arguments) into a cache key."""
+    hasher = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    hasher.update(repr((name, generator.image_size, generator.dpi,
+                        generator.color_schemes)).encode())
+    
+    def update(value):
+        if isinstance(value, np.ndarray):
+            array = np.ascontiguousarray(value)
+            hasher.update(repr((array.dtype.str, array.shape)).encode())
+            hasher.update(array.data)
+        else:
+            hasher.update(repr(value).encode())
+    
+    for value in args:
+        update(value)
+    for name_value in sorted(kwargs.items()):
+        hasher.update(name_value[0].encode())
+        update(name_value[1])
+    
+    return hasher.digest()
+
+
+def _cached_render(method):
+    """Memoize an image-producing FRAImageGenerator method by its inputs (LRU).
+    
+    The method's trailing out parameter is excluded from the key; cache hits
+    are copied into it like a fresh render.
+    """
+    out_index = list(inspect.signature(method).parameters).index('out') - 1
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        out = kwargs.pop('out', None)
+        if len(args) > out_index:
+            out = args[out_index]
+            args = args[:out_index]
+        
+        key = _render_cache_key(method.__name__, self, args, kwargs)
+        cached = self._render_cache.get(key)
+        if cached is not None:
+            self._render_cache.move_to_end(key)
+            if self._fits_output(out, cached.shape):
+                np.copyto(out, cached)
+                return out
+            return cached.copy()
+        
+        image = method(self, *args, out=out, **kwargs)
+        
+        stored = image.copy()
+        stored.flags.writeable = False
+        self._render_cache[key] = stored
+        if len(self._render_cache) > _RENDER_CACHE_SIZE:
+            self._render_cache.popitem(last=False)
+        
+        return image
+    
+    return wrapper
+
+
 class FRAImageGenerator:
     """Generates various image representations of FRA data."""
     
@@ -55,13 +196,183 @@ class FRAImageGenerator:
                 'highlight': '#FFD93D'
             }
         }
+        
+        # Color schemes resolved for Matplotlib and Pillow, keyed by scheme contents
+        self._resolved_colors = {}
+        
+        # Fonts for the Pillow renderer, sized like Matplotlib's defaults
+        self._fonts = {
+            'title': self._load_font(14, 'bold'),
+            'label': self._load_font(10),
+            'tick': self._load_font(10)
+        }
+        
+        # Viridis lookup table for rendering spectrograms without Matplotlib
+        self._viridis_lut = (colormaps['viridis'](np.linspace(0, 1, 256))[:, :3] * 255).astype(np.uint8)
+        
+        # Pillow renderer caches: rasterized text masks and plot frames
+        # (background, title and axis labels) keyed by their contents
+        self._text_cache = {}
+        self._template_cache = {}
+        
+        # Figure pool: (layout, width, height, dpi, facecolor) -> (figure, axes)
+        self._fig_cache = {}
+        
+        # Subplot params from tight_layout, measured once per pooled figure
+        self._layout_cache = {}
+        
+        # Rendered images keyed by a hash of the inputs (LRU)
+        self._render_cache = OrderedDict()
+        
+        # log10 frequencies per frequency grid
+        self._log_grid_cache = {}
+        
+        # STFT window, scale and bin axes per (nperseg, fs)
+        self._stft_cache = {}
+        
+        # Per-thread PNG buffer for array_to_base64
+        self._scratch = threading.local()
+    
+    def close(self) -> None:
+        """Release the pooled Matplotlib figures and cached renders."""
+        for fig, _ in self._fig_cache.values():
+            fig.clear()
+        self._fig_cache.clear()
+        self._layout_cache.clear()
+        self._render_cache.clear()
+        self._stft_cache.clear()
+        self._log_grid_cache.clear()
+        self._text_cache.clear()
+        self._template_cache.clear()
+    
+    def _pooled_figure(self, layout: str, facecolor: Optional[str] = None) -> Tuple[Figure, Tuple]:
+        """Get a cleared figure and its axes for a layout, building it on first use.
+        
+        Figures are created without pyplot (so they are not tracked by its
+        figure manager) and reused across calls; only the axes are cleared.
+        
+        Args:
+            layout: Layout name ('fra', 'fra_phase', 'comparison', 'fault')
+            facecolor: Figure background color, Matplotlib's default if None
+            
+        Returns:
+            Tuple of (figure, axes)
+        """
+        fig_width = self.image_size[0] / self.dpi
+        fig_height = self.image_size[1] / self.dpi
+        key = (layout, fig_width, fig_height, self.dpi, facecolor)
+        
+        entry = self._fig_cache.get(key)
+        if entry is None:
+            fig = Figure(figsize=(fig_width, fig_height), dpi=self.dpi, facecolor=facecolor)
+            FigureCanvasAgg(fig)
+            
+            if layout == 'fra':
+                axes = (fig.add_subplot(1, 1, 1),)
+            elif layout == 'fra_phase':
+                axes = (fig.add_subplot(2, 1, 1), fig.add_subplot(2, 1, 2))
+            elif layout == 'comparison':
+                axes = (fig.add_subplot(1, 1, 1),)
+            elif layout == 'fault':
+                gs = fig.add_gridspec(2, 2, height_ratios=[2, 1], width_ratios=[3, 1])
+                axes = (fig.add_subplot(gs[0, :]), fig.add_subplot(gs[1, 0]),
+                        fig.add_subplot(gs[1, 1]))
+            else:
+                raise ValueError(f"Unknown figure layout: {layout}")
+            
+            entry = (fig, axes)
+            self._fig_cache[key] = entry
+        
+        for ax in entry[1]:
+            ax.cla()
+        
+        return entry
+    
+    @staticmethod
+    def _layout_signature(fig: Figure) -> Tuple:
+        """Texts that decide a figure's tight_layout margins.
+        
+        Titles, axis labels, tick labels and axis offset texts of every
+        axes; tick labels follow the data limits, so they are formatted
+        here (cheap) instead of measured.
+        """
+        signature = []
+        for ax in fig.axes:
+            signature.append((
+                ax.get_title('left'), ax.get_title(), ax.get_title('right'),
+                ax.get_xlabel(), ax.get_ylabel(),
+                tuple(label.get_text() for label in ax.get_xticklabels(which='both')),
+                tuple(label.get_text() for label in ax.get_yticklabels(which='both')),
+                ax.xaxis.get_offset_text().get_text(),
+                ax.yaxis.get_offset_text().get_text()
+            ))
+        return tuple(signature)
+    
+    def _fit_layout(self, fig: Figure) -> None:
+        """Lay out a pooled figure, running tight_layout once per set of texts.
+        
+        Margins depend on the titles, labels and tick labels, so the subplot
+        params are cached per figure and _layout_signature; repeat renders
+        with the same texts skip tight_layout's measurement of every artist.
+        
+        Args:
+            fig: Pooled figure
+        """
+        key = (fig, self._layout_signature(fig))
+        params = self._layout_cache.get(key)
+        if params is None:
+            # Measure from the default params, as on a fresh figure, so the
+            # result does not depend on what the figure rendered before
+            fig.subplots_adjust(**{name: rcParams[f'figure.subplot.{name}'] for name in _SUBPLOT_PARAMS})
+            fig.tight_layout()
+            subplotpars = fig.subplotpars
+            if len(self._layout_cache) >= _LAYOUT_CACHE_SIZE:
+                self._layout_cache.clear()
+            self._layout_cache[key] = {
+                name: getattr(subplotpars, name) for name in _SUBPLOT_PARAMS
+            }
+        else:
+            fig.subplots_adjust(**params)
     
+    def _scheme_colors(self, color_scheme: str) -> Tuple[Dict[str, Tuple], Dict[str, Tuple]]:
+        """Resolve a color scheme once into Matplotlib and Pillow color tuples.
+        
+        Args:
+            color_scheme: Color scheme name (unknown names use 'default')
+            
+        Returns:
+            Tuple of (RGBA float colors for Matplotlib, 8-bit RGB colors for
+            Pillow, including 'grid_blend': the grid at alpha 0.7 over the background)
+        """
+        scheme = self.color_schemes.get(color_scheme, self.color_schemes['default'])
+        key = tuple(scheme.items())
+        resolved = self._resolved_colors.get(key)
+        if resolved is None:
+            rgba = {name: mcolors.to_rgba(value) for name, value in scheme.items()}
+            rgb8 = {name: ImageColor.getrgb(value)[:3] for name, value in scheme.items()}
+            rgb8['grid_blend'] = tuple(round(0.7 * g + 0.3 * b)
+                                       for g, b in zip(rgb8['grid'], rgb8['background']))
+            resolved = (rgba, rgb8)
+            self._resolved_colors[key] = resolved
+        return resolved
+    
+    def _load_font(self, size_pt: float, weight: str = 'normal') -> ImageFont.ImageFont:
+        """Load Matplotlib's default font (DejaVu Sans) at a point size for this dpi."""
+        size_px = max(1, round(size_pt * self.dpi / 72))
+        try:
+            path = font_manager.findfont(font_manager.FontProperties(family='DejaVu Sans', weight=weight))
+            return ImageFont.truetype(path, size_px)
+        except (OSError, ValueError):
+            return ImageFont.load_default(size_px)
+    
+    @_cached_render
     def create_fra_plot(self, frequencies: np.ndarray, 
                        magnitudes: np.ndarray,
                        phases: Optional[np.ndarray] = None,
                        title: str = "FRA Response",
                        color_scheme: str = 'default',
-                       highlight_bands: Optional[List[Tuple[float, float]]] = None) -> np.ndarray:
+                       highlight_bands: Optional[List[Tuple[float, float]]] = None,
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
         """Create standard FRA magnitude vs frequency plot.
         
         Args:
@@ -71,30 +382,33 @@ class FRAImageGenerator:
             title: Plot title
             color_scheme: Color scheme to use
             highlight_bands: Frequency bands to highlight
+            out: Preallocated (height, width, 3) uint8 array to render into
             
         Returns:
             Image array (RGB)
         """
-        colors = self.color_schemes.get(color_scheme, self.color_schemes['default'])
+        colors, pil_colors = self._scheme_colors(color_scheme)
         
-        # Create figure
-        fig_width = self.image_size[0] / self.dpi
-        fig_height = self.image_size[1] / self.dpi
+        # Plain magnitude plots are rasterized directly, without a Figure
+        if phases is None and not highlight_bands:
+            return self._to_output(self._fast_line_plot(frequencies, magnitudes, title, pil_colors), out)
         
+        # Keep at most the min/max point per pixel column
+        n_cols = self.image_size[0]
         if phases is not None:
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(fig_width, fig_height), 
-                                          facecolor=colors['background'])
+            phase_frequencies, phases = self._decimate(frequencies, phases, n_cols)
+        frequencies, magnitudes = self._decimate(frequencies, magnitudes, n_cols)
+        
+        # Get figure from the pool
+        if phases is not None:
+            fig, (ax1, ax2) = self._pooled_figure('fra_phase', colors['background'])
         else:
-            fig, ax1 = plt.subplots(1, 1, figsize=(fig_width, fig_height),
-                                   facecolor=colors['background'])
+            fig, (ax1,) = self._pooled_figure('fra', colors['background'])
         
         # Magnitude plot
         ax1.semilogx(frequencies, magnitudes, color=colors['curve'], linewidth=2)
-        ax1.set_xlabel('Frequency (Hz)', color=colors['text'])
-        ax1.set_ylabel('Magnitude (dB)', color=colors['text'])
         ax1.set_title(title, color=colors['text'], fontsize=14, fontweight='bold')
-        ax1.grid(True, color=colors['grid'], alpha=0.7)
-        ax1.set_facecolor(colors['background'])
+        self._style_fra_axes(ax1, 'Magnitude (dB)', colors)
         
         # Highlight frequency bands if specified
         if highlight_bands:
@@ -102,43 +416,434 @@ class FRAImageGenerator:
                 ax1.axvspan(f_min, f_max, alpha=0.3, 
                            color=colors.get('highlight', '#FFD93D'))
         
-        # Customize appearance
-        ax1.tick_params(colors=colors['text'])
-        ax1.spines['bottom'].set_color(colors['text'])
-        ax1.spines['left'].set_color(colors['text'])
-        ax1.spines['top'].set_visible(False)
-        ax1.spines['right'].set_visible(False)
-        
         # Phase plot if available
         if phases is not None:
-            ax2.semilogx(frequencies, phases, color=colors['curve'], linewidth=2)
-            ax2.set_xlabel('Frequency (Hz)', color=colors['text'])
-            ax2.set_ylabel('Phase (degrees)', color=colors['text'])
-            ax2.grid(True, color=colors['grid'], alpha=0.7)
-            ax2.set_facecolor(colors['background'])
+            ax2.semilogx(phase_frequencies, phases, color=colors['curve'], linewidth=2)
+            self._style_fra_axes(ax2, 'Phase (degrees)', colors)
+        
+        self._fit_layout(fig)
+        
+        return self._figure_to_array(fig, out)
+    
+    def create_fra_plot_batch(self, traces: List[Dict],
+                              title: str = "FRA Response",
+                              color_scheme: str = 'default',
+                              out_arr: Optional[np.ndarray] = None) -> np.ndarray:
+        """Create FRA plots for many traces into one (N, height, width, 3) array.
+        
+        Each trace is rendered as by create_fra_plot, straight into its slot
+        of the output array; the pooled figures, measured layouts and fonts
+        are set up once and shared by the whole batch.
+        
+        Args:
+            traces: FRA data dicts with 'frequencies', 'magnitudes' and
+                optionally 'phases' and 'title'
+            title: Plot title for traces without their own
+            color_scheme: Color scheme to use
+            out_arr: Preallocated (N, height, width, 3) uint8 array
+            
+        Returns:
+            Image array of shape (N, height, width, 3)
+        """
+        width, height = self.image_size
+        shape = (len(traces), height, width, 3)
+        if out_arr is None:
+            out_arr = np.empty(shape, dtype=np.uint8)
+        elif not self._fits_output(out_arr, shape):
+            raise ValueError(f"out_arr must be a uint8 array of shape {shape}, "
+                             f"got {out_arr.dtype} {out_arr.shape}")
+        
+        for i, trace in enumerate(traces):
+            self.create_fra_plot(trace['frequencies'], trace['magnitudes'], trace.get('phases'),
+                                 title=trace.get('title', title), color_scheme=color_scheme,
+                                 out=out_arr[i])
+        
+        return out_arr
+    
+    @staticmethod
+    def _style_fra_axes(ax, ylabel: str, colors: Dict[str, Tuple]) -> None:
+        """Apply the FRA plot labels, grid, colors and left/bottom spines to an axes."""
+        ax.set_xlabel('Frequency (Hz)', color=colors['text'])
+        ax.set_ylabel(ylabel, color=colors['text'])
+        ax.grid(True, color=colors['grid'], alpha=0.7, antialiased=False, linewidth=0.5)
+        ax.set_facecolor(colors['background'])
+        
+        ax.tick_params(colors=colors['text'])
+        ax.spines['bottom'].set_color(colors['text'])
+        ax.spines['left'].set_color(colors['text'])
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+    
+    def open_fra_session(self, title: str = "FRA Response",
+                         color_scheme: str = 'default') -> 'FRAPlotSession':
+        """Open an incrementally updated magnitude plot for streaming FRA data.
+        
+        Args:
+            title: Plot title
+            color_scheme: Color scheme to use
+            
+        Returns:
+            Plot session; call update() with each new sweep
+        """
+        return FRAPlotSession(self, title, color_scheme)
+    
+    def _log_frequencies(self, frequencies: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """Get cached log10 values of a frequency grid.
+        
+        Args:
+            frequencies: Frequency points (Hz), float64
+            
+        Returns:
+            Tuple of (read-only log10 frequencies, whether the grid is
+            positive and strictly increasing)
+        """
+        key = (frequencies.shape, hash(frequencies.tobytes()))
+        entry = self._log_grid_cache.get(key)
+        if entry is None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                log_f = np.log10(frequencies)
+            log_f.flags.writeable = False
+            increasing = bool(len(frequencies) > 0 and frequencies[0] > 0 and
+                              np.all(frequencies[1:] > frequencies[:-1]))
+            entry = (log_f, increasing)
+            
+            if len(self._log_grid_cache) >= _LOG_GRID_CACHE_SIZE:
+                self._log_grid_cache.clear()
+            self._log_grid_cache[key] = entry
+        return entry
+    
+    def _decimate(self, frequencies: np.ndarray, values: np.ndarray,
+                  n_cols: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Min/max decimation of a curve over log-spaced pixel columns.
+        
+        Args:
+            frequencies: Frequency points (Hz), ascending
+            values: Values to plot
+            n_cols: Number of pixel columns
+            
+        Returns:
+            Tuple of (frequencies, values), unchanged if not decimated
+        """
+        frequencies = np.asarray(frequencies, dtype=float)
+        values = np.asarray(values, dtype=float)
+        keep = self._decimation_indices(frequencies, values, n_cols)
+        if keep is None:
+            return frequencies, values
+        return frequencies[keep], values[keep]
+    
+    def _decimation_indices(self, frequencies: np.ndarray, values: np.ndarray,
+                            n_cols: int) -> Optional[np.ndarray]:
+        """Indices kept by min/max decimation over log-spaced pixel columns.
+        
+        Keeps the smallest and largest value in each column (plus the end
+        points), which preserves the drawn envelope of a semilogx plot.
+        Curves with at most 4 points per column, non-positive or unsorted
+        frequencies are not decimated.
+        
+        Args:
+            frequencies: Frequency points (Hz), float64
+            values: Values to plot, float64
+            n_cols: Number of pixel columns
             
-            ax2.tick_params(colors=colors['text'])
-            ax2.spines['bottom'].set_color(colors['text'])
-            ax2.spines['left'].set_color(colors['text'])
-            ax2.spines['top'].set_visible(False)
-            ax2.spines['right'].set_visible(False)
+        Returns:
+            Sorted indices of the points to keep, or None to keep all points
+        """
+        n = len(frequencies)
+        if n <= 4 * n_cols:
+            return None
+        log_f, increasing = self._log_frequencies(frequencies)
+        if not increasing:
+            return None
+        
+        edges = np.linspace(log_f[0], log_f[-1], n_cols + 1)
+        columns = np.clip(np.searchsorted(edges, log_f, side='right') - 1, 0, n_cols - 1)
+        
+        # Columns are non-decreasing, so sorting by (column, value) keeps each
+        # column contiguous with its minimum first and maximum last
+        starts = np.flatnonzero(np.diff(columns, prepend=-1))
+        ends = np.append(starts[1:], n) - 1
+        order = np.lexsort((values, columns))
+        return np.unique(np.concatenate((order[starts], order[ends], [0, n - 1])))
+    
+    def _figure_to_array(self, fig: Figure, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Draw a figure and copy its RGB pixels out of the Agg buffer.
+        
+        The RGBA buffer is viewed without an intermediate bytes object; the
+        RGB copy is required because pooled figures reuse the buffer.
+        
+        Args:
+            fig: Figure to render
+            out: Preallocated uint8 array to copy into, used if its shape matches
+            
+        Returns:
+            Image array (RGB), out if it was used
+        """
+        with rc_context(_RENDER_RC):
+            fig.canvas.draw()
+        return self._canvas_to_array(fig.canvas, out)
+    
+    def _canvas_to_array(self, canvas: FigureCanvasAgg, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Copy the RGB pixels of an already drawn Agg canvas (see _figure_to_array)."""
+        width, height = canvas.get_width_height()
+        rgba = np.frombuffer(canvas.buffer_rgba(), dtype=np.uint8).reshape(height, width, 4)
+        if self._fits_output(out, (height, width, 3)):
+            np.copyto(out, rgba[:, :, :3])
+            return out
+        return np.ascontiguousarray(rgba[:, :, :3])
+    
+    @staticmethod
+    def _fits_output(out: Optional[np.ndarray], shape: Tuple[int, ...]) -> bool:
+        """Check whether out can receive an image of the given shape."""
+        return out is not None and out.shape == shape and out.dtype == np.uint8
+    
+    def _to_output(self, image: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+        """Copy a rendered image into out if it fits, otherwise return the image."""
+        if self._fits_output(out, image.shape):
+            np.copyto(out, image)
+            return out
+        return image
+    
+    def _fast_line_plot(self, frequencies: np.ndarray, magnitudes: np.ndarray,
+                        title: str, colors: Dict[str, Tuple]) -> np.ndarray:
+        """Rasterize a semilogx magnitude plot directly with Pillow.
+        
+        Draws the same elements as create_fra_plot's Matplotlib path (title,
+        grid, left/bottom spines, tick and axis labels) into an RGB image of
+        self.image_size, skipping Figure construction, layout and Agg rendering.
+        
+        Args:
+            frequencies: Frequency points (Hz)
+            magnitudes: Magnitude values (dB)
+            title: Plot title
+            colors: Pillow colors from _scheme_colors
+            
+        Returns:
+            Image array (RGB)
+        """
+        width, height = self.image_size
+        frequencies = np.asarray(frequencies, dtype=float)
+        magnitudes = np.asarray(magnitudes, dtype=float)
+        
+        # Min/max decimation to the pixel columns, on the cached log10 grid
+        log_f, _ = self._log_frequencies(frequencies)
+        keep = self._decimation_indices(frequencies, magnitudes, width)
+        if keep is not None:
+            frequencies, magnitudes, log_f = frequencies[keep], magnitudes[keep], log_f[keep]
+        
+        valid = (frequencies > 0) & np.isfinite(frequencies) & np.isfinite(magnitudes)
+        if not np.any(valid):
+            raise ValueError("No finite points with positive frequency to plot")
+        log_f = log_f[valid]
+        mags = magnitudes[valid]
+        
+        # Data limits with Matplotlib's default 5% margins
+        x_lo, x_hi = float(log_f.min()), float(log_f.max())
+        y_lo, y_hi = float(mags.min()), float(mags.max())
+        if x_hi == x_lo:
+            x_lo, x_hi = x_lo - 0.5, x_hi + 0.5
+        if y_hi == y_lo:
+            y_lo, y_hi = y_lo - 1.0, y_hi + 1.0
+        x_pad, y_pad = 0.05 * (x_hi - x_lo), 0.05 * (y_hi - y_lo)
+        x_lo, x_hi, y_lo, y_hi = x_lo - x_pad, x_hi + x_pad, y_lo - y_pad, y_hi + y_pad
+        
+        # Plot area in pixels
+        left, right = int(0.15 * width), width - int(0.04 * width)
+        top, bottom = int(0.11 * height), height - int(0.14 * height)
+        x_scale = (right - left) / (x_hi - x_lo)
+        y_scale = (bottom - top) / (y_hi - y_lo)
+        
+        image = self._axes_template((left, top, right, bottom), title,
+                                    'Frequency (Hz)', 'Magnitude (dB)', colors)
+        draw = ImageDraw.Draw(image)
+        
+        # Decades on x, nice steps on y
+        x_ticks = [(left + (decade - x_lo) * x_scale, self._format_frequency(10.0**decade))
+                   for decade in range(int(np.ceil(x_lo)), int(np.floor(x_hi)) + 1)]
+        y_ticks = [(bottom - (value - y_lo) * y_scale, f'{value:g}')
+                   for value in self._nice_ticks(y_lo, y_hi)]
+        self._draw_axes(image, draw, (left, top, right, bottom), x_ticks, y_ticks,
+                        colors, grid=True)
+        
+        # Curve
+        px = left + (log_f - x_lo) * x_scale
+        py = bottom - (mags - y_lo) * y_scale
+        draw.line(list(zip(px.tolist(), py.tolist())), fill=colors['curve'], width=2, joint='curve')
+        
+        return np.array(image)
+    
+    @staticmethod
+    def _nice_ticks(lo: float, hi: float) -> np.ndarray:
+        """Matplotlib-style tick values within [lo, hi]."""
+        values = ticker.MaxNLocator(nbins=6).tick_values(lo, hi)
+        return values[(values >= lo) & (values <= hi)]
+    
+    def _draw_axes(self, image: Image.Image, draw: ImageDraw.ImageDraw,
+                   box: Tuple[int, int, int, int],
+                   x_ticks: List[Tuple[float, str]], y_ticks: List[Tuple[float, str]],
+                   colors: Dict[str, Tuple], grid: bool = False, all_spines: bool = False) -> None:
+        """Draw grid, ticks and spines around a plot area.
+        
+        Args:
+            image: Image to draw on (from _axes_template)
+            draw: Drawing context of image
+            box: Plot area (left, top, right, bottom) in pixels
+            x_ticks: (pixel x, label) pairs
+            y_ticks: (pixel y, label) pairs
+            colors: Pillow colors from _scheme_colors
+            grid: Draw grid lines at the ticks
+            all_spines: Draw the top and right spines as well
+        """
+        left, top, right, bottom = box
+        text_color = colors['text']
+        grid_color = colors['grid_blend']
+        
+        for x, label in x_ticks:
+            if grid:
+                draw.line([(x, top), (x, bottom)], fill=grid_color)
+            draw.line([(x, bottom), (x, bottom + 4)], fill=text_color)
+            self._draw_text(image, (x, bottom + 6), label, text_color, 'tick', 'mt')
+        for y, label in y_ticks:
+            if grid:
+                draw.line([(left, y), (right, y)], fill=grid_color)
+            draw.line([(left - 4, y), (left, y)], fill=text_color)
+            self._draw_text(image, (left - 6, y), label, text_color, 'tick', 'rm')
+        
+        # Spines (top/right hidden unless requested, as in the Matplotlib path)
+        if all_spines:
+            draw.rectangle([left, top, right, bottom], outline=text_color)
+        else:
+            draw.line([(left, top), (left, bottom), (right, bottom)], fill=text_color)
+    
+    def _axes_template(self, box: Tuple[int, int, int, int], title: str, xlabel: str,
+                       ylabel: str, colors: Dict[str, Tuple]) -> Image.Image:
+        """Get a fresh copy of the cached plot frame: background, title and axis labels.
+        
+        Args:
+            box: Plot area (left, top, right, bottom) in pixels
+            title: Plot title
+            xlabel: X axis label
+            ylabel: Y axis label
+            colors: Pillow colors from _scheme_colors
+            
+        Returns:
+            RGB image of self.image_size to draw the plot into
+        """
+        key = (self.image_size, box, title, xlabel, ylabel, colors['background'], colors['text'])
+        template = self._template_cache.get(key)
+        if template is None:
+            left, top, right, bottom = box
+            width, height = self.image_size
+            template = Image.new('RGB', (width, height), colors['background'])
+            self._draw_text(template, ((left + right) / 2, top / 2), title, colors['text'], 'title', 'mm')
+            self._draw_text(template, ((left + right) / 2, height - 2), xlabel, colors['text'], 'label', 'md')
+            self._draw_vertical_text(template, ylabel, 2, (top + bottom) / 2, colors['text'])
+            
+            if len(self._template_cache) >= _TEMPLATE_CACHE_SIZE:
+                self._template_cache.clear()
+            self._template_cache[key] = template
+        return template.copy()
+    
+    def _text_mask(self, text: str, font_name: str, anchor: str,
+                   rotate: bool = False) -> Tuple[Image.Image, int, int]:
+        """Get the cached coverage mask of a text label.
+        
+        Args:
+            text: Label text
+            font_name: Key into self._fonts
+            anchor: Pillow text anchor (e.g. 'mm', 'rm')
+            rotate: Rotate the label by 90 degrees (reading bottom to top)
+            
+        Returns:
+            Tuple of (L-mode mask, x offset, y offset) of the mask's top-left
+            corner relative to the anchor point
+        """
+        key = (text, font_name, anchor, rotate)
+        entry = self._text_cache.get(key)
+        if entry is None:
+            font = self._fonts[font_name]
+            left, top, right, bottom = font.getbbox(text, anchor=anchor)
+            mask = Image.new('L', (max(right - left, 1), max(bottom - top, 1)), 0)
+            ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font, anchor=anchor)
+            if rotate:
+                # A 90 degree turn maps the box (left, top, right, bottom)
+                # around the anchor to (top, -right, bottom, -left)
+                mask = mask.rotate(90, expand=True)
+                left, top = top, -right
+            entry = (mask, left, top)
+            
+            if len(self._text_cache) >= _TEXT_CACHE_SIZE:
+                self._text_cache.clear()
+            self._text_cache[key] = entry
+        return entry
+    
+    def _draw_text(self, image: Image.Image, xy: Tuple[float, float], text: str,
+                   color: Tuple[int, ...], font_name: str, anchor: str) -> None:
+        """Draw a label at the pixel nearest to xy from its cached mask."""
+        mask, dx, dy = self._text_mask(text, font_name, anchor)
+        image.paste(color, (round(xy[0]) + dx, round(xy[1]) + dy), mask)
+    
+    def _draw_vertical_text(self, image: Image.Image, text: str, x: float, y_center: float,
+                            color: Tuple[int, ...]) -> None:
+        """Draw a label rotated by 90 degrees with its left edge at x."""
+        mask, _, dy = self._text_mask(text, 'label', 'mm', rotate=True)
+        image.paste(color, (int(x), round(y_center) + dy), mask)
+    
+    @staticmethod
+    def _format_frequency(frequency: float) -> str:
+        """Format a frequency tick as 10k, 1M, etc."""
+        for scale, suffix in ((1e9, 'G'), (1e6, 'M'), (1e3, 'k')):
+            if frequency >= scale:
+                return f'{frequency / scale:g}{suffix}'
+        return f'{frequency:g}'
+    
+    def _stft_magnitude(self, x: np.ndarray, nperseg: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Magnitude STFT matching signal.spectrogram(x, fs=len(x), nperseg, mode='magnitude').
         
-        plt.tight_layout()
+        Uses the same defaults (Tukey(0.25) window, nperseg // 8 overlap,
+        constant detrend, density scaling) but keeps the window, scale and
+        bin axes per (nperseg, fs) and transforms all segments in one batched
+        rFFT over a strided view.
+        
+        Args:
+            x: Input signal
+            nperseg: Segment length
+            
+        Returns:
+            Tuple of (frequencies, segment times, magnitudes)
+        """
+        x = np.asarray(x, dtype=float)
+        fs = len(x)
+        if not 0 < nperseg <= fs:
+            raise ValueError(f"nperseg must be between 1 and the signal length, got {nperseg}")
         
-        # Convert to image array
-        canvas = FigureCanvasAgg(fig)
-        canvas.draw()
-        buf = np.frombuffer(canvas.tostring_rgb(), dtype=np.uint8)
-        buf = buf.reshape(canvas.get_width_height()[::-1] + (3,))
+        key = (nperseg, fs)
+        setup = self._stft_cache.get(key)
+        if setup is None:
+            window = signal.get_window(('tukey', 0.25), nperseg)
+            step = nperseg - nperseg // 8
+            num_segments = (fs - nperseg) // step + 1
+            setup = (
+                window * np.sqrt(1.0 / (fs * np.sum(window * window))),
+                step,
+                np.fft.rfftfreq(nperseg, 1.0 / fs),
+                (np.arange(num_segments) * step + nperseg / 2) / fs
+            )
+            self._stft_cache[key] = setup
+        scaled_window, step, f, t = setup
         
-        plt.close(fig)
+        segments = np.lib.stride_tricks.sliding_window_view(x, nperseg)[::step][:len(t)]
+        segments = segments - segments.mean(axis=1, keepdims=True)
+        segments *= scaled_window
+        Sxx = np.abs(np.fft.rfft(segments, axis=1)).T
         
-        return buf
+        return f, t, np.ascontiguousarray(Sxx)
     
+    @_cached_render
     def create_spectrogram(self, frequencies: np.ndarray,
                           magnitudes: np.ndarray,
                           title: str = "FRA Spectrogram",
-                          color_scheme: str = 'default') -> np.ndarray:
+                          color_scheme: str = 'default',
+                          out: Optional[np.ndarray] = None) -> np.ndarray:
         """Create spectrogram representation of FRA data.
         
         Args:
@@ -146,118 +851,127 @@ class FRAImageGenerator:
             magnitudes: Magnitude values
             title: Plot title
             color_scheme: Color scheme
+            out: Preallocated (height, width, 3) uint8 array to render into
             
         Returns:
             Spectrogram image array
         """
-        colors = self.color_schemes.get(color_scheme, self.color_schemes['default'])
+        _, colors = self._scheme_colors(color_scheme)
         
         # Create spectrogram using STFT
         nperseg = min(256, len(magnitudes) // 4)
-        f, t, Sxx = signal.spectrogram(
-            magnitudes,
-            fs=len(magnitudes),
-            nperseg=nperseg,
-            mode='magnitude'
-        )
+        f, t, Sxx = self._stft_magnitude(magnitudes, nperseg)
         
-        # Convert to dB
-        Sxx_db = 20 * np.log10(np.maximum(Sxx, 1e-12))
-        
-        # Create plot
-        fig_width = self.image_size[0] / self.dpi
-        fig_height = self.image_size[1] / self.dpi
-        
-        fig, ax = plt.subplots(figsize=(fig_width, fig_height),
-                              facecolor=colors['background'])
+        # Convert to dB in place (Sxx is not used afterwards)
+        if _magnitude_to_db_kernel is not None:
+            Sxx_db = Sxx
+            lo, hi = _magnitude_to_db_kernel(Sxx_db)
+        else:
+            Sxx_db = np.maximum(Sxx, 1e-12, out=Sxx)
+            np.log10(Sxx_db, out=Sxx_db)
+            Sxx_db *= 20
+            lo, hi = float(Sxx_db.min()), float(Sxx_db.max())
         
-        # Plot spectrogram
-        im = ax.pcolormesh(t, f, Sxx_db, shading='gouraud', cmap='viridis')
-        ax.set_xlabel('Time Index', color=colors['text'])
-        ax.set_ylabel('Frequency Bin', color=colors['text'])
-        ax.set_title(title, color=colors['text'], fontsize=14, fontweight='bold')
-        ax.set_facecolor(colors['background'])
+        width, height = self.image_size
+        left, right = int(0.15 * width), int(0.78 * width)
+        top, bottom = int(0.11 * height), height - int(0.14 * height)
+        bar_left, bar_right = int(0.81 * width), int(0.84 * width)
+        text_color = colors['text']
         
-        # Add colorbar
-        cbar = plt.colorbar(im, ax=ax)
-        cbar.set_label('Magnitude (dB)', color=colors['text'])
-        cbar.ax.tick_params(colors=colors['text'])
+        # Scale dB values to colormap indices, resample to the plot area
+        # (bilinear, as imshow) and look up the viridis colors
+        span = max(hi - lo, 1e-9)
+        Sxx_db -= lo
+        Sxx_db *= 255 / span
+        scaled = Image.fromarray(np.ascontiguousarray(Sxx_db[::-1], dtype=np.float32))
+        scaled = scaled.resize((right - left, bottom - top), Image.BILINEAR)
+        idx = np.clip(np.asarray(scaled), 0, 255).astype(np.uint8)
         
-        # Customize appearance
-        ax.tick_params(colors=colors['text'])
-        for spine in ax.spines.values():
-            spine.set_color(colors['text'])
+        image = self._axes_template((left, top, right, bottom), title,
+                                    'Time Index', 'Frequency Bin', colors)
+        image.paste(Image.fromarray(self._viridis_lut[idx]), (left, top))
         
-        plt.tight_layout()
+        # Colorbar
+        bar = self._viridis_lut[np.linspace(255, 0, bottom - top).astype(np.uint8)]
+        bar = np.ascontiguousarray(np.broadcast_to(bar[:, None], (bottom - top, bar_right - bar_left, 3)))
+        image.paste(Image.fromarray(bar), (bar_left, top))
         
-        # Convert to image array
-        canvas = FigureCanvasAgg(fig)
-        canvas.draw()
-        buf = np.frombuffer(canvas.tostring_rgb(), dtype=np.uint8)
-        buf = buf.reshape(canvas.get_width_height()[::-1] + (3,))
+        draw = ImageDraw.Draw(image)
+        draw.rectangle([bar_left, top, bar_right, bottom], outline=text_color)
+        for value in self._nice_ticks(lo, hi):
+            y = bottom - (value - lo) / span * (bottom - top)
+            draw.line([(bar_right, y), (bar_right + 4, y)], fill=text_color)
+            self._draw_text(image, (bar_right + 6, y), f'{value:g}', text_color, 'tick', 'lm')
+        self._draw_vertical_text(image, 'Magnitude (dB)', width - self._fonts['label'].size - 6,
+                                 (top + bottom) / 2, text_color)
         
-        plt.close(fig)
+        # Axes over the image extent
+        t_lo, t_hi = float(t[0]), float(t[-1])
+        f_lo, f_hi = float(f[0]), float(f[-1])
+        if t_hi == t_lo:
+            t_lo, t_hi = t_lo - 0.5, t_hi + 0.5
+        x_ticks = [(left + (value - t_lo) / (t_hi - t_lo) * (right - left), f'{value:g}')
+                   for value in self._nice_ticks(t_lo, t_hi)]
+        y_ticks = [(bottom - (value - f_lo) / (f_hi - f_lo) * (bottom - top), f'{value:g}')
+                   for value in self._nice_ticks(f_lo, f_hi)]
+        self._draw_axes(image, draw, (left, top, right, bottom), x_ticks, y_ticks,
+                        colors, all_spines=True)
         
-        return buf
+        return self._to_output(np.array(image), out)
     
     def create_comparison_plot(self, baseline_data: Dict, 
                               current_data: Dict,
-                              title: str = "FRA Comparison") -> np.ndarray:
+                              title: str = "FRA Comparison",
+                              out: Optional[np.ndarray] = None) -> np.ndarray:
         """Create comparison plot between baseline and current FRA data.
         
         Args:
             baseline_data: Baseline FRA data with 'frequencies' and 'magnitudes'
             current_data: Current FRA data with 'frequencies' and 'magnitudes'
             title: Plot title
+            out: Preallocated (height, width, 3) uint8 array to render into
             
         Returns:
             Comparison plot image array
         """
-        fig_width = self.image_size[0] / self.dpi
-        fig_height = self.image_size[1] / self.dpi
-        
-        fig, ax = plt.subplots(figsize=(fig_width, fig_height))
+        fig, (ax,) = self._pooled_figure('comparison')
+        n_cols = self.image_size[0]
         
         # Plot baseline
-        ax.semilogx(baseline_data['frequencies'], baseline_data['magnitudes'],
+        ax.semilogx(*self._decimate(baseline_data['frequencies'], baseline_data['magnitudes'], n_cols),
                    'b-', linewidth=2, label='Baseline', alpha=0.8)
         
         # Plot current
-        ax.semilogx(current_data['frequencies'], current_data['magnitudes'],
+        ax.semilogx(*self._decimate(current_data['frequencies'], current_data['magnitudes'], n_cols),
                    'r-', linewidth=2, label='Current', alpha=0.8)
         
-        # Calculate and plot difference
+        # Calculate and plot difference on the same axis, shifted so its
+        # maximum sits at the lowest magnitude (avoids a second y axis)
         if len(baseline_data['frequencies']) == len(current_data['frequencies']):
-            diff = np.array(current_data['magnitudes']) - np.array(baseline_data['magnitudes'])
-            ax2 = ax.twinx()
-            ax2.semilogx(current_data['frequencies'], diff, 'g--', 
-                        linewidth=1, alpha=0.6, label='Difference')
-            ax2.set_ylabel('Difference (dB)', color='green')
-            ax2.tick_params(axis='y', labelcolor='green')
+            baseline_mags = np.asarray(baseline_data['magnitudes'], dtype=float)
+            current_mags = np.asarray(current_data['magnitudes'], dtype=float)
+            diff = current_mags - baseline_mags
+            offset = float(np.floor(min(baseline_mags.min(), current_mags.min())) - np.ceil(diff.max()))
+            ax.semilogx(*self._decimate(current_data['frequencies'], diff + offset, n_cols), 'g--',
+                        linewidth=1, alpha=0.6, label=f'Difference ({offset:+g} dB offset)')
         
         ax.set_xlabel('Frequency (Hz)')
         ax.set_ylabel('Magnitude (dB)')
         ax.set_title(title, fontsize=14, fontweight='bold')
-        ax.grid(True, alpha=0.3)
+        ax.grid(True, alpha=0.3, antialiased=False, linewidth=0.5)
         ax.legend()
         
-        plt.tight_layout()
-        
-        # Convert to image array
-        canvas = FigureCanvasAgg(fig)
-        canvas.draw()
-        buf = np.frombuffer(canvas.tostring_rgb(), dtype=np.uint8)
-        buf = buf.reshape(canvas.get_width_height()[::-1] + (3,))
+        self._fit_layout(fig)
         
-        plt.close(fig)
-        
-        return buf
+        return self._figure_to_array(fig, out)
     
+    @_cached_render
     def create_fault_visualization(self, frequencies: np.ndarray,
                                   magnitudes: np.ndarray,
                                   fault_probabilities: Dict[str, float],
                                   predicted_fault: str,
-                                  confidence: float) -> np.ndarray:
+                                  confidence: float,
+                                  out: Optional[np.ndarray] = None) -> np.ndarray:
         """Create visualization highlighting fault characteristics.
         
         Args:
@@ -266,43 +980,28 @@ class FRAImageGenerator:
             fault_probabilities: Dictionary of fault type probabilities
             predicted_fault: Predicted fault type
             confidence: Prediction confidence
+            out: Preallocated (height, width, 3) uint8 array to render into
             
         Returns:
             Fault visualization image
         """
-        fig_width = self.image_size[0] / self.dpi
-        fig_height = self.image_size[1] / self.dpi
-        
-        # Create subplot layout
-        fig = plt.figure(figsize=(fig_width, fig_height))
-        gs = fig.add_gridspec(2, 2, height_ratios=[2, 1], width_ratios=[3, 1])
+        # Get subplot layout from the pool
+        fig, (ax_main, ax_prob, ax_conf) = self._pooled_figure('fault')
         
         # Main FRA plot
-        ax_main = fig.add_subplot(gs[0, :])
         
         # Color based on fault type
-        fault_colors = {
-            'healthy': '#2E8B57',
-            'axial_displacement': '#FF6B6B',
-            'radial_deformation': '#4ECDC4',
-            'core_grounding': '#45B7D1',
-            'turn_turn_short': '#F39C12',
-            'insulation_degradation': '#9B59B6',
-            'partial_discharge': '#E74C3C'
-        }
-        
-        curve_color = fault_colors.get(predicted_fault, '#1f77b4')
+        unknown = len(_FAULT_NAMES)
+        curve_color = _FAULT_COLORS[_FAULT_INDEX.get(predicted_fault, unknown)]
         
         ax_main.semilogx(frequencies, magnitudes, color=curve_color, linewidth=2.5)
         ax_main.set_xlabel('Frequency (Hz)')
         ax_main.set_ylabel('Magnitude (dB)')
         ax_main.set_title(f'FRA Analysis: {predicted_fault.replace("_", " ").title()} '
                          f'(Confidence: {confidence:.1%})', fontweight='bold')
-        ax_main.grid(True, alpha=0.3)
+        ax_main.grid(True, alpha=0.3, antialiased=False, linewidth=0.5)
         
         # Probability bar chart
-        ax_prob = fig.add_subplot(gs[1, 0])
-        
         # Select top 5 probabilities for display
         sorted_faults = sorted(fault_probabilities.items(), 
                              key=lambda x: x[1], reverse=True)[:5]
@@ -310,66 +1009,166 @@ class FRAImageGenerator:
         fault_names = [f.replace('_', ' ').title()[:10] for f, _ in sorted_faults]
         probabilities = [p for _, p in sorted_faults]
         
-        bars = ax_prob.barh(fault_names, probabilities)
-        
         # Color bars based on fault type
-        for i, (fault_type, _) in enumerate(sorted_faults):
-            bars[i].set_color(fault_colors.get(fault_type, '#1f77b4'))
+        fault_ids = np.fromiter((_FAULT_INDEX.get(fault_type, unknown) for fault_type, _ in sorted_faults),
+                                dtype=np.intp, count=len(sorted_faults))
+        bar_colors = _FAULT_COLORS[fault_ids]
+        ax_prob.barh(fault_names, probabilities, color=bar_colors, edgecolor=bar_colors)
         
         ax_prob.set_xlabel('Probability')
         ax_prob.set_title('Fault Probabilities')
         ax_prob.set_xlim(0, 1)
         
         # Add confidence indicator
-        ax_conf = fig.add_subplot(gs[1, 1])
         ax_conf.pie([confidence, 1-confidence], 
                    colors=['#2E8B57', '#E0E0E0'],
                    startangle=90,
                    counterclock=False)
         ax_conf.set_title(f'Confidence\n{confidence:.1%}')
         
-        plt.tight_layout()
-        
-        # Convert to image array
-        canvas = FigureCanvasAgg(fig)
-        canvas.draw()
-        buf = np.frombuffer(canvas.tostring_rgb(), dtype=np.uint8)
-        buf = buf.reshape(canvas.get_width_height()[::-1] + (3,))
-        
-        plt.close(fig)
+        self._fit_layout(fig)
         
-        return buf
+        return self._figure_to_array(fig, out)
     
     def save_image(self, image_array: np.ndarray, filepath: str, 
-                  format: str = 'PNG') -> None:
+                  format: str = 'PNG', compress_level: int = 1,
+                  quality: int = 85) -> None:
         """Save image array to file.
         
+        JPEG and WebP are lossy: fine for viewing and visual model inputs,
+        but not for round-tripping exact pixel values.
+        
         Args:
             image_array: Image data as numpy array
             filepath: Output file path
-            format: Image format (PNG, JPEG, etc.)
+            format: Image format (PNG, JPEG, WEBP, etc.)
+            compress_level: zlib level for PNG (0-9, 1 is fastest to encode)
+            quality: Quality for JPEG and WebP (0-100)
         """
         image = Image.fromarray(image_array)
-        image.save(filepath, format=format)
+        image.save(filepath, format=format,
+                   **self._encoder_options(format, compress_level, quality))
         logger.info(f"Image saved to {filepath}")
     
-    def array_to_base64(self, image_array: np.ndarray) -> str:
+    @staticmethod
+    def _encoder_options(format: str, compress_level: int, quality: int) -> Dict[str, int]:
+        """Fast Pillow encoder settings for an image format."""
+        format = format.upper()
+        if format == 'PNG':
+            return {'compress_level': compress_level}
+        if format == 'JPEG':
+            return {'quality': quality}
+        if format == 'WEBP':
+            return {'quality': quality, 'method': 0}
+        return {}
+    
+    def array_to_base64(self, image_array: np.ndarray,
+                        buffer: Optional[io.BytesIO] = None,
+                        format: str = 'PNG', quality: int = 85) -> str:
         """Convert image array to base64 string for web display.
         
         Args:
             image_array: Image data as numpy array
+            buffer: Reusable buffer for the encoded image, the calling thread's
+                scratch buffer if None
+            format: Image format (PNG, JPEG or WEBP); JPEG and WebP are lossy
+            quality: Quality for JPEG and WebP (0-100)
             
         Returns:
             Base64 encoded image string
         """
-        import base64
+        if buffer is None:
+            buffer = getattr(self._scratch, 'png_buffer', None)
+            if buffer is None:
+                buffer = io.BytesIO()
+                self._scratch.png_buffer = buffer
+        buffer.seek(0)
+        buffer.truncate(0)
         
+        format = format.upper()
+        if format not in _MIME_TYPES:
+            raise ValueError(f"Unsupported format for base64 encoding: {format}")
+        
+        # Fast zlib level for PNG: plot images compress nearly as well at level 1
         image = Image.fromarray(image_array)
-        buffer = io.BytesIO()
-        image.save(buffer, format='PNG')
-        img_str = base64.b64encode(buffer.getvalue()).decode()
+        image.save(buffer, format=format, **self._encoder_options(format, 1, quality))
+        img_str = base64.b64encode(buffer.getvalue()).decode('ascii')
+        
+        return f"data:{_MIME_TYPES[format]};base64,{img_str}"
+
+
+class FRAPlotSession:
+    """Magnitude plot redrawn incrementally (blitting) for streaming FRA data.
+    
+    Axes, grid and labels are drawn once and cached as a background; each
+    update restores it and draws only the curve. Axis limits are fitted to
+    the first sweep and then frozen until an update asks to rescale.
+    Created by FRAImageGenerator.open_fra_session.
+    """
+    
+    def __init__(self, generator: FRAImageGenerator, title: str = "FRA Response",
+                 color_scheme: str = 'default'):
+        """
+        Initialize plot session.
+        
+        Args:
+            generator: Image generator providing size, dpi and color schemes
+            title: Plot title
+            color_scheme: Color scheme to use
+        """
+        self.generator = generator
+        colors, _ = generator._scheme_colors(color_scheme)
+        
+        width, height = generator.image_size
+        self.fig = Figure(figsize=(width / generator.dpi, height / generator.dpi),
+                          dpi=generator.dpi, facecolor=colors['background'])
+        FigureCanvasAgg(self.fig)
         
-        return f"data:image/png;base64,{img_str}"
+        self.ax = self.fig.add_subplot(1, 1, 1)
+        self.ax.set_xscale('log')
+        self.ax.set_title(title, color=colors['text'], fontsize=14, fontweight='bold')
+        generator._style_fra_axes(self.ax, 'Magnitude (dB)', colors)
+        
+        # Animated artists are skipped by canvas.draw(), so the background excludes the curve
+        self.line, = self.ax.plot([], [], color=colors['curve'], linewidth=2, animated=True)
+        self._background = None
+    
+    def update(self, frequencies: np.ndarray, magnitudes: np.ndarray,
+               rescale: bool = False, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Redraw the curve with new data.
+        
+        Args:
+            frequencies: Frequency points (Hz)
+            magnitudes: Magnitude values (dB)
+            rescale: Refit the axis limits (and redraw the background) to this data
+            out: Preallocated (height, width, 3) uint8 array to render into
+            
+        Returns:
+            Image array (RGB)
+        """
+        frequencies, magnitudes = self.generator._decimate(
+            frequencies, magnitudes, self.generator.image_size[0])
+        self.line.set_data(frequencies, magnitudes)
+        canvas = self.fig.canvas
+        
+        with rc_context(_RENDER_RC):
+            if self._background is None or rescale:
+                self.ax.relim()
+                self.ax.autoscale_view()
+                self.fig.tight_layout()
+                canvas.draw()
+                self._background = canvas.copy_from_bbox(self.ax.bbox)
+            else:
+                canvas.restore_region(self._background)
+            
+            self.ax.draw_artist(self.line)
+        
+        return self.generator._canvas_to_array(canvas, out)
+    
+    def close(self) -> None:
+        """Release the session figure."""
+        self.fig.clear()
+        self._background = None
 
 
 # Test function
@@ -8,12 +8,36 @@ Handles resampling, filtering, and standardization.
 
 import numpy as np
 from scipy import signal, interpolate
-from scipy.ndimage import uniform_filter1d
+from scipy.linalg import lapack
+from scipy.ndimage import convolve1d, uniform_filter1d
 import logging
 from typing import Dict, Tuple, Optional, List
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the NumPy implementations are used instead
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+# Max number of source frequency grids FRANormalizer keeps spline plans for
+_SPLINE_CACHE_SIZE = 32
+
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def _soft_threshold_kernel(coeffs, threshold):
+        """In-place soft thresholding, sign(c) * max(|c| - threshold, 0)."""
+        for i in range(coeffs.shape[0]):
+            value = coeffs[i]
+            shrunk = abs(value) - threshold
+            if shrunk > 0.0:
+                coeffs[i] = shrunk if value > 0.0 else -shrunk
+            else:
+                coeffs[i] = 0.0
+else:
+    _soft_threshold_kernel = None
+
 class FRANormalizer:
     """Normalizes and preprocesses FRA measurement data for ML analysis."""
     
@@ -36,6 +60,248 @@ class FRANormalizer:
         self.sg_window = 51  # Should be odd
         self.sg_polyorder = 3
         
+        # Target grid is fixed by target_points/freq_range, so build it once
+        self._target_frequencies = np.logspace(
+            np.log10(self.freq_min),
+            np.log10(self.freq_max),
+            self.target_points
+        )
+        self._log_target = np.log10(self._target_frequencies)
+        self._target_frequencies.flags.writeable = False
+        self._log_target.flags.writeable = False
+        
+        # List forms for JSON-ready records; each record gets a shallow copy
+        self._target_frequency_list = self._target_frequencies.tolist()
+        self._log_target_list = self._log_target.tolist()
+        
+        # Spline plans per source log-frequency grid; traces from the same
+        # instrument usually repeat one sweep
+        self._spline_cache = {}
+        
+        # Savitzky-Golay taps and edge-fit matrices per (window, polyorder)
+        self._savgol_cache = {}
+        
+    def _spline_plan(self, log_freq: np.ndarray) -> Dict:
+        """Get the cached not-a-knot cubic spline setup for a source grid.
+        
+        The spline system matrix and the position of every target point
+        depend only on the source grid, so the tridiagonal factorization
+        and the interval lookup are done once per grid.
+        
+        Args:
+            log_freq: Strictly increasing log10 source frequencies (N >= 4)
+            
+        Returns:
+            Dictionary with 'dx', the dgttrf factors of the slope system
+            ('dl', 'd', 'du', 'du2', 'ipiv'), and the target interval
+            indices 'index' and offsets 'offset'
+        """
+        key = (log_freq.shape, hash(log_freq.tobytes()))
+        plan = self._spline_cache.get(key)
+        if plan is not None:
+            return plan
+        
+        # Slope system of scipy's CubicSpline with not-a-knot ends
+        dx = np.diff(log_freq)
+        diag = np.empty(len(log_freq))
+        diag[0] = dx[1]
+        diag[1:-1] = 2.0 * (dx[:-1] + dx[1:])
+        diag[-1] = dx[-2]
+        upper = np.empty(len(dx))
+        upper[0] = log_freq[2] - log_freq[0]
+        upper[1:] = dx[:-1]
+        lower = np.empty(len(dx))
+        lower[:-1] = dx[1:]
+        lower[-1] = log_freq[-1] - log_freq[-3]
+        
+        dl, d, du, du2, ipiv, info = lapack.dgttrf(lower, diag, upper)
+        if info != 0:
+            raise ValueError("Singular spline system for frequency grid")
+        
+        # Interval of each target point; outside points use the end
+        # polynomials, matching CubicSpline(extrapolate=True)
+        index = np.searchsorted(log_freq, self._log_target, side='right') - 1
+        np.clip(index, 0, len(dx) - 1, out=index)
+        
+        plan = {
+            'dx': dx,
+            'dl': dl, 'd': d, 'du': du, 'du2': du2, 'ipiv': ipiv,
+            'index': index,
+            'offset': self._log_target - log_freq[index]
+        }
+        
+        if len(self._spline_cache) >= _SPLINE_CACHE_SIZE:
+            self._spline_cache.clear()
+        self._spline_cache[key] = plan
+        
+        return plan
+    
+    def _cubic_resample(self, log_freq: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Evaluate not-a-knot cubic splines through each row on the target grid.
+        
+        Same result as CubicSpline(log_freq, row, extrapolate=True) evaluated
+        at the log10 target grid, with all rows sharing one solve.
+        
+        Args:
+            log_freq: Strictly increasing log10 source frequencies (N >= 4)
+            values: Values to interpolate, shape (K, N)
+            
+        Returns:
+            Resampled values, shape (K, target_points)
+        """
+        plan = self._spline_plan(log_freq)
+        dx = plan['dx']
+        x0 = log_freq[0]
+        
+        # (N, K) columns are the right-hand sides of the slope system
+        y = values.T
+        slope = np.diff(y, axis=0) / dx[:, None]
+        rhs = np.empty(y.shape)
+        rhs[1:-1] = 3.0 * (dx[1:, None] * slope[:-1] + dx[:-1, None] * slope[1:])
+        span = log_freq[2] - x0
+        rhs[0] = ((dx[0] + 2.0 * span) * dx[1] * slope[0] + dx[0] ** 2 * slope[1]) / span
+        span = log_freq[-1] - log_freq[-3]
+        rhs[-1] = (dx[-1] ** 2 * slope[-2] + (2.0 * span + dx[-1]) * dx[-2] * slope[-1]) / span
+        
+        s, info = lapack.dgttrs(plan['dl'], plan['d'], plan['du'], plan['du2'],
+                                plan['ipiv'], rhs)
+        if info != 0:
+            raise ValueError("Spline slope solve failed")
+        
+        # Hermite form -> per-interval cubic coefficients, then Horner
+        t = (s[:-1] + s[1:] - 2.0 * slope) / dx[:, None]
+        c1 = (slope - s[:-1]) / dx[:, None] - t
+        c0 = t / dx[:, None]
+        
+        index = plan['index']
+        offset = plan['offset'][:, None]
+        result = c0[index] * offset
+        result += c1[index]
+        result *= offset
+        result += s[:-1][index]
+        result *= offset
+        result += y[:-1][index]
+        
+        return np.ascontiguousarray(result.T)
+    
+    def _savgol_plan(self, window_size: int, polyorder: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get cached Savitzky-Golay taps and edge-fit matrices.
+        
+        savgol_filter's default 'interp' mode replaces the first and last
+        window_size // 2 outputs with a polynomial fitted to the end
+        windows. That fit is linear in the data, so it reduces to fixed
+        (window_size // 2, window_size) matrices.
+        
+        Args:
+            window_size: Odd filter window length
+            polyorder: Polynomial order (< window_size)
+            
+        Returns:
+            Tuple of (convolution taps, left edge matrix, right edge matrix)
+        """
+        key = (window_size, polyorder)
+        plan = self._savgol_cache.get(key)
+        if plan is not None:
+            return plan
+        
+        half = window_size // 2
+        vander = np.vander(np.arange(window_size, dtype=np.float64), polyorder + 1)
+        hat = vander @ np.linalg.pinv(vander)
+        plan = (signal.savgol_coeffs(window_size, polyorder),
+                np.ascontiguousarray(hat[:half]),
+                np.ascontiguousarray(hat[window_size - half:]))
+        self._savgol_cache[key] = plan
+        
+        return plan
+    
+    def _savgol(self, values: np.ndarray, window_size: int, polyorder: int) -> np.ndarray:
+        """savgol_filter(values, window_size, polyorder) along the last axis with cached setup."""
+        values = np.asarray(values)
+        if values.dtype != np.float64 and values.dtype != np.float32:
+            values = values.astype(np.float64)
+        if window_size > values.shape[-1]:
+            raise ValueError(f"window_size {window_size} exceeds data length {values.shape[-1]}")
+        
+        taps, left, right = self._savgol_plan(window_size, polyorder)
+        half = window_size // 2
+        
+        filtered = convolve1d(values, taps, axis=-1, mode='constant')
+        filtered[..., :half] = values[..., :window_size] @ left.T
+        filtered[..., -half:] = values[..., -window_size:] @ right.T
+        
+        return filtered
+    
+    def _savgol_torch(self, values, window_size: int, polyorder: int):
+        """_savgol for a (records, N) torch tensor, on the tensor's device."""
+        import torch
+        import torch.nn.functional as F
+        
+        taps, left, right = self._savgol_plan(window_size, polyorder)
+        half = window_size // 2
+        
+        def as_tensor(array):
+            return torch.as_tensor(array, dtype=values.dtype, device=values.device)
+        
+        # conv1d correlates, so the convolution taps are reversed
+        kernel = as_tensor(np.ascontiguousarray(taps[::-1])).view(1, 1, -1)
+        filtered = F.conv1d(values.unsqueeze(1), kernel, padding=half).squeeze(1)
+        filtered[:, :half] = values[:, :window_size] @ as_tensor(left).T
+        filtered[:, -half:] = values[:, -window_size:] @ as_tensor(right).T
+        
+        return filtered
+    
+    def _filter_normalize_torch(self, magnitudes: np.ndarray,
+                                phases: Optional[np.ndarray],
+                                apply_filtering: bool,
+                                apply_wavelet: bool,
+                                device: str) -> Tuple[np.ndarray, Optional[np.ndarray], np.ndarray, Optional[np.ndarray]]:
+        """Steps 2-4 of process_fra_batch on a torch device.
+        
+        Same math as apply_savgol_filter, normalize_magnitude and
+        normalize_phase on stacked (records, target_points) float64 arrays.
+        Wavelet denoising has no torch path and round-trips through the CPU.
+        
+        Returns:
+            Tuple of (magnitudes, phases, normalized magnitudes,
+            normalized phases) as NumPy arrays
+        """
+        import torch
+        
+        mag = torch.as_tensor(magnitudes, device=device)
+        phase = torch.as_tensor(phases, device=device) if phases is not None else None
+        
+        # Step 2: Apply filtering if requested
+        if apply_filtering:
+            window_size, polyorder = self._savgol_window(self.target_points)
+            if window_size <= self.target_points:
+                mag = self._savgol_torch(mag, window_size, polyorder)
+                if phase is not None:
+                    phase = self._savgol_torch(phase, window_size, polyorder)
+            else:
+                logger.warning(f"Savitzky-Golay filtering failed: window_size {window_size} "
+                               f"exceeds data length {self.target_points}. Returning original data.")
+        
+        # Step 3: Apply wavelet denoising if requested
+        if apply_wavelet:
+            magnitudes = mag.cpu().numpy()
+            for i in range(len(magnitudes)):
+                magnitudes[i] = self.apply_wavelet_denoising(magnitudes[i])
+            mag = torch.as_tensor(magnitudes, device=device)
+        
+        # Step 4: Normalize data
+        normalized_mag = mag.clamp(self.mag_min, self.mag_max)
+        normalized_mag -= self.mag_min
+        normalized_mag *= 1.0 / (self.mag_max - self.mag_min)
+        
+        normalized_phase = None
+        if phase is not None:
+            turns = torch.ceil((phase - 180.0) / 360.0)
+            normalized_phase = (phase - 360.0 * turns) / 180.0
+            normalized_phase = normalized_phase.cpu().numpy()
+            phase = phase.cpu().numpy()
+        
+        return mag.cpu().numpy(), phase, normalized_mag.cpu().numpy(), normalized_phase
+    
     def resample_to_common_grid(self, frequencies: np.ndarray, 
                                magnitudes: np.ndarray, 
                                phases: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
@@ -49,64 +315,46 @@ class FRANormalizer:
         Returns:
             Tuple of (resampled_frequencies, resampled_magnitudes, resampled_phases)
         """
-        # Create target frequency grid (logarithmic spacing)
-        target_frequencies = np.logspace(
-            np.log10(self.freq_min), 
-            np.log10(self.freq_max), 
-            self.target_points
-        )
-        
-        # Ensure input frequencies are sorted
-        sort_indices = np.argsort(frequencies)
-        frequencies = frequencies[sort_indices]
-        magnitudes = magnitudes[sort_indices]
-        if phases is not None:
-            phases = phases[sort_indices]
-        
-        # Remove duplicate frequencies
-        unique_indices = np.unique(frequencies, return_index=True)[1]
-        frequencies = frequencies[unique_indices]
-        magnitudes = magnitudes[unique_indices]
-        if phases is not None:
-            phases = phases[unique_indices]
+        target_frequencies = self._target_frequencies
+        
+        # Sort (skipped for the usual already-ascending sweep), then drop
+        # duplicate frequencies and points outside the target range with a
+        # single mask and one gather per array
+        frequencies = np.asarray(frequencies)
+        if not np.all(frequencies[1:] >= frequencies[:-1]):
+            sort_indices = np.argsort(frequencies, kind='stable')
+            frequencies = frequencies[sort_indices]
+            magnitudes = magnitudes[sort_indices]
+            if phases is not None:
+                phases = phases[sort_indices]
         
-        # Clip to target frequency range
-        valid_mask = (frequencies >= self.freq_min) & (frequencies <= self.freq_max)
-        frequencies = frequencies[valid_mask]
-        magnitudes = magnitudes[valid_mask]
+        keep = (frequencies >= self.freq_min) & (frequencies <= self.freq_max)
+        keep[1:] &= frequencies[1:] != frequencies[:-1]
+        frequencies = frequencies[keep]
+        magnitudes = magnitudes[keep]
         if phases is not None:
-            phases = phases[valid_mask]
+            phases = phases[keep]
         
         if len(frequencies) < 10:
             raise ValueError("Insufficient frequency points after filtering")
         
         # Interpolate to target grid using cubic spline
         try:
-            # Use log-frequency for better interpolation
+            # Use log-frequency for better interpolation; magnitudes and
+            # unwrapped phases share one spline solve
             log_freq_orig = np.log10(frequencies)
-            log_freq_target = np.log10(target_frequencies)
             
-            # Interpolate magnitudes
-            mag_interpolator = interpolate.interp1d(
-                log_freq_orig, magnitudes, 
-                kind='cubic', 
-                bounds_error=False, 
-                fill_value='extrapolate'
-            )
-            resampled_magnitudes = mag_interpolator(log_freq_target)
+            if phases is None:
+                rows = magnitudes[None, :]
+            else:
+                # Handle phase wraparound
+                rows = np.vstack((magnitudes, np.unwrap(np.radians(phases))))
+            resampled = self._cubic_resample(log_freq_orig, rows.astype(np.float64, copy=False))
             
-            # Interpolate phases if available
+            resampled_magnitudes = resampled[0]
             resampled_phases = None
             if phases is not None:
-                # Handle phase wraparound
-                unwrapped_phases = np.unwrap(np.radians(phases))
-                phase_interpolator = interpolate.interp1d(
-                    log_freq_orig, unwrapped_phases,
-                    kind='cubic',
-                    bounds_error=False,
-                    fill_value='extrapolate'
-                )
-                resampled_phases = np.degrees(phase_interpolator(log_freq_target))
+                resampled_phases = np.degrees(resampled[1])
             
         except Exception as e:
             logger.warning(f"Cubic interpolation failed: {e}. Using linear interpolation.")
@@ -132,35 +380,42 @@ class FRANormalizer:
         
         return target_frequencies, resampled_magnitudes, resampled_phases
     
+    def _savgol_window(self, num_points: int) -> Tuple[int, int]:
+        """Get the (window_size, polyorder) used to filter num_points samples."""
+        # Ensure window size is appropriate
+        window_size = min(self.sg_window, num_points)
+        if window_size % 2 == 0:
+            window_size -= 1
+        window_size = max(window_size, 5)  # Minimum window size
+        
+        polyorder = min(self.sg_polyorder, window_size - 1)
+        
+        return window_size, polyorder
+    
     def apply_savgol_filter(self, magnitudes: np.ndarray, 
                            phases: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
         """Apply Savitzky-Golay filter for smoothing.
         
         Args:
-            magnitudes: Magnitude values
-            phases: Phase values, optional
+            magnitudes: Magnitude values, shape (N,) or (records, N)
+            phases: Phase values, optional, same layout as magnitudes
             
         Returns:
             Tuple of (filtered_magnitudes, filtered_phases)
         """
-        # Ensure window size is appropriate
-        window_size = min(self.sg_window, len(magnitudes))
-        if window_size % 2 == 0:
-            window_size -= 1
-        window_size = max(window_size, 5)  # Minimum window size
+        magnitudes = np.asarray(magnitudes, dtype=float)
+        if phases is not None:
+            phases = np.asarray(phases, dtype=float)
         
-        polyorder = min(self.sg_polyorder, window_size - 1)
+        # Filtering runs along the last axis
+        window_size, polyorder = self._savgol_window(magnitudes.shape[-1])
         
         try:
-            filtered_magnitudes = signal.savgol_filter(
-                magnitudes, window_size, polyorder
-            )
+            filtered_magnitudes = self._savgol(magnitudes, window_size, polyorder)
             
             filtered_phases = None
             if phases is not None:
-                filtered_phases = signal.savgol_filter(
-                    phases, window_size, polyorder
-                )
+                filtered_phases = self._savgol(phases, window_size, polyorder)
                 
         except Exception as e:
             logger.warning(f"Savitzky-Golay filtering failed: {e}. Returning original data.")
@@ -193,12 +448,17 @@ class FRANormalizer:
             # Wavelet decomposition
             coeffs = pywt.wavedec(magnitudes, wavelet, mode='symmetric')
             
-            # Soft thresholding
-            threshold = sigma * np.sqrt(2 * np.log(len(magnitudes)))
-            coeffs_thresh = [pywt.threshold(c, threshold, mode='soft') for c in coeffs]
+            # Soft thresholding (in place on pywt's fresh coefficient arrays
+            # when Numba is available)
+            threshold = float(sigma * np.sqrt(2 * np.log(len(magnitudes))))
+            if _soft_threshold_kernel is not None and all(c.dtype == np.float64 for c in coeffs):
+                for c in coeffs:
+                    _soft_threshold_kernel(c, threshold)
+            else:
+                coeffs = [pywt.threshold(c, threshold, mode='soft') for c in coeffs]
             
             # Reconstruction
-            denoised = pywt.waverec(coeffs_thresh, wavelet, mode='symmetric')
+            denoised = pywt.waverec(coeffs, wavelet, mode='symmetric')
             
             return denoised[:len(magnitudes)]  # Ensure same length
             
@@ -218,11 +478,14 @@ class FRANormalizer:
         Returns:
             Normalized magnitude values
         """
-        # Clip to expected range
-        clipped_magnitudes = np.clip(magnitudes, self.mag_min, self.mag_max)
+        magnitudes = np.asarray(magnitudes)
+        dtype = magnitudes.dtype if magnitudes.dtype.kind == 'f' else np.float64
         
-        # Normalize to [0, 1]
-        normalized = (clipped_magnitudes - self.mag_min) / (self.mag_max - self.mag_min)
+        # Clip to expected range, then normalize to [0, 1] in the same buffer
+        normalized = np.empty(magnitudes.shape, dtype=dtype)
+        np.clip(magnitudes, self.mag_min, self.mag_max, out=normalized)
+        np.subtract(normalized, self.mag_min, out=normalized)
+        np.multiply(normalized, 1.0 / (self.mag_max - self.mag_min), out=normalized)
         
         return normalized
     
@@ -235,26 +498,27 @@ class FRANormalizer:
         Returns:
             Normalized phase values
         """
-        # Wrap phases to [-180, 180] range
-        wrapped_phases = np.angle(np.exp(1j * np.radians(phases)), deg=True)
+        # Wrap phases to (-180, 180] by removing whole turns, without the
+        # complex exp/angle round trip; all steps reuse one buffer
+        normalized = np.subtract(phases, 180.0)
+        np.divide(normalized, 360.0, out=normalized)
+        np.ceil(normalized, out=normalized)
+        np.multiply(normalized, 360.0, out=normalized)
+        np.subtract(phases, normalized, out=normalized)
         
         # Normalize to [-1, 1]
-        normalized = wrapped_phases / 180.0
+        np.divide(normalized, 180.0, out=normalized)
         
         return normalized
     
-    def process_fra_data(self, canonical_data: Dict, 
-                        apply_filtering: bool = True,
-                        apply_wavelet: bool = False) -> Dict:
-        """Complete preprocessing pipeline for FRA data.
+    def _extract_measurement(self, canonical_data: Dict) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """Get frequency, dB magnitude and phase arrays from a canonical record.
         
         Args:
             canonical_data: Canonical FRA data structure
-            apply_filtering: Whether to apply Savitzky-Golay filtering
-            apply_wavelet: Whether to apply wavelet denoising
             
         Returns:
-            Processed FRA data with normalized measurements
+            Tuple of (frequencies, magnitudes in dB, phases or None)
         """
         measurement = canonical_data['measurement']
         
@@ -273,35 +537,64 @@ class FRANormalizer:
             else:
                 logger.warning(f"Unknown magnitude unit: {measurement['unit']}. Assuming dB.")
         
-        # Step 1: Resample to common grid
-        resampled_freq, resampled_mag, resampled_phase = self.resample_to_common_grid(
-            frequencies, magnitudes, phases
-        )
-        
-        # Step 2: Apply filtering if requested
-        if apply_filtering:
-            resampled_mag, resampled_phase = self.apply_savgol_filter(
-                resampled_mag, resampled_phase
-            )
-        
-        # Step 3: Apply wavelet denoising if requested
-        if apply_wavelet:
-            resampled_mag = self.apply_wavelet_denoising(resampled_mag)
+        return frequencies, magnitudes, phases
+    
+    def _build_processed(self, canonical_data: Dict,
+                         resampled_freq: np.ndarray,
+                         resampled_mag: np.ndarray,
+                         resampled_phase: Optional[np.ndarray],
+                         normalized_mag: np.ndarray,
+                         normalized_phase: Optional[np.ndarray],
+                         apply_filtering: bool,
+                         apply_wavelet: bool,
+                         as_arrays: bool = False) -> Dict:
+        """Assemble the processed data structure for one record.
         
-        # Step 4: Normalize data
-        normalized_mag = self.normalize_magnitude(resampled_mag)
-        normalized_phase = None
-        if resampled_phase is not None:
-            normalized_phase = self.normalize_phase(resampled_phase)
+        Args:
+            canonical_data: Canonical FRA data structure
+            resampled_freq: Common frequency grid (Hz)
+            resampled_mag: Resampled (and filtered) magnitudes (dB)
+            resampled_phase: Resampled (and filtered) phases (degrees), optional
+            normalized_mag: Magnitudes normalized to [0, 1]
+            normalized_phase: Phases normalized to [-1, 1], optional
+            apply_filtering: Whether Savitzky-Golay filtering was applied
+            apply_wavelet: Whether wavelet denoising was applied
+            as_arrays: Store float32 arrays instead of lists (see process_fra_data)
+            
+        Returns:
+            Processed FRA data with normalized measurements
+        """
+        if as_arrays:
+            # The grid is identical for every record, so all records share
+            # the normalizer's read-only copies of it
+            frequencies = self._target_frequencies
+            log_frequencies = self._log_target
+            magnitudes = resampled_mag.astype(np.float32)
+            phases = resampled_phase.astype(np.float32) if resampled_phase is not None else None
+            magnitudes_normalized = normalized_mag.astype(np.float32)
+            phases_normalized = normalized_phase.astype(np.float32) if normalized_phase is not None else None
+        else:
+            if resampled_freq is self._target_frequencies:
+                # Copying the prebuilt lists skips a log10 pass and two
+                # float-object conversions per record
+                frequencies = self._target_frequency_list.copy()
+                log_frequencies = self._log_target_list.copy()
+            else:
+                frequencies = resampled_freq.tolist()
+                log_frequencies = np.log10(resampled_freq).tolist()
+            magnitudes = resampled_mag.tolist()
+            phases = resampled_phase.tolist() if resampled_phase is not None else None
+            magnitudes_normalized = normalized_mag.tolist()
+            phases_normalized = normalized_phase.tolist() if normalized_phase is not None else None
         
         # Create processed data structure
         processed_data = canonical_data.copy()
-        processed_data['measurement']['frequencies'] = resampled_freq.tolist()
-        processed_data['measurement']['magnitudes'] = resampled_mag.tolist()
+        processed_data['measurement']['frequencies'] = frequencies
+        processed_data['measurement']['magnitudes'] = magnitudes
         processed_data['measurement']['unit'] = 'dB'
         
         if normalized_phase is not None:
-            processed_data['measurement']['phases'] = resampled_phase.tolist()
+            processed_data['measurement']['phases'] = phases
             processed_data['measurement']['phase_unit'] = 'degrees'
         
         # Add normalization metadata
@@ -318,9 +611,9 @@ class FRANormalizer:
             'frequency_range_hz': [self.freq_min, self.freq_max],
             'magnitude_range_db': [self.mag_min, self.mag_max],
             'normalized_data': {
-                'frequencies_log10': np.log10(resampled_freq).tolist(),
-                'magnitudes_normalized': normalized_mag.tolist(),
-                'phases_normalized': normalized_phase.tolist() if normalized_phase is not None else None
+                'frequencies_log10': log_frequencies,
+                'magnitudes_normalized': magnitudes_normalized,
+                'phases_normalized': phases_normalized
             }
         }
         
@@ -332,6 +625,128 @@ class FRANormalizer:
         
         return processed_data
     
+    def process_fra_data(self, canonical_data: Dict, 
+                        apply_filtering: bool = True,
+                        apply_wavelet: bool = False,
+                        as_arrays: bool = False) -> Dict:
+        """Complete preprocessing pipeline for FRA data.
+        
+        Args:
+            canonical_data: Canonical FRA data structure
+            apply_filtering: Whether to apply Savitzky-Golay filtering
+            apply_wavelet: Whether to apply wavelet denoising
+            as_arrays: Store measurements and normalized data as float32
+                ndarrays instead of JSON-ready lists; frequencies and their
+                log10 are shared read-only float64 arrays of the common grid
+            
+        Returns:
+            Processed FRA data with normalized measurements
+        """
+        frequencies, magnitudes, phases = self._extract_measurement(canonical_data)
+        
+        # Step 1: Resample to common grid
+        resampled_freq, resampled_mag, resampled_phase = self.resample_to_common_grid(
+            frequencies, magnitudes, phases
+        )
+        
+        # Step 2: Apply filtering if requested
+        if apply_filtering:
+            resampled_mag, resampled_phase = self.apply_savgol_filter(
+                resampled_mag, resampled_phase
+            )
+        
+        # Step 3: Apply wavelet denoising if requested
+        if apply_wavelet:
+            resampled_mag = self.apply_wavelet_denoising(resampled_mag)
+        
+        # Step 4: Normalize data
+        normalized_mag = self.normalize_magnitude(resampled_mag)
+        normalized_phase = None
+        if resampled_phase is not None:
+            normalized_phase = self.normalize_phase(resampled_phase)
+        
+        return self._build_processed(
+            canonical_data, resampled_freq, resampled_mag, resampled_phase,
+            normalized_mag, normalized_phase, apply_filtering, apply_wavelet,
+            as_arrays
+        )
+    
+    def process_fra_batch(self, canonical_list: List[Dict],
+                          apply_filtering: bool = True,
+                          apply_wavelet: bool = False,
+                          as_arrays: bool = False,
+                          device: Optional[str] = None) -> List[Dict]:
+        """Run the preprocessing pipeline over many records at once.
+        
+        Records are resampled one by one into rows of shared
+        (N, target_points) arrays; filtering and normalization then run once
+        over the whole batch. Output matches calling process_fra_data on
+        each record.
+        
+        Args:
+            canonical_list: Canonical FRA data structures
+            apply_filtering: Whether to apply Savitzky-Golay filtering
+            apply_wavelet: Whether to apply wavelet denoising
+            as_arrays: Store float32 arrays instead of lists (see process_fra_data)
+            device: Torch device (e.g. 'cuda') to filter and normalize the
+                stacked batch on; None uses SciPy/NumPy on the CPU.
+                Resampling always runs on the CPU
+            
+        Returns:
+            Processed FRA data for each record, in input order
+        """
+        num_records = len(canonical_list)
+        if num_records == 0:
+            return []
+        
+        # Step 1: Resample every record into its row; records without
+        # phases get no phase row
+        magnitudes = np.empty((num_records, self.target_points))
+        phase_rows = []
+        phase_owner = []
+        for i, canonical_data in enumerate(canonical_list):
+            frequencies, record_mag, record_phase = self._extract_measurement(canonical_data)
+            _, magnitudes[i], resampled_phase = self.resample_to_common_grid(
+                frequencies, record_mag, record_phase
+            )
+            if resampled_phase is not None:
+                phase_rows.append(resampled_phase)
+                phase_owner.append(i)
+        
+        phases = np.vstack(phase_rows) if phase_rows else None
+        
+        if device is not None:
+            magnitudes, phases, normalized_mag, normalized_phase = self._filter_normalize_torch(
+                magnitudes, phases, apply_filtering, apply_wavelet, device
+            )
+        else:
+            # Step 2: Apply filtering if requested
+            if apply_filtering:
+                magnitudes, phases = self.apply_savgol_filter(magnitudes, phases)
+            
+            # Step 3: Apply wavelet denoising if requested
+            if apply_wavelet:
+                for i in range(num_records):
+                    magnitudes[i] = self.apply_wavelet_denoising(magnitudes[i])
+            
+            # Step 4: Normalize data
+            normalized_mag = self.normalize_magnitude(magnitudes)
+            normalized_phase = self.normalize_phase(phases) if phases is not None else None
+        
+        phase_index = dict(zip(phase_owner, range(len(phase_owner))))
+        processed = []
+        for i, canonical_data in enumerate(canonical_list):
+            row = phase_index.get(i)
+            processed.append(self._build_processed(
+                canonical_data, self._target_frequencies, magnitudes[i],
+                phases[row] if row is not None else None,
+                normalized_mag[i],
+                normalized_phase[row] if row is not None else None,
+                apply_filtering, apply_wavelet, as_arrays
+            ))
+        
+        return processed
+    
     def create_spectrogram(self, frequencies: np.ndarray, 
                           magnitudes: np.ndarray,
                           nperseg: int = 256) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
@@ -0,0 +1,35 @@
+"""Regression tests for models/2d_cnn.py image conversion."""
+
+import importlib
+
+import numpy as np
+
+FRAImageConverter = importlib.import_module('models.2d_cnn').FRAImageConverter
+
+
+def _sweep(num_points: int = 500):
+    frequencies = np.logspace(4, 7, num_points)
+    magnitudes = 40 - 10 * np.log10(frequencies / 1e4)
+    return frequencies, magnitudes
+
+
+def test_fra_to_plot_image_accepts_lists():
+    converter = FRAImageConverter()
+    frequencies, magnitudes = _sweep()
+    
+    from_lists = converter.fra_to_plot_image(frequencies.tolist(), magnitudes.tolist())
+    from_arrays = converter.fra_to_plot_image(frequencies, magnitudes)
+    
+    np.testing.assert_array_equal(from_lists, from_arrays)
+
+
+def test_convert_batch_accepts_lists():
+    converter = FRAImageConverter()
+    frequencies, magnitudes = _sweep()
+    
+    images = converter.convert_batch([frequencies.tolist()] * 2, [magnitudes.tolist()] * 2,
+                                     num_workers=2)
+    
+    assert images.shape == (2, *converter.image_size)
+    for image in images:
+        np.testing.assert_array_equal(image, converter.fra_to_plot_image(frequencies, magnitudes))
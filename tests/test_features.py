@@ -0,0 +1,35 @@
+"""Regression tests for preproc.features."""
+
+import numpy as np
+
+from preproc.features import FRAFeatureExtractor
+
+
+def _sample(num_frequencies: int, num_magnitudes: int) -> dict:
+    frequencies = np.logspace(np.log10(20e3), np.log10(12e6), num_frequencies)
+    magnitudes = np.linspace(40.0, -20.0, num_magnitudes)
+    return {
+        'measurement': {
+            'frequencies': frequencies.tolist(),
+            'magnitudes': magnitudes.tolist(),
+            'unit': 'dB'
+        },
+        'asset_metadata': {},
+        'test_info': {}
+    }
+
+
+def test_extract_all_features_valid_sample():
+    features = FRAFeatureExtractor().extract_all_features(_sample(512, 512))
+    assert features
+    assert all(np.isfinite(value) for value in features.values())
+
+
+def test_extract_all_features_rejects_mismatched_lengths():
+    extractor = FRAFeatureExtractor()
+    assert extractor.extract_all_features(_sample(256, 512)) == {}
+
+
+def test_extract_all_features_rejects_empty_sample():
+    extractor = FRAFeatureExtractor()
+    assert extractor.extract_all_features(_sample(0, 0)) == {}